@@ -0,0 +1,116 @@
+"""
+Load test of the broadcast server: hundreds of simulated displays follow a fast-forwarding clock, some of them too slow
+to read, measuring the delivered messages, the delivery delay and the CPU use.
+Run from the project root: python -m benchmarks.bench_broadcast [clients] [seconds]
+"""
+
+import asyncio
+import socket
+import sys
+import threading
+import time
+
+from src.broadcast import BroadcastServer
+from src.timer import Clock
+
+_SLOW_EVERY = 10
+_FRAME = 0.016
+
+
+class _Display:
+    """ Simulated display, counting the delta messages it receives """
+
+    def __init__(self):
+        self.messages = 0
+        self.states = 0
+        self.last = 0.0
+
+
+async def _follow(port: int, display: _Display, slow: bool, stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    sock = socket.socket()
+    if slow:
+        # a small receive window, so that the server notices
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1024)
+    sock.setblocking(False)
+    await loop.sock_connect(sock, ('127.0.0.1', port))
+    await loop.sock_sendall(sock, b'GET /events HTTP/1.1\r\nHost: localhost\r\n\r\n')
+    pending = b''
+    while not stop.is_set():
+        if slow:
+            # reads a little now and then, like a phone on a bad connection
+            await asyncio.sleep(1)
+        try:
+            data = await asyncio.wait_for(loop.sock_recv(sock, 256 if slow else 65536), 0.2)
+        except asyncio.TimeoutError:
+            continue
+        if not data:
+            break
+        *messages, pending = (pending + data).split(b'\n\n')
+        for message in messages:
+            if message.startswith(b'data: '):
+                display.messages += 1
+            elif message.startswith(b'event: state'):
+                display.states += 1
+        display.last = time.monotonic()
+    sock.close()
+
+
+def _publish(clock: Clock, seconds: float, published: list) -> None:
+    """ Advances the clock once per frame, as the window does at x1000 """
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        clock.advance(8, 'drop')
+        published[0] += 1
+        published[1] = time.monotonic()
+        if clock.end:
+            clock.reset()
+            clock.un_pause('run')
+        time.sleep(_FRAME)
+
+
+async def bench(clients: int, seconds: float) -> None:
+    clock = Clock()
+    clock.un_pause('run')
+    server = BroadcastServer([clock], queue_size=64)
+    server.start()
+    stop = asyncio.Event()
+    displays = [_Display() for _ in range(clients)]
+    tasks = [asyncio.ensure_future(_follow(server.port, display, index % _SLOW_EVERY == 0, stop))
+             for index, display in enumerate(displays)]
+    while server.stats.clients < clients:
+        await asyncio.sleep(0.01)
+
+    cpu_start = time.process_time()
+    published = [0, 0.0]
+    publisher = threading.Thread(target=_publish, args=(clock, seconds, published))
+    publisher.start()
+    while publisher.is_alive():
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(1)
+    stop.set()
+    await asyncio.gather(*tasks)
+    cpu = time.process_time() - cpu_start
+    server.stop()
+
+    fast = [d for i, d in enumerate(displays) if i % _SLOW_EVERY]
+    slow = [d for i, d in enumerate(displays) if not i % _SLOW_EVERY]
+    # each clock step publishes a batch (and each reset a jump)
+    batches = server.stats.messages
+    complete = sum(1 for d in fast if d.messages >= batches)
+    delay = max(d.last for d in fast) - published[1]
+    print(f'{clients:>5} clients: {published[0]} steps, {batches} messages, '
+          f'{complete}/{len(fast)} fast clients got all of them (last {delay * 1000:.0f} ms after the last step), '
+          f'{len(slow)} slow clients resynced {sum(d.states for d in slow)} times, {server.stats.dropped} dropped, '
+          f'CPU (server and clients) {cpu / (seconds + 1) * 100:.0f}%')
+
+
+def main() -> None:
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+    for count in (clients // 5, clients):
+        asyncio.run(bench(count, seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Measures the cost of dispatching a clock's events on the bus, against calling the handlers directly, for growing
+numbers of subscribers filtering on kinds and clocks.
+Run from the project root: python -m benchmarks.bench_bus [steps]
+"""
+
+import sys
+import time
+
+from src import bus, timeline
+from src.bus import BusEvent, EventBus
+
+_SUBSCRIBERS = (1, 10, 100)
+
+
+def _batches(steps: int, minutes: int):
+    """ Batches of a clock moving 'minutes' at a time, as published by Clock.advance() """
+    clock = object()
+    timeline_ = timeline.Timeline((6, 18), (11, 14, 17, 20, 22, 0, 2, 3, 4))
+    batches = []
+    for step in range(steps):
+        start = step * minutes % (timeline.CYCLE_DURATION - minutes)
+        events = [BusEvent(clock, e.kind, e.minute) for e in timeline_.events_between(start, start + minutes)]
+        batches.append(events + [BusEvent(clock, bus.MINUTE, start + minutes)])
+    return clock, batches
+
+
+def bench(subscribers: int, minutes: int, steps: int) -> None:
+    clock, batches = _batches(steps, minutes)
+    event_bus = EventBus()
+    handlers = []
+    for index in range(subscribers):
+        # a mix of sound, panel and catch-all subscribers, half of them on another clock
+        kinds = (bus.SOUND_KINDS, (bus.MINUTE, bus.JUMP), None)[index % 3]
+        handler = _Counter()
+        handlers.append(handler)
+        event_bus.subscribe(handler, kinds, clock if index % 2 else object())
+
+    start = time.perf_counter()
+    for batch in batches:
+        event_bus.publish(batch)
+    published = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for batch in batches:
+        for handler in handlers:
+            handler(batch)
+    direct = time.perf_counter() - start
+
+    print(f'{subscribers:>4} subscribers, {minutes:>4} minutes/step: '
+          f'bus {published / steps * 1e6:7.2f} us/step, direct {direct / steps * 1e6:7.2f} us/step, '
+          f'{event_bus.stats.calls / steps:6.1f} calls/step')
+
+
+class _Counter:
+    def __init__(self):
+        self.events = 0
+
+    def __call__(self, events) -> None:
+        self.events += len(events)
+
+
+def main() -> None:
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    for subscribers in _SUBSCRIBERS:
+        for minutes in (1, 8, 480):
+            bench(subscribers, minutes, steps)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Measures the throughput and the peak memory of saves.parse() as the input grows, against the previous approach
+splitting the whole string at once.
+Run from the project root: python -m benchmarks.bench_deserialize
+"""
+
+import re
+import time
+import tracemalloc
+
+from src import saves
+
+_COUNTS = (1_000, 10_000, 100_000, 1_000_000)
+_OLD_PATTERN = "^[a-zA-Z0-9 ]{1,16}@[1-3]\\.(?:[01][0-9]|2[0-3])\\.[0-5][0-9]$"
+
+
+def _make_source(count: int) -> str:
+    return ','.join(f'save {i}@{i % 3 + 1}.{i % 24:02}.{i % 60:02}' for i in range(count))
+
+
+def _old_parse(source: str) -> int:
+    """ The parser as it was: split the whole string, match a pattern given as a string """
+    count = 0
+    for value in source.split(','):
+        if value and re.match(_OLD_PATTERN, value) is not None:
+            name, time_str = value.split('@')
+            day, hour, minute = time_str.split('.')
+            saves.SaveState(name, int(day), int(hour), int(minute))
+            count += 1
+    return count
+
+
+def _new_parse(source: str) -> int:
+    return sum(1 for entry in saves.parse(source) if entry.save is not None)
+
+
+def _time(function, source: str) -> float:
+    start = time.perf_counter()
+    function(source)
+    return time.perf_counter() - start
+
+
+def _peak(function, source: str) -> int:
+    """ Peak memory allocated by the function, in bytes """
+    tracemalloc.start()
+    function(source)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    for count in _COUNTS:
+        source = _make_source(count)
+        print(f'{count:>9} saves ({len(source) / 1024:8.0f} KiB)')
+        for name, function in (('split', _old_parse), ('parse', _new_parse)):
+            best = min(_time(function, source) for _ in range(3))
+            print(f'    {name}: {count / best:>10.0f} saves/s   peak {_peak(function, source) / 1024:>10.0f} KiB')
+
+
+if __name__ == '__main__':
+    main()
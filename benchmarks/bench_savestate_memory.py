@@ -0,0 +1,46 @@
+"""
+Compares the memory used by many saves with the compact SaveState (slots and a single, shared, int for the time)
+against the previous dict-backed objects holding name, day, hour and minute.
+Run from the project root: python -m benchmarks.bench_savestate_memory
+"""
+
+import tracemalloc
+
+from src.saves import SaveState
+
+_COUNTS = (10_000, 100_000, 1_000_000)
+
+
+class _DictSaveState:
+    """ SaveState as it was: an instance __dict__ with four attributes """
+
+    def __init__(self, name: str, day: int, hour: int, minute: int):
+        self.name: str = name
+        self.day: int = day
+        self.hour: int = hour
+        self.minute: int = minute
+
+
+def _measure(cls, count: int) -> int:
+    """ Bytes allocated to keep count saves in a dict by name, as the saves module does """
+    tracemalloc.start()
+    saves = {}
+    for i in range(count):
+        minute = i % 4320
+        name = f'save {i}'
+        saves[name] = cls(name, minute // 1440 + 1, (5 + minute // 60) % 24, minute % 60)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+
+def main() -> None:
+    for count in _COUNTS:
+        old = _measure(_DictSaveState, count)
+        new = _measure(SaveState, count)
+        print(f'{count:>9} saves: dict {old / count:6.1f} B/save   slots {new / count:6.1f} B/save   '
+              f'saved {(1 - new / old) * 100:4.1f}%')
+
+
+if __name__ == '__main__':
+    main()
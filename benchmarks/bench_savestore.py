@@ -0,0 +1,56 @@
+"""
+Measures the time needed to load the saves journal at startup, with 10k and 100k saves.
+Run from the project root: python -m benchmarks.bench_savestore
+"""
+
+import os
+import tempfile
+import time
+
+from src.saves import SaveState
+from src.savestore import SaveJournal
+
+_COUNTS = (10_000, 100_000)
+_RUNS = 5
+
+
+def _make_saves(count: int):
+    for i in range(count):
+        minute = i % 4320
+        yield SaveState(f'save {i}', minute // 1440 + 1, (5 + minute // 60) % 24, minute % 60)
+
+
+def bench(count: int, directory: str) -> None:
+    path = os.path.join(directory, f'{count}.journal')
+    SaveJournal(path, durable=False).compact(_make_saves(count))
+    size = os.path.getsize(path)
+
+    times = []
+    for _ in range(_RUNS):
+        journal = SaveJournal(path, durable=False)
+        start = time.perf_counter()
+        loaded, _ = journal.load()
+        times.append(time.perf_counter() - start)
+        journal.close()
+        assert len(loaded) == count
+
+    journal = SaveJournal(path)
+    journal.load()
+    start = time.perf_counter()
+    for i in range(100):
+        journal.created(SaveState(f'extra {i}', 1, 6, 0))
+    append = (time.perf_counter() - start) / 100
+    journal.close()
+
+    print(f'{count:>7} saves ({size / 1024:7.0f} KiB): load best {min(times) * 1000:8.2f} ms   '
+          f'synced append {append * 1000:6.3f} ms')
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for count in _COUNTS:
+            bench(count, directory)
+
+
+if __name__ == '__main__':
+    main()
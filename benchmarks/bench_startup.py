@@ -0,0 +1,38 @@
+"""
+Measures the time needed to import the clock, which no longer loads pygame nor opens the audio device, against the
+time pygame needs to do so (the cost every import used to pay).
+Run from the project root: python -m benchmarks.bench_startup
+"""
+
+import statistics
+import subprocess
+import sys
+
+from definitions import ROOT_DIR
+
+_RUNS = 10
+
+_IMPORT_CLOCK = 'from src.timer import Clock'
+_IMPORT_PYGAME = 'import os; os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"; from pygame import mixer; mixer.init()'
+
+
+def _measure(statement: str) -> float:
+    """
+    Runs the statement in a new interpreter, timing it from the inside.
+    :return: milliseconds spent by the statement, or NaN if it failed
+    """
+    code = f'import time\nstart = time.perf_counter()\n{statement}\nprint((time.perf_counter() - start) * 1000)'
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT_DIR, capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        return float('nan')
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    for name, statement in (('import Clock', _IMPORT_CLOCK), ('pygame + mixer.init()', _IMPORT_PYGAME)):
+        times = [_measure(statement) for _ in range(_RUNS)]
+        print(f'{name:<24} median {statistics.median(times):8.2f} ms   min {min(times):8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Runs growing numbers of headless clocks on a TimingWheel, measuring tick throughput, scheduling lateness and CPU use.
+Run from the project root: python -m benchmarks.bench_wheel [seconds]
+"""
+
+import random
+import sys
+import time
+
+from src.scheduler import TimingWheel
+from src.timer import Clock
+
+_COUNTS = (1_000, 10_000, 100_000)
+
+
+class _BenchClock(Clock):
+    """ Clock with its own interval, like a group with its own settings """
+
+    def __init__(self, interval: int):
+        super().__init__()
+        self.interval = interval
+
+    def get_interval(self) -> int:
+        return self.interval
+
+
+def bench(count: int, seconds: float) -> None:
+    wheel = TimingWheel()
+    for _ in range(count):
+        clock = _BenchClock(random.randint(1000, 3000))
+        clock.un_pause('run')
+        wheel.add(clock)
+
+    cpu_start = time.process_time()
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        time.sleep(wheel.delay())
+        wheel.run_due()
+    cpu = time.process_time() - cpu_start
+
+    stats = wheel.stats
+    print(f'{count:>8} clocks: {stats.minutes / seconds:>10.0f} ticks/s   '
+          f'lateness mean {stats.lateness_mean() * 1000:6.2f} ms, max {stats.lateness_max * 1000:7.2f} ms   '
+          f'CPU {cpu / seconds * 100:5.1f}%')
+
+
+def main() -> None:
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    random.seed(0)
+    for count in _COUNTS:
+        bench(count, seconds)
+
+
+if __name__ == '__main__':
+    main()
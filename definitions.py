@@ -2,13 +2,17 @@
 Some useful constants and logging config
 """
 
+import atexit
 import logging.handlers
 import os
 
+from src.logqueue import JsonFormatter, LogPipeline
+
 # global constants
 
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
-INI_FILE = os.path.join(os.path.dirname(__file__), 'ttfh.ini')
+# TTFH_INI points to another .ini file, e.g. ttfh.ini.sample for the tests
+INI_FILE = os.environ.get('TTFH_INI', os.path.join(os.path.dirname(__file__), 'ttfh.ini'))
 
 # logging
 
@@ -21,6 +25,14 @@ file_handler = logging.handlers.RotatingFileHandler(
     backupCount=10,
     encoding='UTF-8')
 
-file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)-28s - %(levelname)-8s - %(message)s'))
-
-logging.basicConfig(handlers=[file_handler], force=True, level=logging.INFO)
+# TTFH_LOG_JSON=1 writes JSON lines, with the 'extra' fields of each record, e.g. for per-tick diagnostics
+if os.environ.get('TTFH_LOG_JSON', '') not in ('', '0'):
+    file_handler.setFormatter(JsonFormatter())
+else:
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)-28s - %(levelname)-8s - %(message)s'))
+
+# the file is written by a background thread: records beyond the queue size are dropped (and counted) instead of
+# making the caller wait
+LOG_PIPELINE = LogPipeline(file_handler, size=int(os.environ.get('TTFH_LOG_QUEUE', '10000')))
+LOG_PIPELINE.start()
+atexit.register(LOG_PIPELINE.stop)
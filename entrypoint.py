@@ -1,37 +1,113 @@
 from __future__ import annotations
 
 import argparse
+import atexit
 import logging
 import sys
+from typing import List, Optional
 
-from src.graphics.window import Window
+from definitions import LOG_PIPELINE
+from src import broadcast, bus, ini, metrics, music, persistence, sharedstate
+from src.metrics import METRICS
 from src.timer import Clock
 
 LOG = logging.getLogger(__name__)
 
 
-def main(day: int, hour: int, minute: int, saves: str):
+def parse_clock(time_str: str) -> Clock:
     """
-    If the parameters are valid, it starts the clock.
+    :param time_str: time formatted as {day}.{hour}.{minute}, like Clock.get_time_str()
+    :return: a clock at the given time
+    """
+    try:
+        day, hour, minute = (int(value) for value in time_str.split('.'))
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f'invalid time "{time_str}", expected day.hour.minute') from e
+    if not (1 <= day <= 3 and 0 <= hour <= 23 and 0 <= minute <= 59):
+        raise argparse.ArgumentTypeError(f'invalid time "{time_str}"')
+    return Clock(day, hour, minute)
+
+
+def main(day: int, hour: int, minute: int, saves: str, headless: bool = False, listen: Optional[int] = None,
+         others: Optional[List[Clock]] = None, stats: bool = False, stats_port: Optional[int] = None):
+    """
+    If the parameters are valid, it starts the clock, either in its window or, if headless, without graphics.
+    Additional clocks are shown in the same window, each in its own tab.
+    With stats (or a stats_port), the runtime metrics are recorded, and written at exit (or served on that port).
     """
     if 1 <= day <= 3 and 0 <= hour <= 23 and 0 <= minute <= 59:
         LOG.info('Starting parameters: day %d, hour %d, minute %d', day, hour, minute)
         if saves:
             LOG.info('Starting savestate string: %s', saves)
 
+        metrics.start(stats, stats_port)
+        METRICS.add_source('bus', lambda: vars(bus.BUS.stats))
+        METRICS.add_source('log', lambda: {'dropped': LOG_PIPELINE.dropped})
+
+        if ini.sound('preload', 'yes').lower() in ('yes', 'true', 'on', '1'):
+            music.preload()
+        music.attach()
+        ini.watch()
+
+        journal_errors = persistence.open_saves()
+
         timer = Clock(day, hour, minute)
-        window = Window(timer)
-        window.create(saves)
+        clocks = [timer] if headless else [timer, *(others or [])]
+        server = broadcast.start(clocks, ini.sys('broadcast', ''))
+        if server is not None:
+            METRICS.add_source('broadcast', lambda: vars(server.stats))
+        shared = sharedstate.share(clocks, ini.sys('shared-state', ''))
+        if shared is not None:
+            atexit.register(shared.close)
+        if headless:
+            from src import headless as engine  # pylint: disable=import-outside-toplevel
+            engine.run(timer, saves, listen, journal_errors)
+        else:
+            from src.graphics.window import Window  # pylint: disable=import-outside-toplevel
+            window = Window(timer, *(others or []))
+            window.create(saves, journal_errors)
     else:
         LOG.error('Invalid parameters: day %d, hour %d, minute %d', day, hour, minute)
         sys.exit(1)
 
 
+def display(index: int) -> None:
+    """
+    Shows, read-only, a clock of the TTFH process sharing them (see SYSTEM.shared-state).
+
+    :param index: index of the clock, 0 for the main one
+    """
+    from src.graphics.display import Display  # pylint: disable=import-outside-toplevel
+    name = ini.sys('shared-state', '')
+    try:
+        window = Display(name, index)
+    except (FileNotFoundError, ValueError, IndexError, TimeoutError) as e:
+        LOG.error('Unable to display clock %d of "%s": %s', index, name, e)
+        sys.exit(f'No clock {index} shared as "{name}", is TTFH running with shared-state set?')
+    ini.watch()
+    window.show()
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser('TTFH')
     parser.add_argument('--day', type=int, help='Starting day (1-3)', default=Clock.START_DAY, required=False)
     parser.add_argument('--hour', type=int, help='Starting hour (0-23)', default=Clock.START_HOUR, required=False)
     parser.add_argument('--minute', type=int, help='Starting minute (0-59)', default=Clock.START_MINUTE, required=False)
     parser.add_argument('--saves', type=str, help='Comma-separated saves', default='', required=False)
+    parser.add_argument('--headless', action='store_true', help='Run without graphics, controlled from stdin')
+    parser.add_argument('--listen', type=int, help='Local port for headless commands', default=None, required=False)
+    parser.add_argument('--clock', type=parse_clock, action='append', dest='clocks', default=[], required=False,
+                        help='Additional clock, in its own tab, starting at the given day.hour.minute')
+    parser.add_argument('--display', type=int, nargs='?', const=0, default=None, required=False,
+                        help='Only show, read-only, the clock with the given index (0 if omitted) of the running TTFH')
+    parser.add_argument('--stats', action='store_true', help='Record the runtime metrics and write them at exit')
+    parser.add_argument('--stats-port', type=int, default=None, required=False,
+                        help='Record the runtime metrics and serve them as text on this local port')
     args = parser.parse_args()
-    main(args.day, args.hour, args.minute, args.saves)
+    if args.headless and args.clocks:
+        parser.error('--clock is not supported with --headless, which runs a single clock')
+    if args.display is not None:
+        display(args.display)
+        sys.exit(0)
+    main(args.day, args.hour, args.minute, args.saves, args.headless, args.listen, args.clocks, args.stats,
+         args.stats_port)
@@ -0,0 +1,80 @@
+"""
+Periodic, change-driven saving of the clock's state
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable, Hashable
+
+LOG = logging.getLogger(__name__)
+
+
+class AutoSaver:
+    """
+    Write-behind saver running on its own thread: every window it compares the current state's version with the one
+    last written and, only if it changed, it writes. Changes are therefore coalesced into at most one write per window,
+    and the caller (e.g. the Tk mainloop) never waits for the disk.
+    """
+
+    def __init__(self, state: Callable[[], Hashable], write: Callable[[], None], window: float):
+        """
+        :param state: cheap function returning a value that changes whenever there is something new to write
+        :param write: function writing the state, it should write atomically
+        :param window: minimum time between two writes, in seconds
+        """
+        self.window: float = window
+        self.writes: int = 0
+        self.latency_total: float = 0.0
+        self.latency_max: float = 0.0
+        self._state: Callable[[], Hashable] = state
+        self._write: Callable[[], None] = write
+        self._written: Hashable = state()
+        self._stop: threading.Event = threading.Event()
+        self._thread: threading.Thread = None
+
+    def start(self) -> None:
+        """ Starts the saver's thread. """
+        self._thread = threading.Thread(target=self._run, name='autosave', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """ Stops the saver's thread, waiting for the write in progress (if any). """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def latency_mean(self) -> float:
+        """
+        :return: mean duration of a write, in seconds
+        """
+        return self.latency_total / self.writes if self.writes else 0.0
+
+    def save_if_changed(self) -> bool:
+        """
+        Writes the state if it changed since the last write.
+        :return: True if it was written
+        """
+        current = self._state()
+        if current == self._written:
+            return False
+        start = time.perf_counter()
+        try:
+            self._write()
+        except OSError:
+            LOG.exception('Autosave failed')
+            return False
+        latency = time.perf_counter() - start
+        self._written = current
+        self.writes += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+        LOG.debug('Autosaved in %.1f ms', latency * 1000)
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.window):
+            self.save_if_changed()
@@ -0,0 +1,262 @@
+"""
+Server-sent events of the clocks, for the players' displays (phones, TV) on the local network.
+GET /events streams, to each client, the state of every clock and then each batch of events as it is published, encoded
+once for all the clients; GET / serves a minimal page showing the first clock.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import socket
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from src import bus, timeline
+from src.bus import BusEvent, EventBus
+
+LOG = logging.getLogger(__name__)
+
+KINDS = (bus.MINUTE, bus.JUMP, bus.PAUSE, bus.SPEED, timeline.HOUR, timeline.BELL, timeline.RUMBLE, timeline.DAY,
+         timeline.END)
+
+# bytes the system and the transport may buffer for a client: kept small, so that the backlog of a slow client ends up
+# in its queue, where it is replaced by the state, instead of delivering stale events for a long time
+_SEND_BUFFER = 8192
+
+_HEADERS = (b'HTTP/1.1 200 OK\r\n'
+            b'Content-Type: text/event-stream\r\n'
+            b'Cache-Control: no-cache\r\n'
+            b'Access-Control-Allow-Origin: *\r\n'
+            b'\r\n'
+            b'retry: 2000\n\n')
+
+_PAGE = b'''<!DOCTYPE html>
+<html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width">
+<title>Till the Final Hour</title></head>
+<body style="background:#000;color:#fff;font:bold 18vw Arial;text-align:center">
+<div id="day" style="font-size:8vw"></div><div id="time"></div>
+<script>
+const show = m => {
+  const h = (5 + Math.floor(m / 60)) % 24;
+  document.getElementById('day').textContent = 'Day ' + (Math.floor(m / 1440) + 1);
+  document.getElementById('time').textContent = h + ':' + String(m % 60).padStart(2, '0');
+};
+const source = new EventSource('/events');
+source.addEventListener('state', e => { const s = JSON.parse(e.data); if (s.c === 0) show(s.m); });
+source.onmessage = e => {
+  const d = JSON.parse(e.data);
+  if (d.c === 0) d.e.filter(x => x[0] === 'minute' || x[0] === 'jump').forEach(x => show(x[1]));
+};
+</script></body></html>
+'''
+
+
+class BroadcastStats:
+    """ Counters of a BroadcastServer """
+
+    def __init__(self):
+        self.clients: int = 0
+        self.messages: int = 0
+        self.sent: int = 0
+        self.dropped: int = 0
+
+
+class _Client:
+    """ A connected display, with the messages not yet written to it """
+
+    def __init__(self, size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(size)
+
+
+class BroadcastServer:
+    """
+    Streams the clocks' state and events to many clients.
+    The events are encoded once per batch, on the publisher's thread, and queued to each client from the server's
+    thread, which runs its own asyncio loop. A client whose queue is full is too slow: its queued messages are dropped
+    and replaced by the full state of the clocks, so that it catches up without holding back the others.
+    """
+
+    def __init__(self, clocks: Sequence, host: str = '127.0.0.1', port: int = 0, queue_size: int = 64):
+        """
+        :param clocks: clocks to stream, each one identified by its index
+        :param host: address to listen on, '0.0.0.0' for the whole network
+        :param port: port to listen on, 0 for any free one
+        :param queue_size: messages queued to a client before it is considered too slow
+        """
+        self.clocks: List = list(clocks)
+        self.host: str = host
+        self.port: int = port
+        self.queue_size: int = queue_size
+        self.stats = BroadcastStats()
+        self._ids: Dict[int, int] = {id(clock): index for index, clock in enumerate(self.clocks)}
+        self._clients: List[_Client] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._subscription: Optional[bus.Subscription] = None
+        self._event_bus: Optional[EventBus] = None
+
+    def start(self, event_bus: EventBus = bus.BUS) -> None:
+        """
+        Starts listening, in a background thread, and subscribes to the clocks' events.
+
+        :param event_bus: bus the clocks publish on
+        :raise OSError: if the server can't listen on the given address
+        """
+        started = threading.Event()
+        errors: List[BaseException] = []
+
+        def run() -> None:
+            loop = asyncio.new_event_loop()
+            try:
+                try:
+                    self._server = loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+                except OSError as e:
+                    errors.append(e)
+                    started.set()
+                    return
+                self._loop = loop
+                self.port = self._server.sockets[0].getsockname()[1]
+                started.set()
+                loop.run_forever()
+                # lets the cancelled clients' tasks finish before closing the loop
+                pending = asyncio.all_tasks(loop)
+                if pending:
+                    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            finally:
+                loop.close()
+
+        self._thread = threading.Thread(target=run, name='broadcast', daemon=True)
+        self._thread.start()
+        started.wait()
+        if errors:
+            self._thread.join()
+            self._thread = None
+            raise errors[0]
+        self._event_bus = event_bus
+        self._subscription = event_bus.subscribe(self._on_events, KINDS)
+        LOG.info('Broadcasting on %s:%d', self.host, self.port)
+
+    def stop(self) -> None:
+        """ Stops listening and disconnects every client. """
+        if self._subscription is not None:
+            self._event_bus.unsubscribe(self._subscription)
+            self._subscription = None
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._close(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+            self._thread.join()
+            self._thread = None
+
+    def state(self) -> bytes:
+        """
+        :return: the 'state' message with the whole state of every clock: index (c), minute of the cycle (m), running
+        (r), speed multiplier (s), slow (w) and end (x)
+        """
+        messages = []
+        for index, clock in enumerate(self.clocks):
+            state = {'c': index, 'm': clock.get_cycle_minute(), 'r': int(clock.running), 's': clock.speed,
+                     'w': clock.slow, 'x': int(clock.end)}
+            messages.append(b'event: state\ndata: ' + _encode(state) + b'\n\n')
+        return b''.join(messages)
+
+    def _on_events(self, events: List[BusEvent]) -> None:
+        """ Encodes a batch of events as a single delta message: clock index (c) and [kind, minute] pairs (e) """
+        loop = self._loop
+        index = self._ids.get(id(events[0].clock))
+        if loop is None or index is None:
+            return
+        message = b'data: ' + _encode({'c': index, 'e': [[event.kind, event.minute] for event in events]}) + b'\n\n'
+        loop.call_soon_threadsafe(self._broadcast, message)
+
+    def _broadcast(self, message: bytes) -> None:
+        self.stats.messages += 1
+        state = None
+        for client in self._clients:
+            try:
+                client.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self.stats.dropped += client.queue.qsize() + 1
+                while not client.queue.empty():
+                    client.queue.get_nowait()
+                if state is None:
+                    state = self.state()
+                client.queue.put_nowait(state)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await reader.readuntil(b'\r\n\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        path = request.split(b' ', 2)[1] if request.count(b' ') >= 2 else b''
+        if path == b'/events':
+            await self._stream(writer)
+        else:
+            if path == b'/':
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\nContent-Length: '
+                             + str(len(_PAGE)).encode() + b'\r\nConnection: close\r\n\r\n' + _PAGE)
+            else:
+                writer.write(b'HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+            writer.close()
+
+    async def _stream(self, writer: asyncio.StreamWriter) -> None:
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _SEND_BUFFER)
+        writer.transport.set_write_buffer_limits(_SEND_BUFFER)
+        client = _Client(self.queue_size)
+        self._clients.append(client)
+        self.stats.clients += 1
+        try:
+            writer.write(_HEADERS + self.state())
+            await writer.drain()
+            while True:
+                message = await client.queue.get()
+                writer.write(message)
+                await writer.drain()
+                self.stats.sent += 1
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._clients.remove(client)
+            self.stats.clients -= 1
+            writer.close()
+
+    async def _close(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+        for task in asyncio.all_tasks():
+            if task is not asyncio.current_task():
+                task.cancel()
+
+
+def _encode(value: object) -> bytes:
+    return json.dumps(value, separators=(',', ':')).encode()
+
+
+def start(clocks: Sequence, address: str) -> Optional[BroadcastServer]:
+    """
+    Starts broadcasting the clocks, if an address is given.
+
+    :param clocks: clocks to stream
+    :param address: 'host:port' or 'port' (localhost) to listen on, empty not to broadcast
+    :return: the running server, or None if no address is given or the server can't listen on it
+    """
+    if not address:
+        return None
+    host, _, port = address.rpartition(':')
+    try:
+        server = BroadcastServer(clocks, host or '127.0.0.1', int(port))
+        server.start()
+    except (OSError, ValueError) as e:
+        LOG.error('Unable to broadcast on %s: %s', address, e)
+        return None
+    return server
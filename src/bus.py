@@ -0,0 +1,129 @@
+"""
+Event bus between the clocks and whatever reacts to them (sounds, panels, persistence, network).
+A clock publishes, in a single batch, everything that happened in one step; each subscriber receives, in a single call,
+only the events of the kinds and of the clock it asked for.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from operator import attrgetter
+from typing import Callable, Collection, Dict, List, NamedTuple, Optional, Tuple
+
+from src import timeline
+
+LOG = logging.getLogger(__name__)
+
+# kinds of events, besides the ones of the timeline (HOUR, BELL, TICK, RUMBLE, DAY, END)
+MINUTE = 'minute'
+JUMP = 'jump'
+PAUSE = 'pause'
+SPEED = 'speed'
+
+SOUND_KINDS = frozenset((timeline.BELL, timeline.TICK, timeline.RUMBLE, timeline.DAY))
+
+_ORDER = attrgetter('order')
+
+
+class BusEvent(NamedTuple):
+    """
+    Something happening to a clock.
+    MINUTE is the last minute reached by a step, JUMP a change of time other than running (forward, backward, reset),
+    PAUSE and SPEED a change of running state and of speed (slow or fast-forward).
+    """
+    clock: object
+    kind: str
+    minute: int
+    # whether the event's sound, if any, is to be played, according to the catch-up policy of the step
+    audible: bool = True
+
+
+Handler = Callable[[List[BusEvent]], None]
+
+
+class Subscription:
+    """ A handler with the kinds and the clock it is interested in """
+
+    __slots__ = ('handler', 'kinds', 'clock', 'order')
+
+    def __init__(self, handler: Handler, kinds: Optional[Collection[str]], clock: Optional[object], order: int):
+        self.handler: Handler = handler
+        self.kinds: Optional[frozenset] = None if kinds is None else frozenset(kinds)
+        self.clock: Optional[object] = clock
+        self.order: int = order
+
+
+class BusStats:
+    """ Counters of an EventBus """
+
+    def __init__(self):
+        self.batches: int = 0
+        self.events: int = 0
+        self.calls: int = 0
+
+
+class EventBus:
+    """ Dispatches the events published by the clocks to the handlers subscribed to them """
+
+    def __init__(self):
+        self._subscriptions: List[Subscription] = []
+        # subscriptions by (clock, kind), with None for the ones without that filter, replaced as a whole on every
+        # change so that publish() never sees it half-built
+        self._index: Dict[Tuple[Optional[object], Optional[str]], List[Subscription]] = {}
+        self._count = 0
+        self._lock = threading.Lock()
+        self.stats = BusStats()
+
+    def subscribe(self, handler: Handler, kinds: Optional[Collection[str]] = None,
+                  clock: Optional[object] = None) -> Subscription:
+        """
+        :param handler: function called with the list of the accepted events of each batch, in order
+        :param kinds: kinds of events to receive, all of them if None
+        :param clock: clock whose events to receive, all of them if None
+        :return: the subscription, to be used to unsubscribe
+        """
+        with self._lock:
+            self._count += 1
+            subscription = Subscription(handler, kinds, clock, self._count)
+            self._reindex(self._subscriptions + [subscription])
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._reindex([s for s in self._subscriptions if s is not subscription])
+
+    def publish(self, events: List[BusEvent]) -> None:
+        """
+        Dispatches a batch of events, calling each interested handler once, on the publisher's thread.
+        A handler raising an exception is logged: it stops neither the other handlers nor the publisher.
+
+        :param events: events of a single step, in order
+        """
+        index = self._index
+        if not events or not index:
+            return
+        self.stats.batches += 1
+        self.stats.events += len(events)
+        accepted: Dict[Subscription, List[BusEvent]] = {}
+        for event in events:
+            for key in ((event.clock, event.kind), (None, event.kind), (event.clock, None), (None, None)):
+                for subscription in index.get(key, ()):
+                    accepted.setdefault(subscription, []).append(event)
+        for subscription in sorted(accepted, key=_ORDER):
+            self.stats.calls += 1
+            try:
+                subscription.handler(accepted[subscription])
+            except Exception:  # pylint: disable=broad-except
+                LOG.exception('Error in the event handler %s', subscription.handler)
+
+    def _reindex(self, subscriptions: List[Subscription]) -> None:
+        index: Dict[Tuple[Optional[object], Optional[str]], List[Subscription]] = {}
+        for subscription in subscriptions:
+            for kind in (None,) if subscription.kinds is None else subscription.kinds:
+                index.setdefault((subscription.clock, kind), []).append(subscription)
+        self._subscriptions = subscriptions
+        self._index = index
+
+
+BUS = EventBus()
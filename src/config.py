@@ -0,0 +1,196 @@
+"""
+Immutable snapshot of the .ini file, parsed and validated once, and its live reload when the file changes.
+"""
+
+from __future__ import annotations
+
+import configparser
+import logging
+import os
+import threading
+from types import MappingProxyType
+from typing import Callable, Collection, FrozenSet, List, Mapping, NamedTuple, Optional, Tuple
+
+LOG = logging.getLogger(__name__)
+
+Key = Tuple[str, str]
+
+CATCH_UP_POLICIES = ('replay', 'coalesce', 'drop')
+
+# labels of the days and periods, each one with a GUI.<label>-name and a GUI.<label>-colour
+LABELS = ('day-0', 'day-1', 'day-2', 'day-3', 'dawn', 'morning', 'afternoon', 'twilight', 'night')
+
+
+class Config(NamedTuple):
+    """ Values of the .ini file, as strings by (section, key), and the typed ones used on every tick """
+    values: Mapping[Key, str]
+    intervals: Tuple[int, int]
+    bell_hours: Tuple[int, ...]
+    rumble_hours: Tuple[int, ...]
+    catch_up: str
+    fast_catch_up: str
+
+    def get(self, section: str, key: str, fallback: Optional[str] = None) -> str:
+        """
+        :return: value of section.key, or the fallback (if given) when the key is missing
+        :raise KeyError: if the key is missing and there is no fallback
+        """
+        value = self.values.get((section, key.lower()), fallback)
+        if value is None:
+            raise KeyError(f'{section}.{key}')
+        return value
+
+
+def parse(text: str) -> Config:
+    """
+    :param text: content of the .ini file
+    :return: the configuration
+    :raise ValueError: if the content is not a valid .ini file, a label is missing, or a typed value is missing or
+    invalid
+    """
+    parser = configparser.ConfigParser()
+    try:
+        parser.read_string(text)
+    except configparser.Error as e:
+        raise ValueError(str(e)) from e
+    values = {(section, key): value for section in parser.sections() for key, value in parser[section].items()}
+    missing = [f'GUI.{label}-{part}' for label in LABELS for part in ('name', 'colour')
+               if ('GUI', f'{label}-{part}') not in values]
+    if missing:
+        raise ValueError(f'missing {", ".join(missing)}')
+
+    def get(key: str, fallback: Optional[str] = None) -> str:
+        value = values.get(('TIMER', key), fallback)
+        if value is None:
+            raise ValueError(f'missing TIMER.{key}')
+        return value
+
+    def hours(key: str) -> Tuple[int, ...]:
+        parsed = tuple(_to_int(key, hour) for hour in get(key).split(','))
+        if not all(0 <= hour <= 23 for hour in parsed):
+            raise ValueError(f'TIMER.{key}: hours must be between 0 and 23')
+        return parsed
+
+    def policy(key: str, fallback: str) -> str:
+        value = get(key, fallback)
+        if value not in CATCH_UP_POLICIES:
+            raise ValueError(f'TIMER.{key}: expected one of {", ".join(CATCH_UP_POLICIES)}, got "{value}"')
+        return value
+
+    intervals = (_to_int('interval-short', get('interval-short')), _to_int('interval-long', get('interval-long')))
+    if min(intervals) <= 0:
+        raise ValueError('TIMER intervals must be positive')
+    return Config(MappingProxyType(values), intervals, hours('bell-hours'), hours('rumble-hours'),
+                  policy('catch-up', 'coalesce'), policy('fast-catch-up', 'drop'))
+
+
+def read(path: str) -> Config:
+    """
+    :param path: path to the .ini file
+    :return: the configuration
+    :raise ValueError: see parse()
+    """
+    with open(path, 'r', encoding='utf-8') as ini_file:
+        return parse(ini_file.read())
+
+
+def changed_keys(old: Config, new: Config) -> FrozenSet[Key]:
+    """
+    :return: keys added, removed or with a different value
+    """
+    keys = old.values.keys() | new.values.keys()
+    return frozenset(key for key in keys if old.values.get(key) != new.values.get(key))
+
+
+def _signature(path: str) -> Tuple[int, int]:
+    """ Modification time and size of the file, to tell whether it changed """
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _to_int(key: str, value: str) -> int:
+    try:
+        return int(value)
+    except ValueError as e:
+        raise ValueError(f'TIMER.{key}: "{value}" is not an integer') from e
+
+
+Listener = Callable[[FrozenSet[Key], Config], None]
+
+
+class LiveConfig:
+    """
+    Holds the current configuration, replacing it as a whole when the file changes, so that readers always see a
+    consistent one, and notifies the listeners of the keys that changed.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: path to the .ini file
+        :raise ValueError: if the file content is not valid, see parse()
+        """
+        self.path: str = path
+        self._signature: Tuple[int, int] = _signature(path)
+        self.current: Config = read(path)
+        self._listeners: List[Tuple[Listener, Optional[FrozenSet[Key]]]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, listener: Listener, keys: Optional[Collection[Key]] = None) -> None:
+        """
+        :param listener: function called, after a reload, with the changed keys it is interested in and the new
+        configuration
+        :param keys: (section, key) pairs to be notified of, all of them if None
+        """
+        with self._lock:
+            self._listeners = self._listeners + [(listener, None if keys is None else frozenset(keys))]
+
+    def reload(self) -> FrozenSet[Key]:
+        """
+        Reads the file again if its modification time changed. If the new content is not valid, the current
+        configuration is kept.
+
+        :return: the changed keys
+        """
+        try:
+            signature = _signature(self.path)
+            if signature == self._signature:
+                return frozenset()
+            self._signature = signature
+            new = read(self.path)
+        except (OSError, ValueError) as e:
+            LOG.error('Configuration not reloaded: %s', e)
+            return frozenset()
+        changed = changed_keys(self.current, new)
+        self.current = new
+        if changed:
+            LOG.info('Configuration reloaded, changed: %s', ', '.join(sorted('.'.join(key) for key in changed)))
+        for listener, keys in self._listeners:
+            relevant = changed if keys is None else changed & keys
+            if relevant:
+                try:
+                    listener(relevant, new)
+                except Exception:  # pylint: disable=broad-except
+                    LOG.exception('Error applying the new configuration')
+        return changed
+
+    def watch(self, interval: float) -> None:
+        """
+        Starts checking the file for changes in a background thread.
+
+        :param interval: seconds between two checks
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, args=(interval,), name='config', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.reload()
@@ -1,25 +1,36 @@
 from __future__ import annotations
 
 import logging
+import time
 import tkinter as tk
 from typing import Callable, List
 
+from src.graphics import utils
 from src.graphics.interfaces import Tickable
+from src.metrics import METRICS
 
 LOG = logging.getLogger(__name__)
 
 
 class ButtonAction:
-    def __init__(self, callables: List[Callable]):
+    def __init__(self, callables: List[Callable], name: str = ''):
         """
         :param callables: ordered callables
+        :param name: name of the button, to tell its callables apart in the metrics
         """
         self.callables: List[Callable] = callables
+        self.name: str = name
 
     def exec(self) -> None:
-        """ Executes the button action """
-        for cmd in self.callables:
-            cmd()
+        """ Executes the button action, timing each callable if the metrics are enabled """
+        if METRICS.enabled:
+            for index, cmd in enumerate(self.callables):
+                start = time.perf_counter()
+                cmd()
+                METRICS.histogram(f'button.{self.name}.{index}').observe(time.perf_counter() - start)
+        else:
+            for cmd in self.callables:
+                cmd()
 
 
 class Button:
@@ -37,8 +48,8 @@ class Button:
 
         self.root: tk.Tk = root
         self.name: str = name
-        self.icon: tk.PhotoImage = tk.PhotoImage(file=icon_path)
-        self.action: ButtonAction = ButtonAction(action)
+        self.icon: tk.PhotoImage = utils.load_image(icon_path)
+        self.action: ButtonAction = ButtonAction(action, name)
         self.style_args = kwargs
         self._btn: tk.Button = None
 
@@ -48,18 +59,20 @@ class Button:
 
     def place(self, pos_x: int, pos_y: int) -> Button:
         """
-        Packs the button. If no 'relief' argument was given at instantiation, it uses tk.GROOVE.
+        Packs the button, creating it the first time and moving it afterwards. If no 'relief' argument was given at
+        instantiation, it uses tk.GROOVE.
         :param pos_x: x-coordinate of the button
         :param pos_y: y-coordinate of the button
         :return: the object itself
         """
-        if 'relief' not in self.style_args:
-            self.style_args['relief'] = self._RELIEF
-
-        self._btn = tk.Button(self.root,
-                              image=self.icon,
-                              command=self.action.exec,
-                              **self.style_args)
+        if self._btn is None:
+            if 'relief' not in self.style_args:
+                self.style_args['relief'] = self._RELIEF
+
+            self._btn = tk.Button(self.root,
+                                  image=self.icon,
+                                  command=self.action.exec,
+                                  **self.style_args)
         self._btn.place(x=pos_x, y=pos_y)
         return self
 
@@ -91,9 +104,11 @@ class Switch(Button, Tickable):
         """
         action.append(self.tick)
         super().__init__(root, icon_off, name, action, relief=self._RELIEF_OFF, **kwargs)
-        self.icon_on: tk.PhotoImage = tk.PhotoImage(file=icon_on)
+        self.icon_on: tk.PhotoImage = utils.load_image(icon_on)
         self.track: Callable[[], bool] = track
-        self.var: tk.BooleanVar = tk.BooleanVar(root, self.track())
+        self.state: bool = bool(self.track())
+        self.var: tk.BooleanVar = tk.BooleanVar(root, self.state)
+        self.var.trace_add('write', self._on_change)
 
     def __str__(self):
         """ Logs both id and state """
@@ -101,24 +116,28 @@ class Switch(Button, Tickable):
 
     def place(self, pos_x: int, pos_y: int) -> Switch:
         """
-        Packs the switch and updates its appearance based on self.var value.
-        The unused variables in the 'on_change' function are required by Tk.
+        Packs the switch, see Button.place().
 
         :param pos_x: x-coordinate of the button
         :param pos_y: y-coordinate of the button
         :return: the object itself
         """
         super().place(pos_x, pos_y)
+        return self
 
-        def on_change(varname, index, mode):
-            """ self.icon is icon_off """
+    def _on_change(self, varname, index, mode) -> None:
+        """
+        Updates the switch's appearance based on self.var value, self.icon is icon_off.
+        The unused parameters are required by Tk.
+        """
+        if self._btn is not None:
             relief = self._RELIEF_ON if self.var.get() else self._RELIEF_OFF
             icon_img = self.icon_on if self.var.get() else self.icon
             self._btn.configure(relief=relief, image=icon_img)
 
-        self.var.trace_add('write', on_change)
-
-        return self
-
     def tick(self) -> None:
-        self.var.set(self.track())
+        """ Updates the switch only if its state changed """
+        state = bool(self.track())
+        if state != self.state:
+            self.state = state
+            self.var.set(state)
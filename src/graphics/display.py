@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import logging
+import tkinter as tk
+
+from src import ini, timer
+from src.graphics.mainpanels import PanelHolder
+from src.graphics.panels import ClockPanel, PanelStyle, TextPanel
+from src.scheduler import FRAME_MS
+from src.sharedstate import SharedClock, SharedClockReader
+
+LOG = logging.getLogger(__name__)
+
+
+class Display:
+    """
+    Read-only window showing a clock shared by another process (see src.sharedstate), e.g. on a projector: the day, the
+    period and the clock, without any button.
+    """
+    _BG_COLOUR = '#000000'
+    _DAY_HEIGHT = 64
+    _PERIOD_HEIGHT = 32
+
+    _WIDTH = int(ini.gui("width"))
+    _HEIGHT = int(ini.gui("height"))
+
+    def __init__(self, name: str, index: int = 0):
+        """
+        :param name: name of the shared block
+        :param index: index of the clock to show
+        :raise FileNotFoundError: if the clocks are not shared under that name
+        :raise TimeoutError: if the clock is stuck halfway through a write
+        """
+        self.reader = SharedClockReader(name)
+        self.clock = SharedClock(self.reader, index)
+        self.window = tk.Tk()
+        self.panel = PanelHolder(self._WIDTH, self._HEIGHT)
+
+        hour_height = self._HEIGHT - self._DAY_HEIGHT - self._PERIOD_HEIGHT
+        self.panel.add_panel(TextPanel(self.window, self.clock, PanelStyle(self._WIDTH, self._DAY_HEIGHT,
+                                                                           self._BG_COLOUR, 'Arial 24 bold'),
+                                       timer.get_day), 1)
+        self.panel.add_panel(TextPanel(self.window, self.clock, PanelStyle(self._WIDTH, self._PERIOD_HEIGHT,
+                                                                           self._BG_COLOUR, 'Arial 18 bold'),
+                                       timer.get_period), 2)
+        self.panel.add_panel(ClockPanel(self.window, self.clock, PanelStyle(self._WIDTH, hour_height,
+                                                                            self._BG_COLOUR, 'Arial 64'),
+                                        timer.get_time), 3)
+
+    def show(self) -> None:
+        """ Draws the window and follows the shared clock, reading it once per frame, until the window is closed. """
+        self.window.geometry(f'{self._WIDTH}x{self._HEIGHT}')
+        self.window.config(bg=self._BG_COLOUR)
+        self.window.title('Till the Final Hour')
+        self.panel.draw()
+
+        def follow():
+            if self.clock.refresh():
+                self.panel.tick()
+            self.window.after(FRAME_MS, follow)
+
+        self.window.after(FRAME_MS, follow)
+        self.window.mainloop()
+        self.reader.close()
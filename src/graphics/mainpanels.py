@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import time
 import tkinter as tk
-from operator import itemgetter
-from typing import List, Tuple
+from bisect import bisect_right
+from typing import List
 
 from src import timer
 from src.graphics import actionpanels
 from src.graphics.interfaces import Panel
 from src.graphics.panels import TextPanel, PanelStyle, ClockPanel
+from src.metrics import METRICS, Histogram
 from src.timer import Clock
 
 _BG_COLOUR = '#000000'
@@ -49,25 +51,56 @@ def create_main_panel(root: tk.Tk, clock: Clock, width: int, height: int) -> Pan
     return main
 
 
+class TickCost:
+    """ Time spent updating the panels, in seconds """
+
+    def __init__(self):
+        self.ticks: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.ticks += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def mean(self) -> float:
+        return self.total / self.ticks if self.ticks else 0.0
+
+
 class PanelHolder(Panel):
     def __init__(self, width: int, height: int):
         self.width: int = width
         self.height: int = height
-        self._panels: List[Tuple[int, Panel]] = []
+        # kept sorted by order, the panels with the same order in insertion order
+        self._orders: List[int] = []
+        self._panels: List[Panel] = []
+        # tick duration of each panel, by panel class, recorded only when the metrics are enabled
+        self._histograms: List[Histogram] = []
+        self.cost = TickCost()
 
     def draw(self) -> None:
-        self._panels.sort(key=itemgetter(0))
-        for _, panel in self._panels:
+        for panel in self._panels:
             panel.draw()
 
     def tick(self) -> None:
-        self._panels.sort(key=itemgetter(0))
-        for _, panel in self._panels:
-            panel.tick()
+        start = time.perf_counter()
+        if METRICS.enabled:
+            for panel, histogram in zip(self._panels, self._histograms):
+                panel_start = time.perf_counter()
+                panel.tick()
+                histogram.observe(time.perf_counter() - panel_start)
+        else:
+            for panel in self._panels:
+                panel.tick()
+        self.cost.add(time.perf_counter() - start)
 
     def add_panel(self, panel: Panel, order: int) -> None:
         """
         :param panel: panel to add
         :param order: integer representing the draw (and tick) order of the panel
         """
-        self._panels.append((order, panel))
+        index = bisect_right(self._orders, order)
+        self._orders.insert(index, order)
+        self._panels.insert(index, panel)
+        self._histograms.insert(index, METRICS.histogram(f'panel.{type(panel).__name__}'))
@@ -1,13 +1,28 @@
 from __future__ import annotations
 
 import tkinter as tk
-from typing import Callable
+from typing import Callable, Dict, Tuple
 
 from src.graphics import utils
 from src.graphics.interfaces import Panel
 from src.timer import Clock
 
 
+_RENDERS: Dict[str, Tuple[str, str]] = {}
+
+
+def _render(value: str) -> Tuple[str, str]:
+    """
+    :param value: panel value, formatted as "text:colour"
+    :return: text and colour of the value, split only the first time
+    """
+    render = _RENDERS.get(value)
+    if render is None:
+        text, colour = value.split(':', 1)
+        render = _RENDERS[value] = (text, colour)
+    return render
+
+
 class PanelStyle:
     """ This class holds the immutable style properties of the TextPanel """
 
@@ -28,15 +43,19 @@ class TextPanel(Panel):
         self.clock: Clock = clock
         self.style: PanelStyle = style
         self.var_callback: Callable = var_callback
-        self.style_var = tk.StringVar(self.root, self.var_callback(self.clock))
+        self.value: str = self.var_callback(self.clock)
+        self.style_var = tk.StringVar(self.root, self.value)
+        # number of times the value changed and the canvas was updated
+        self.renders: int = 0
 
     def draw(self) -> None:
         canvas = tk.Canvas(self.root, width=self.style.width, height=self.style.height,
                            bg=self.style.bg_colour, highlightthickness=0)
+        text, colour = _render(self.value)
         text_id = canvas.create_text(self.style.width / 2, self.style.height / 2,
                                      anchor=tk.CENTER,
-                                     text=self.style_var.get().split(":")[0],
-                                     fill=self.style_var.get().split(":")[1],
+                                     text=text,
+                                     fill=colour,
                                      font=self.style.font)
         canvas.pack()
 
@@ -45,14 +64,18 @@ class TextPanel(Panel):
             The signature of the method must stay as is to work properly with tkinter.
             It also seems I can't move it from here to a more sensible place.
             """
-            canvas.itemconfigure(text_id,
-                                 text=self.style_var.get().split(":")[0],
-                                 fill=self.style_var.get().split(":")[1])
+            new_text, new_colour = _render(self.value)
+            canvas.itemconfigure(text_id, text=new_text, fill=new_colour)
 
         self.style_var.trace_add('write', on_change)
 
     def tick(self) -> None:
-        self.style_var.set(self.var_callback(self.clock))
+        """ Updates the panel only if its value changed """
+        value = self.var_callback(self.clock)
+        if value != self.value:
+            self.value = value
+            self.renders += 1
+            self.style_var.set(value)
 
 
 class ClockPanel(Panel):
@@ -65,14 +88,19 @@ class ClockPanel(Panel):
         self.clock: Clock = clock
         self.style: PanelStyle = style
         self.var_callback: Callable = var_callback
-        self.style_var = tk.StringVar(self.root, self.var_callback(self.clock))
+        self.value: str = self.var_callback(self.clock)
+        # the arc depends on the minute of the cycle, not only on the displayed value
+        self.cycle_minute: int = self.clock.get_cycle_minute()
+        self.style_var = tk.StringVar(self.root, self.value)
+        # number of times the value changed and the canvas was updated
+        self.renders: int = 0
 
     def draw(self) -> None:
         canvas = tk.Canvas(self.root, width=self.style.width, height=self.style.height,
                            bg=self.style.bg_colour, highlightthickness=0)
         text_id = canvas.create_text(self.style.width / 2, self.style.height / 2,
                                      anchor=tk.CENTER,
-                                     text=self.style_var.get().split(":")[0],
+                                     text=_render(self.value)[0],
                                      # fill=self.style_var.get().split(":")[1],  # 'white',
                                      fill='white',
                                      font=self.style.font)
@@ -84,7 +112,7 @@ class ClockPanel(Panel):
         arc_id = utils.draw_circle(canvas, self.style.width // 2, self.style.height // 2, self.style.width // 3,
                                    outline='red',
                                    width=6,
-                                   extent=-1 * int(self.style_var.get().split(":")[1]) * 6)
+                                   extent=utils.arc_extent(self.clock.get_cycle_minute()))
 
         canvas.pack()
 
@@ -93,14 +121,18 @@ class ClockPanel(Panel):
             The signature of the method must stay as is to work properly with tkinter.
             It also seems I can't move it from here to a more sensible place.
             """
-            hour = self.style_var.get().split(":")[0]
-            canvas.itemconfigure(text_id, text=hour)
+            canvas.itemconfigure(text_id, text=_render(self.value)[0])
 
-            minutes = int(self.style_var.get().split(":")[1])
-            extent = utils.calc_arc_extent(self.clock.day, self.clock.hour, minutes)
+            extent = utils.arc_extent(self.clock.get_cycle_minute())
             canvas.itemconfigure(arc_id, extent=extent)
 
         self.style_var.trace_add('write', on_change)
 
     def tick(self) -> None:
-        self.style_var.set(self.var_callback(self.clock))
+        """ Updates the panel only if the time changed """
+        cycle_minute = self.clock.get_cycle_minute()
+        if cycle_minute != self.cycle_minute:
+            self.cycle_minute = cycle_minute
+            self.value = self.var_callback(self.clock)
+            self.renders += 1
+            self.style_var.set(self.value)
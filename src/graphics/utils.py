@@ -1,4 +1,28 @@
+import os
 import tkinter as tk
+from typing import Dict, Tuple
+
+from src import timeline
+
+# images by path, with the modification time of the file they were loaded from
+_IMAGES: Dict[str, Tuple[int, tk.PhotoImage]] = {}
+
+
+def load_image(path: str) -> tk.PhotoImage:
+    """
+    Loads the image at the given path only once, sharing it among the widgets using it, and again only if the file
+    changes.
+    Tk's default root must already exist.
+
+    :param path: path to the image file
+    :return: the image
+    """
+    mtime = os.stat(path).st_mtime_ns
+    cached = _IMAGES.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, tk.PhotoImage(file=path))
+        _IMAGES[path] = cached
+    return cached[1]
 
 
 def draw_circle(canvas: tk.Canvas, x_coord: int, y_coord: int, ray: int, **kwargs) -> int:
@@ -32,9 +56,17 @@ def calc_arc_extent(day: int, hour: int, minutes: int) -> int:
     :param minutes: current minute
     :return: arc extent in degrees (int)
     """
-    extent = -1 * minutes * 6
-    if minutes == 0 and hour == 5 and day == 1:
-        return 0
+    return arc_extent(timeline.to_minute(day, hour, minutes))
+
+
+def arc_extent(cycle_minute: int) -> int:
+    """
+    Same as calc_arc_extent(), from the minute of the cycle: the arc is full at the start of every hour but the first.
+
+    :param cycle_minute: current minute of the cycle (see src.timeline)
+    :return: arc extent in degrees (int)
+    """
+    minutes = cycle_minute % timeline.HOUR_DURATION
     if minutes == 0:
-        return -359
-    return extent
+        return 0 if cycle_minute == 0 else -359
+    return -6 * minutes
@@ -2,13 +2,18 @@ from __future__ import annotations
 
 import logging
 import sys
+import time
 import tkinter as tk
 import tkinter.messagebox
-from typing import List
+from tkinter import ttk
+from typing import List, Optional, Sequence
 
-from src import ini, saves
+from src import bus, ini, persistence, saves
+from src.autosave import AutoSaver
 from src.graphics import mainpanels
 from src.graphics.interfaces import Panel
+from src.metrics import METRICS
+from src.scheduler import FRAME_MS, HeapScheduler
 from src.timer import Clock
 
 LOG = logging.getLogger(__name__)
@@ -18,16 +23,52 @@ class Window:
     _BG_COLOUR = '#000000'
     _MIN_WIDTH = 352
     _MIN_HEIGHT = 440
+    _TAB_HEIGHT = 24
+    _TITLE = 'Till the Final Hour'
+    _FAST_KEY = '<Control-f>'
+    _PANEL_KINDS = (bus.MINUTE, bus.JUMP, bus.PAUSE, bus.SPEED)
+    # the speed goes back to normal on jumps (forward, backward, reset)
+    _TITLE_KINDS = (bus.JUMP, bus.SPEED)
 
     _WIDTH = max(int(ini.gui("width")), _MIN_WIDTH)
     _HEIGHT = max(int(ini.gui("height")), _MIN_HEIGHT)
     _POS_X = int(ini.gui("pos-x"))
     _POS_Y = int(ini.gui("pos-y"))
 
-    def __init__(self, clock: Clock):
+    def __init__(self, clock: Clock, *others: Clock):
+        """
+        :param clock: clock to display and control
+        :param others: additional clocks, each one gets its own tab
+        """
         self.window = tk.Tk()
         self.clock = clock
-        self.panel: Panel = mainpanels.create_main_panel(self.window, self.clock, self._WIDTH, self._HEIGHT)
+        self.clocks: List[Clock] = [clock, *others]
+        self.scheduler: HeapScheduler = HeapScheduler()
+        self.panels: List[Panel] = []
+        self._height: int = self._HEIGHT
+        self.autosaver: Optional[AutoSaver] = None
+
+        self.tabs: Optional[ttk.Notebook] = None
+        tabs = None
+        if others:
+            self._height += self._TAB_HEIGHT
+            tabs = self.tabs = ttk.Notebook(self.window)
+            tabs.pack()
+            tabs.bind('<<NotebookTabChanged>>', lambda _: self._update_title())
+        for index, timer in enumerate(self.clocks):
+            root = self.window
+            if others:
+                root = tk.Frame(tabs, width=self._WIDTH, height=self._HEIGHT, bg=self._BG_COLOUR)
+                root.pack_propagate(False)
+                tabs.add(root, text=f'Clock {index + 1}')
+            panel = mainpanels.create_main_panel(root, timer, self._WIDTH, self._HEIGHT)
+            self.panels.append(panel)
+            self.scheduler.add(timer)
+            METRICS.add_source(f'panels.{index}', lambda cost=panel.cost: {
+                'ticks': cost.ticks, 'mean_ms': cost.mean() * 1000, 'max_ms': cost.max * 1000})
+            # once per step, only when the clock changes
+            bus.BUS.subscribe(lambda _, holder=panel: holder.tick(), self._PANEL_KINDS, timer)
+            bus.BUS.subscribe(lambda _: self._update_title(), self._TITLE_KINDS, timer)
 
     def _on_delete(self) -> None:
         """
@@ -36,6 +77,8 @@ class Window:
         LOG.info('Closing')
         self.window.destroy()
         LOG.info('Saving')
+        if self.autosaver is not None:
+            self.autosaver.stop()
         self._make_continue()
         sys.exit(0)
 
@@ -43,35 +86,63 @@ class Window:
         """
         Creates the 'continue' file.
         """
-        save_time = f'--day {self.clock.day} --hour {self.clock.hour} --minute {self.clock.minute}'
-        content = f'{ini.sys("entrypoint")} {save_time}'
+        persistence.make_continue(self.clock, others=self.clocks[1:])
 
-        save_list = saves.serialize()
-        if save_list:
-            content += f' --saves="{save_list}"'
+    def _current(self) -> int:
+        """
+        :return: index of the displayed clock
+        """
+        return self.tabs.index('current') if self.tabs else 0
 
-        with open('continue', 'w', encoding='utf-8') as batch_file:
-            batch_file.write(f'{content}\n')
+    def _cycle_speed(self, _: tk.Event) -> None:
+        """
+        Changes the fast-forward speed of the displayed clock, which the title shows.
+        """
+        index = self._current()
+        timer = self.clocks[index]
+        timer.cycle_speed()
+        self.scheduler.restart(index)
+        LOG.info('Speed x%d', timer.speed)
 
-    def _tick(self):
-        self.panel.tick()
+    def _update_title(self) -> None:
+        """
+        Shows the fast-forward speed of the displayed clock in the title.
+        """
+        speed = self.clocks[self._current()].speed
+        self.window.title(self._TITLE if speed == 1 else f'{self._TITLE} (x{speed})')
 
     def _draw(self, save_errors: List[str]) -> None:
         """
         Draws, displays and updates the main window of the programme.
         """
-        self.window.geometry(f'{self._WIDTH}x{self._HEIGHT}+{self._POS_X}+{self._POS_Y}')
+        self.window.geometry(f'{self._WIDTH}x{self._height}+{self._POS_X}+{self._POS_Y}')
         self.window.config(bg=self._BG_COLOUR)
         self.window.resizable(False, False)
-        self.window.title('Till the Final Hour')
+        self.window.title(self._TITLE)
+        self.window.bind(self._FAST_KEY, self._cycle_speed)
+
+        for panel in self.panels:
+            panel.draw()
 
-        self.panel.draw()
+        lateness = METRICS.histogram('tick.lateness')
+        duration = METRICS.histogram('tick.duration')
+        # when the next call is expected, to measure how late Tk runs it
+        expected = [0.0]
 
         def trigger_change():
-            if self.clock.running:
-                self.clock.update_time()
-                self._tick()
-            self.window.after(self.clock.get_interval(), trigger_change)
+            start = time.perf_counter()
+            if METRICS.enabled:
+                lateness.observe(max(0.0, start - expected[0]))
+            for index, owed in self.scheduler.poll():
+                timer = self.clocks[index]
+                timer.advance(owed, timer.catch_up())
+            # at most once per frame, however fast the clocks are
+            delay = max(self.scheduler.delay(), FRAME_MS)
+            if METRICS.enabled:
+                end = time.perf_counter()
+                duration.observe(end - start)
+                expected[0] = end + delay / 1000
+            self.window.after(delay, trigger_change)
 
         def show_save_errors():
             if save_errors:
@@ -79,11 +150,14 @@ class Window:
                     title='Savestate errors',
                     message='Unable to restore the following saves:\n - ' + '\n - '.join(save_errors))
 
-        self.window.after(self.clock.get_interval(), trigger_change)
+        self.autosaver = persistence.start_autosave(self.clock, others=self.clocks[1:])
+        self.scheduler.start()
+        expected[0] = time.perf_counter() + self.scheduler.delay() / 1000
+        self.window.after(self.scheduler.delay(), trigger_change)
         self.window.after(0, lambda: show_save_errors())
         self.window.mainloop()
 
-    def create(self, save_string: str):
+    def create(self, save_string: str, journal_errors: Sequence[str] = ()):
         self.window.wm_protocol("WM_DELETE_WINDOW", self._on_delete)
-        errors = saves.deserialize(save_string)
+        errors = [*journal_errors, *saves.deserialize(save_string)]
         self._draw(errors)
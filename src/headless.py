@@ -0,0 +1,244 @@
+"""
+Engine running the clock without any graphics, controlled by text commands from stdin or from a local socket
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import signal
+import socketserver
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from src import persistence, saves
+from src.metrics import METRICS
+from src.scheduler import FRAME_MS, TickScheduler
+from src.timer import Clock
+
+LOG = logging.getLogger(__name__)
+
+HELP = ('Commands: pause (run/stop), slow, fast (x1, x10, x100, x1000), forward, backward, reset, save <name>, '
+        'load <name>, delete <name>, list, status, quit')
+
+
+class HeadlessEngine:
+    """
+    Runs the clock on a lean loop: it sleeps until either the next minute is due or a command arrives.
+    Commands are executed by the loop's thread, so the clock is never touched concurrently.
+    """
+
+    def __init__(self, clock: Clock, options: str = ''):
+        """
+        :param clock: clock to run
+        :param options: command line options to keep in the 'continue' file
+        """
+        self.clock: Clock = clock
+        self.options: str = options
+        self.scheduler: TickScheduler = TickScheduler(clock)
+        self._commands: queue.Queue = queue.Queue()
+        self._stopped: bool = False
+        self._actions: Dict[str, Callable[[str], str]] = {
+            'pause': self._pause,
+            'slow': self._slow,
+            'fast': self._fast,
+            'forward': self._forward,
+            'backward': self._backward,
+            'reset': self._reset,
+            'save': self._save,
+            'load': self._load,
+            'delete': self._delete,
+            'list': self._list,
+            'status': self._status,
+            'help': lambda _: HELP,
+            'quit': self._quit,
+        }
+
+    def submit(self, line: str, reply: Callable[[str], None]) -> None:
+        """
+        Enqueues a command, it can be called from any thread.
+
+        :param line: command line, the command name followed by its argument (if any)
+        :param reply: function called, from the engine's thread, with the outcome of the command
+        """
+        self._commands.put((line, reply))
+
+    def run(self) -> None:
+        """
+        Runs the clock until the 'quit' command is received, then writes the 'continue' file.
+        """
+        autosaver = persistence.start_autosave(self.clock, self.options)
+        lateness = METRICS.histogram('tick.lateness')
+        self.scheduler.start()
+        try:
+            while not self._stopped:
+                try:
+                    delay = max(self.scheduler.delay(), FRAME_MS)
+                    line, reply = self._commands.get(timeout=delay / 1000)
+                    reply(self.execute(line))
+                except queue.Empty:
+                    pass
+                deadline = self.scheduler.deadline
+                owed = self.scheduler.poll()
+                if owed:
+                    if METRICS.enabled:
+                        lateness.observe(max(0.0, time.monotonic() - deadline))
+                    self.clock.advance(owed, self.clock.catch_up())
+        finally:
+            LOG.info('Saving')
+            if autosaver is not None:
+                autosaver.stop()
+            persistence.make_continue(self.clock, self.options)
+
+    def execute(self, line: str) -> str:
+        """
+        :param line: command line, the command name followed by its argument (if any)
+        :return: the outcome of the command
+        """
+        command, _, arg = line.strip().partition(' ')
+        action = self._actions.get(command.lower())
+        if action is None:
+            return f'Unknown command "{command}". {HELP}'
+        LOG.info('Command %s', line.strip())
+        return action(arg.strip())
+
+    def _status(self, _: str = '') -> str:
+        state = 'end' if self.clock.end else ('running' if self.clock.running else 'paused')
+        speed = 'slow' if self.clock.slow else 'normal'
+        if self.clock.speed > 1:
+            speed += f' x{self.clock.speed}'
+        return f'{self.clock.get_time_str()} {state} {speed}'
+
+    def _pause(self, _: str) -> str:
+        self.clock.un_pause()
+        return self._status()
+
+    def _slow(self, _: str) -> str:
+        self.clock.cycle_millis()
+        return self._status()
+
+    def _fast(self, _: str) -> str:
+        self.clock.cycle_speed()
+        self.scheduler.start()
+        return self._status()
+
+    def _forward(self, _: str) -> str:
+        self.clock.forward()
+        return self._status()
+
+    def _backward(self, _: str) -> str:
+        self.clock.backward()
+        return self._status()
+
+    def _reset(self, _: str) -> str:
+        self.clock.reset()
+        saves.clear()
+        return self._status()
+
+    def _save(self, name: str) -> str:
+        self.clock.un_pause('stop')
+        try:
+            save = saves.create(name, self.clock.day, self.clock.hour, self.clock.minute)
+        except ValueError as e:
+            return f'{e}\n{saves.NAME_RULES}'
+        LOG.info('Saved "%s"', repr(save))
+        return f'Saved {save}'
+
+    def _load(self, name: str) -> str:
+        save = saves.get(name)
+        if save is None:
+            return f'No save "{name}"'
+        self.clock.set_time(save.day, save.hour, save.minute)
+        saves.delete(name)
+        LOG.info('Loaded save "%s"', repr(save))
+        return self._status()
+
+    def _delete(self, name: str) -> str:
+        save = saves.get(name)
+        if save is None:
+            return f'No save "{name}"'
+        saves.delete(name)
+        LOG.info('Deleted save "%s"', repr(save))
+        return f'Deleted {save}'
+
+    def _list(self, _: str) -> str:
+        return '\n'.join(str(saves.get(name)) for name in saves.get_list())
+
+    def _quit(self, _: str) -> str:
+        self._stopped = True
+        return 'Bye'
+
+
+def read_stdin(engine: HeadlessEngine) -> None:
+    """
+    Starts a thread sending the lines read from stdin to the engine, printing the replies to stdout.
+    """
+    def read() -> None:
+        for line in sys.stdin:
+            if line.strip():
+                engine.submit(line, lambda text: print(text, flush=True))
+
+    threading.Thread(target=read, name='stdin-commands', daemon=True).start()
+
+
+class _CommandHandler(socketserver.StreamRequestHandler):
+    """ Reads commands line by line, answering each one with its outcome followed by an empty line. """
+
+    def handle(self) -> None:
+        for raw in self.rfile:
+            line = raw.decode('utf-8', errors='replace').strip()
+            if not line:
+                continue
+            replies: queue.Queue = queue.Queue(1)
+            self.server.engine.submit(line, replies.put)
+            self.wfile.write(f'{replies.get()}\n\n'.encode('utf-8'))
+
+
+class CommandServer(socketserver.ThreadingTCPServer):
+    """ Local TCP server accepting the engine's commands. """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, engine: HeadlessEngine, address: Tuple[str, int]):
+        super().__init__(address, _CommandHandler)
+        self.engine: HeadlessEngine = engine
+
+
+def listen(engine: HeadlessEngine, port: int, host: str = '127.0.0.1') -> CommandServer:
+    """
+    Starts a thread serving the engine's commands on the given local port.
+    :return: the server, to be shut down at the end
+    """
+    server = CommandServer(engine, (host, port))
+    threading.Thread(target=server.serve_forever, name='socket-commands', daemon=True).start()
+    LOG.info('Listening for commands on %s:%d', host, port)
+    return server
+
+
+def run(clock: Clock, save_string: str, port: Optional[int] = None, journal_errors: Sequence[str] = ()) -> None:
+    """
+    Runs the clock headless, reading the commands from stdin and, if a port is given, from a local socket.
+
+    :param clock: clock to run
+    :param save_string: saves to restore, see saves.deserialize()
+    :param port: local port for the commands, or None
+    :param journal_errors: entries of the saves' journal that could not be restored, shown with the others
+    """
+    errors = [*journal_errors, *saves.deserialize(save_string)]
+    if errors:
+        print('Unable to restore the following saves:\n - ' + '\n - '.join(errors), flush=True)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    options = '--headless' + (f' --listen {port}' if port is not None else '')
+    engine = HeadlessEngine(clock, options)
+    server = listen(engine, port) if port is not None else None
+    read_stdin(engine)
+    print(HELP, flush=True)
+    try:
+        engine.run()
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
@@ -1,14 +1,31 @@
-import configparser
 from errno import ENOENT
 import os
+from typing import Collection, Optional
 
 from definitions import INI_FILE
+from src.config import Config, Key, Listener, LiveConfig
 
 if not os.path.exists(INI_FILE):
     raise FileNotFoundError(ENOENT, os.strerror(ENOENT), INI_FILE)
 
-ini_values = configparser.ConfigParser()
-ini_values.read(INI_FILE)
+__LIVE = LiveConfig(INI_FILE)
+
+
+def current() -> Config:
+    """ Gets the current configuration, as a whole: it is replaced, never modified, when the .ini file changes """
+    return __LIVE.current
+
+
+def subscribe(listener: Listener, keys: Optional[Collection[Key]] = None) -> None:
+    """ Calls the listener with the changed (section, key) pairs, among the given ones, when the .ini file changes """
+    __LIVE.subscribe(listener, keys)
+
+
+def watch() -> None:
+    """ Starts reloading the .ini file when it changes, every SYSTEM.reload-ms milliseconds (0 never) """
+    interval = int(sys('reload-ms', '1000'))
+    if interval > 0:
+        __LIVE.watch(interval / 1000)
 
 
 def gui(key: str) -> str:
@@ -16,19 +33,19 @@ def gui(key: str) -> str:
     return __get('GUI', key)
 
 
-def timer(key: str) -> str:
-    """ Gets TIMER.key value from the .ini file """
-    return __get('TIMER', key)
+def timer(key: str, fallback: Optional[str] = None) -> str:
+    """ Gets TIMER.key value from the .ini file, or the fallback (if given) when the key is missing """
+    return __get('TIMER', key, fallback)
 
 
-def sound(key: str) -> str:
-    """ Gets SOUNDS.key value from the .ini file """
-    return __get('SOUNDS', key)
+def sound(key: str, fallback: Optional[str] = None) -> str:
+    """ Gets SOUNDS.key value from the .ini file, or the fallback (if given) when the key is missing """
+    return __get('SOUNDS', key, fallback)
 
 
-def sys(key: str) -> str:
-    """ Gets SYSTEM.key value from the .ini file """
-    return __get('SYSTEM', key)
+def sys(key: str, fallback: Optional[str] = None) -> str:
+    """ Gets SYSTEM.key value from the .ini file, or the fallback (if given) when the key is missing """
+    return __get('SYSTEM', key, fallback)
 
 
 def img(key: str) -> str:
@@ -36,5 +53,5 @@ def img(key: str) -> str:
     return __get('IMAGES', key)
 
 
-def __get(section: str, key: str) -> str:
-    return ini_values[section][key]
+def __get(section: str, key: str, fallback: Optional[str] = None) -> str:
+    return __LIVE.current.get(section, key, fallback)
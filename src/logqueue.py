@@ -0,0 +1,119 @@
+"""
+Logging off the caller's thread: the records go through a bounded queue to a listener thread, which does the disk I/O,
+so that logging from the Tk thread (or on every tick) never waits for the file or its rotation.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+from datetime import datetime
+from typing import Dict, Optional
+
+# attributes of every record, the others come from the 'extra' argument
+_STANDARD = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """ Queues the records without ever blocking: when the queue is full, the record is dropped and counted. """
+
+    def __init__(self, size: int):
+        """
+        :param size: records the queue holds before dropping the new ones
+        """
+        super().__init__(queue.Queue(size))
+        # only formats the traceback: the listener's handler does the rest of the formatting
+        self.setFormatter(logging.Formatter('%(message)s'))
+        self.dropped: int = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Merges the arguments into the message, as the base class, but keeps the traceback apart as text in exc_text,
+        which the listener's formatter appends to the message or, for JsonFormatter, writes as its own field.
+        """
+        record = copy.copy(record)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatter.formatException(record.exc_info)
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """ Formats a record as a line of JSON: time, level, logger, thread, message and any 'extra' field """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, object] = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _STANDARD:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+class _Listener(logging.handlers.QueueListener):
+    """ Listener whose stop marker waits for room in the queue, which may be full when it is stopped """
+    STOP_TIMEOUT = 5.0
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel, timeout=self.STOP_TIMEOUT)
+
+
+class LogPipeline:
+    """ The root logger's queue handler and the listener writing its records to the actual handler """
+
+    def __init__(self, handler: logging.Handler, size: int = 10000, level: int = logging.INFO):
+        """
+        :param handler: handler doing the I/O, on the listener's thread
+        :param size: records queued before dropping the new ones
+        :param level: level of the root logger
+        """
+        self.handler: logging.Handler = handler
+        self.queue_handler = DroppingQueueHandler(size)
+        self.level: int = level
+        self._listener: Optional[_Listener] = None
+
+    @property
+    def dropped(self) -> int:
+        return self.queue_handler.dropped
+
+    def start(self) -> None:
+        """ Replaces the root logger's handlers with the queue and starts the listener. """
+        logging.basicConfig(handlers=[self.queue_handler], force=True, level=self.level)
+        self._listener = _Listener(self.queue_handler.queue, self.handler)
+        self._listener.start()
+
+    def stop(self) -> None:
+        """ Writes the queued records, and how many were dropped, then stops the listener. """
+        if self._listener is None:
+            return
+        try:
+            self._listener.stop()
+        except queue.Full:
+            # the handler is stuck: the records still queued are lost
+            self.queue_handler.dropped += self.queue_handler.queue.qsize()
+        self._listener = None
+        if self.dropped:
+            self.handler.handle(logging.makeLogRecord({
+                'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                'msg': '%d log records dropped: the queue was full', 'args': (self.dropped,)}))
+        self.handler.close()
@@ -0,0 +1,172 @@
+"""
+Runtime metrics, to see where the time goes on a machine where the clock "feels slow": histograms of durations
+(scheduling lateness, panel ticks, button callables, sound loading and playing) and the counters the other modules
+already keep, collected as sources.
+Recording is off unless enabled (--stats): the instrumented code only checks METRICS.enabled.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import sys
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+LOG = logging.getLogger(__name__)
+
+# upper bounds of the buckets, in seconds, the last bucket holds everything slower
+BOUNDS: Tuple[float, ...] = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+Source = Callable[[], Mapping[str, float]]
+
+
+class Histogram:
+    """ Distribution of durations in fixed buckets, with their count, total and maximum """
+    __slots__ = ('name', 'counts', 'count', 'total', 'max')
+
+    def __init__(self, name: str):
+        self.name: str = name
+        self.counts: List[int] = [0] * (len(BOUNDS) + 1)
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """
+        :param fraction: between 0 and 1, e.g. 0.99
+        :return: upper bound of the bucket holding the given percentile, in seconds (the maximum for the last bucket)
+        """
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return BOUNDS[index] if index < len(BOUNDS) else self.max
+        return self.max
+
+    def __str__(self) -> str:
+        return (f'{self.name} count={self.count} mean_ms={self.mean() * 1000:.3f} '
+                f'p50_ms<={self.percentile(0.5) * 1000:g} p99_ms<={self.percentile(0.99) * 1000:g} '
+                f'max_ms={self.max * 1000:.3f}')
+
+
+class Metrics:
+    """ Histograms by name and sources of counters, reported together as text """
+
+    def __init__(self):
+        self.enabled: bool = False
+        self._histograms: Dict[str, Histogram] = {}
+        self._sources: Dict[str, Source] = {}
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def histogram(self, name: str) -> Histogram:
+        """
+        :param name: name of the histogram, created if it doesn't exist yet
+        :return: the histogram, to be kept by the caller if it records often
+        """
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram(name))
+        return histogram
+
+    def add_source(self, name: str, source: Source) -> None:
+        """
+        :param name: name of the source, replacing the previous one with the same name
+        :param source: function returning the current values of some counters
+        """
+        with self._lock:
+            self._sources[name] = source
+
+    def report(self) -> str:
+        """
+        :return: one line for each histogram that recorded something, then one line for each source
+        """
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            sources = sorted(self._sources.items())
+        lines = [str(histogram) for _, histogram in histograms if histogram.count]
+        for name, source in sources:
+            try:
+                values = source()
+            except Exception as e:  # pylint: disable=broad-except
+                lines.append(f'{name} error={e}')
+                continue
+            lines.append(' '.join([name, *(f'{key}={_format(value)}' for key, value in values.items())]))
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """
+        Serves the report as plain text to any GET request, from a background thread.
+
+        :param port: port to listen on, 0 for any free one
+        :param host: address to listen on, local only by default
+        :return: the running server
+        :raise OSError: if the server can't listen on the given address
+        """
+        metrics = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # pylint: disable=invalid-name
+                body = metrics.report().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+        LOG.info('Serving the metrics on %s:%d', host, server.server_address[1])
+        return server
+
+
+def _format(value: float) -> str:
+    return f'{value:.3f}' if isinstance(value, float) else str(value)
+
+
+METRICS = Metrics()
+
+
+def start(dump: bool, port: Optional[int]) -> None:
+    """
+    Enables the metrics if they are to be dumped at exit or served.
+
+    :param dump: write the report to stderr (and to the log) at exit
+    :param port: local port to serve the report on, None not to serve it
+    """
+    if not dump and port is None:
+        return
+    METRICS.enable()
+    if port is not None:
+        try:
+            METRICS.serve(port)
+        except OSError as e:
+            LOG.error('Unable to serve the metrics on port %d: %s', port, e)
+    if dump:
+        def write() -> None:
+            report = METRICS.report()
+            LOG.info('Metrics:\n%s', report)
+            sys.stderr.write(report)
+
+        atexit.register(write)
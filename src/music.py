@@ -1,19 +1,330 @@
+from __future__ import annotations
+
+import logging
 import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Sequence, Tuple
 
+from src import bus
 from src import ini
+from src import timeline
+from src.metrics import METRICS
 
-os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'  # https://github.com/pygame/pygame/issues/1468
-
-from pygame import mixer
+LOG = logging.getLogger(__name__)
 
-mixer.init()
 __CHANNEL_CLOCK = 0
 __CHANNEL_ENV = 1
 __CHANNELS = [__CHANNEL_CLOCK, __CHANNEL_ENV]
 
+SOUND_KEYS = ('bells', 'tick', 'rumble', 'transition')
+
+
+class SoundCache:
+    """
+    Keeps the decoded sounds in memory, so that each file is read and decoded only once.
+    When the total size goes over the limit, the least recently used sounds are evicted; a sound whose file has been
+    modified is decoded again.
+    """
+
+    def __init__(self, max_bytes: int, decode: Callable[[str], Tuple[Any, int]]):
+        """
+        :param max_bytes: maximum total size of the decoded sounds, the last sound used is kept anyway
+        :param decode: function decoding the file at the given path, returning the sound and its size in bytes
+        """
+        self.max_bytes: int = max_bytes
+        self.size: int = 0
+        self._decode: Callable[[str], Tuple[Any, int]] = decode
+        self._sounds: OrderedDict[str, Tuple[float, int, Any]] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, path: str) -> Any:
+        """
+        :param path: path to the sound file
+        :return: the decoded sound
+        :raise FileNotFoundError: if there is no such file
+        """
+        mtime = os.stat(path).st_mtime
+        with self._lock:
+            entry = self._sounds.get(path)
+            if entry is not None and entry[0] == mtime:
+                self._sounds.move_to_end(path)
+                return entry[2]
+
+        sound, size = self._decode(path)
+        with self._lock:
+            old = self._sounds.pop(path, None)
+            if old is not None:
+                self.size -= old[1]
+            self._sounds[path] = (mtime, size, sound)
+            self.size += size
+            while self.size > self.max_bytes and len(self._sounds) > 1:
+                evicted, (_, evicted_size, _) = self._sounds.popitem(last=False)
+                self.size -= evicted_size
+                LOG.debug('Evicted sound %s', evicted)
+        LOG.debug('Decoded sound %s, %d bytes', path, size)
+        return sound
+
+    def clear(self) -> None:
+        """ Removes every sound from the cache. """
+        with self._lock:
+            self._sounds.clear()
+            self.size = 0
+
+
+class NullBackend:
+    """ Silent audio backend, used when there is no audio device or when configured. """
+
+    def load(self, path: str) -> None:
+        """ Prepares the sound at the given path. """
+
+    def play(self, path: str, channel: int) -> None:
+        """ Plays the sound at the given path on the given channel. """
+
+    def stop(self, channel: int) -> None:
+        """ Stops the given channel. """
+
+    def busy(self, channel: int) -> bool:
+        """ Tells whether the given channel is playing. """
+        return False
+
+
+class PygameBackend(NullBackend):
+    """ Audio backend using pygame's mixer, imported and initialised on creation. """
+
+    def __init__(self, cache_bytes: int):
+        """
+        :param cache_bytes: maximum size of the decoded sounds kept in memory
+        :raise ImportError: if pygame is not installed
+        :raise pygame.error: if the mixer cannot be initialised (e.g. no audio device)
+        """
+        os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'  # https://github.com/pygame/pygame/issues/1468
+        from pygame import mixer  # pylint: disable=import-outside-toplevel
+
+        mixer.init()
+        self.mixer = mixer
+        self.cache: SoundCache = SoundCache(cache_bytes, self._decode)
+
+    def load(self, path: str) -> None:
+        self.cache.get(path)
+
+    def play(self, path: str, channel: int) -> None:
+        self.mixer.Channel(channel).play(self.cache.get(path))
+
+    def stop(self, channel: int) -> None:
+        self.mixer.Channel(channel).stop()
+
+    def busy(self, channel: int) -> bool:
+        return bool(self.mixer.Channel(channel).get_busy())
+
+    def _decode(self, path: str) -> Tuple[Any, int]:
+        """ Decodes the file, computing the size of its samples. """
+        sound = self.mixer.Sound(path)
+        frequency, sample_format, channels = self.mixer.get_init()
+        return sound, int(sound.get_length() * frequency) * channels * (abs(sample_format) // 8)
+
+
+def create_backend(name: str) -> NullBackend:
+    """
+    Creates the audio backend.
+
+    :param name: 'pygame', 'null' or 'auto'; the latter is pygame if it is installed and it finds an audio device, null
+    otherwise
+    :return: the backend
+    """
+    if name == 'null':
+        return NullBackend()
+    cache_bytes = int(ini.sound('cache-size', '64')) * 1024 * 1024
+    if name == 'pygame':
+        return PygameBackend(cache_bytes)
+    try:
+        return PygameBackend(cache_bytes)
+    except Exception as e:  # pylint: disable=broad-except
+        LOG.warning('No audio available, sounds are disabled: %s', str(e))
+        return NullBackend()
+
+
+class LatencyStats(NamedTuple):
+    """ Time from the request of a sound to the start of its playback, loading and waiting for its channel included """
+    count: int
+    mean_ms: float
+    max_ms: float
+
+
+class AudioWorker:
+    """
+    Thread owning the audio backend: sounds are requested by putting tasks in its queue, so that loading a sound or a
+    stalling device never block the caller (i.e. the Tk mainloop).
+    The thread starts, and creates the backend, with the first task.
+    Sounds requested together play one after the other on each channel: the worker starts the next one when the channel
+    is no longer busy.
+    """
+    # seconds between two checks of the channels, while some sounds wait for them
+    _POLL = 0.02
+
+    def __init__(self, backend: str, resolve: Callable[[str], str] = ini.sound,
+                 create: Callable[[str], NullBackend] = create_backend):
+        """
+        :param backend: name of the backend, see create_backend()
+        :param resolve: function giving the path of a sound from its key
+        :param create: function creating the backend from its name
+        """
+        self.backend_name: str = backend
+        self.backend: Optional[NullBackend] = None
+        self._resolve: Callable[[str], str] = resolve
+        self._create: Callable[[str], NullBackend] = create
+        # keys of the sounds waiting for their channel, with the time they were requested, by channel, only touched by
+        # the worker's thread
+        self._pending: Dict[int, Deque[Tuple[str, float]]] = {}
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread = None
+        self._lock: threading.Lock = threading.Lock()
+        self._count: int = 0
+        self._total: float = 0.0
+        self._max: float = 0.0
+
+    def submit(self, task: Callable[[NullBackend], None]) -> None:
+        """
+        Enqueues the task and returns immediately.
+        :param task: audio operation to execute with the backend on the worker thread
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='audio-worker', daemon=True)
+                self._thread.start()
+        self._queue.put(task)
+
+    def play(self, sounds: Sequence[Tuple[str, int]]) -> None:
+        """
+        Plays the sounds in the given order. The first sound of each channel starts at once, replacing whatever the
+        channel was playing or about to play; each of the others starts when the previous one of its channel ends.
+        Missing files are ignored.
+
+        :param sounds: (key, channel) pairs
+        """
+        requested = time.perf_counter()
+        sounds = list(sounds)
+        self.submit(lambda backend: self._replace(backend, sounds, requested))
+
+    def stop(self, channels: Sequence[int]) -> None:
+        """ Stops the given channels, forgetting the sounds waiting for them. """
+        channels = list(channels)
+
+        def stop_all(backend: NullBackend) -> None:
+            for channel in channels:
+                self._pending.pop(channel, None)
+                backend.stop(channel)
+
+        self.submit(stop_all)
+
+    def latency(self) -> LatencyStats:
+        """
+        :return: statistics on the time from the request of each sound played to the start of its playback
+        """
+        with self._lock:
+            count, total, longest = self._count, self._total, self._max
+        return LatencyStats(count, (total / count if count else 0.0) * 1000, longest * 1000)
+
+    def _run(self) -> None:
+        try:
+            self.backend = self._create(self.backend_name)
+        except Exception:  # pylint: disable=broad-except
+            # e.g. backend=pygame without pygame or without an audio device: the tasks still run, silently
+            LOG.exception('Unable to create the %s audio backend, sounds are disabled', self.backend_name)
+            self.backend = NullBackend()
+        while True:
+            try:
+                task = self._queue.get(timeout=self._POLL if self._pending else None)
+            except queue.Empty:
+                self._play_pending()
+                continue
+            try:
+                task(self.backend)
+            except FileNotFoundError:
+                pass
+            except Exception:  # pylint: disable=broad-except
+                LOG.exception('Audio task failed')
+            self._play_pending()
+
+    def _replace(self, backend: NullBackend, sounds: List[Tuple[str, int]], requested: float) -> None:
+        for channel in dict.fromkeys(channel for _, channel in sounds):
+            keys = deque((key, requested) for key, sound_channel in sounds if sound_channel == channel)
+            self._start(backend, *keys.popleft(), channel)
+            self._pending[channel] = keys
+        self._pending = {channel: keys for channel, keys in self._pending.items() if keys}
+
+    def _play_pending(self) -> None:
+        """ Starts the next sound of each channel that is done playing. """
+        for channel, keys in list(self._pending.items()):
+            if not self.backend.busy(channel):
+                self._start(self.backend, *keys.popleft(), channel)
+                if not keys:
+                    del self._pending[channel]
+
+    def _start(self, backend: NullBackend, key: str, requested: float, channel: int) -> None:
+        """
+        Plays a sound, recording the time since it was requested and, if the metrics are enabled, the time spent loading
+        it (decoding it, if not cached) and starting it.
+        """
+        try:
+            path = self._resolve(key)
+            if METRICS.enabled:
+                start = time.perf_counter()
+                backend.load(path)
+                loaded = time.perf_counter()
+                backend.play(path, channel)
+                METRICS.histogram('sound.load').observe(loaded - start)
+                METRICS.histogram('sound.play').observe(time.perf_counter() - loaded)
+            else:
+                backend.play(path, channel)
+        except FileNotFoundError:
+            return
+        except Exception:  # pylint: disable=broad-except
+            LOG.exception('Unable to play %s', key)
+            return
+        latency = time.perf_counter() - requested
+        with self._lock:
+            self._count += 1
+            self._total += latency
+            self._max = max(self._max, latency)
+
+
+__WORKER = AudioWorker(ini.sound('backend', 'auto'))
+METRICS.add_source('sound.latency', lambda: __WORKER.latency()._asdict())
+
+
+def preload(background: bool = True, timeout: float = 30.0) -> bool:
+    """
+    Decodes all the configured sounds, so that they are ready when they first play.
+    Missing files are ignored.
+
+    :param background: if True, the sounds are decoded by the audio worker, otherwise the call waits for them
+    :param timeout: longest wait, in seconds, if not in background
+    :return: False if the sounds were not decoded within the timeout
+    """
+    done = threading.Event()
+
+    def load_all(backend: NullBackend) -> None:
+        for key in SOUND_KEYS:
+            try:
+                backend.load(ini.sound(key))
+            except (FileNotFoundError, KeyError):
+                pass
+        done.set()
+
+    __WORKER.submit(load_all)
+    if background:
+        return True
+    if not done.wait(timeout):
+        LOG.warning('Sounds not preloaded after %.0f seconds', timeout)
+        return False
+    return True
+
 
 def bells() -> None:
-    """ Plays the bells. """
+    """ Plays the bells. Like the other sounds, it does not wait for the playback to start. """
     __play('bells', __CHANNEL_CLOCK)
 
 
@@ -34,19 +345,53 @@ def new_day() -> None:
 
 def stop() -> None:
     """ Stops every sound immediately. """
-    for channel in __CHANNELS:
-        mixer.Channel(channel).stop()
+    __WORKER.stop(__CHANNELS)
+
+
+def attach(event_bus: bus.EventBus = bus.BUS) -> bus.Subscription:
+    """
+    Plays the sounds of the clocks' events: the audible bells, ticks, rumbles and day transitions, and stops every sound
+    when a clock jumps to another time.
+
+    :param event_bus: bus the clocks publish on
+    :return: the subscription
+    """
+    return event_bus.subscribe(__on_events, bus.SOUND_KINDS | {bus.JUMP})
+
+
+def __on_events(events: List[bus.BusEvent]) -> None:
+    sounds = []
+    for event in events:
+        if event.kind == bus.JUMP:
+            stop()
+        elif event.audible:
+            sounds.append(__SOUNDS[event.kind])
+    if sounds:
+        __WORKER.play(sounds)
+
+
+def latency() -> LatencyStats:
+    """
+    :return: statistics on the time from the request of a sound to the start of its playback
+    """
+    return __WORKER.latency()
 
 
 def __play(key: str, channel: int) -> None:
     """
-    Plays the sound at the specified path on the specified channel.
+    Asks the audio worker to play the sound at the specified path on the specified channel.
     If no file is found it does nothing.
 
     :param key: path to the sound file.
     :param channel: channel number, to allow multiple sounds simultaneously.
     """
-    try:
-        mixer.Channel(channel).play(mixer.Sound(ini.sound(key)))
-    except FileNotFoundError:
-        pass
+    __WORKER.play([(key, channel)])
+
+
+# key and channel of the sound of each kind of event
+__SOUNDS = {
+    timeline.BELL: ('bells', __CHANNEL_CLOCK),
+    timeline.TICK: ('tick', __CHANNEL_CLOCK),
+    timeline.RUMBLE: ('rumble', __CHANNEL_ENV),
+    timeline.DAY: ('transition', __CHANNEL_CLOCK),
+}
@@ -0,0 +1,80 @@
+"""
+Persistence of the clock's time and of the saves between executions
+"""
+
+from __future__ import annotations
+
+import os
+from typing import List, Optional, Sequence
+
+from src import ini, saves, timeline
+from src.autosave import AutoSaver
+from src.metrics import METRICS
+from src.savestore import SaveJournal
+from src.timer import Clock
+
+CONTINUE_FILE = 'continue'
+SAVES_FILE = ini.sys('saves-file', 'saves.journal')
+AUTOSAVE_MS = int(ini.sys('autosave-ms', '5000'))
+
+
+def open_saves() -> List[str]:
+    """
+    Loads the saves from the journal file, which from now on records every change to them.
+    If the file is set to an empty value, the saves are kept only in the 'continue' file.
+
+    :return: list of the entries that could not be restored (empty if there are none)
+    """
+    if not SAVES_FILE:
+        return []
+    return saves.attach(SaveJournal(SAVES_FILE))
+
+
+def make_continue(clock: Clock, options: str = '', others: Sequence[Clock] = ()) -> None:
+    """
+    Creates the 'continue' file, with the command line restarting from the clock's current time and saves.
+
+    :param clock: clock whose time is saved
+    :param options: additional command line options
+    :param others: additional clocks whose time is saved
+    """
+    # a single read: the clock may be advancing on another thread
+    day, hour, minute = timeline.from_minute(clock.get_cycle_minute())
+    save_time = f'--day {day} --hour {hour} --minute {minute}'
+    content = f'{ini.sys("entrypoint")} {save_time}'
+    for other in others:
+        content += f' --clock {other.get_time_str()}'
+    if options:
+        content += f' {options}'
+
+    # saves kept by the store are already on disk
+    save_list = '' if saves.is_stored() else saves.serialize()
+    if save_list:
+        content += f' --saves="{save_list}"'
+
+    # the new file replaces the old one only when complete
+    with open(CONTINUE_FILE + '.tmp', 'w', encoding='utf-8') as batch_file:
+        batch_file.write(f'{content}\n')
+    os.replace(CONTINUE_FILE + '.tmp', CONTINUE_FILE)
+
+
+def start_autosave(clock: Clock, options: str = '', others: Sequence[Clock] = ()) -> Optional[AutoSaver]:
+    """
+    Starts saving the 'continue' file in the background whenever the clocks' time or the saves (if they are not in the
+    journal) change, at most once every AUTOSAVE_MS milliseconds.
+    The parameters are the same of make_continue().
+
+    :return: the running saver, to be stopped before the last make_continue(), or None if autosave is disabled
+    """
+    if AUTOSAVE_MS <= 0:
+        return None
+    clocks = [clock, *others]
+
+    def state() -> tuple:
+        return (0 if saves.is_stored() else saves.version(), *(timer.version for timer in clocks))
+
+    saver = AutoSaver(state, lambda: make_continue(clock, options, others), AUTOSAVE_MS / 1000)
+    saver.start()
+    METRICS.add_source('autosave', lambda: {
+        'writes': saver.writes, 'mean_ms': saver.latency_mean() * 1000, 'max_ms': saver.latency_max * 1000})
+    return saver
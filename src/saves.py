@@ -2,13 +2,62 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import List, Optional, Dict
+from bisect import bisect_left, insort
+from typing import Iterator, List, NamedTuple, Optional, Dict, TextIO, Tuple, Union, TYPE_CHECKING
+
+from src import timeline
+
+if TYPE_CHECKING:
+    from src.savestore import SaveJournal
 
 LOG = logging.getLogger(__name__)
 
 NAME_RULES = "Rules:\n - length 1 to 16;\n - allowed characters: English alphabet letters, digits and whitespace"
 
 _SAVES: Dict[str, SaveState] = {}
+# (minute of the cycle, name) of every save, sorted
+_INDEX: List[Tuple[int, str]] = []
+_STORE: Optional[SaveJournal] = None
+# incremented at every change of the saves, to detect them
+_VERSION = 0
+
+
+def attach(store: SaveJournal) -> List[str]:
+    """
+    Loads the saves from the store, which from now on records every change.
+    :param store: durable store of the saves
+    :return list of the entries that could not be restored (empty if there are none)
+    """
+    global _STORE
+    loaded, errors = store.load()
+    for save in loaded.values():
+        _put(save)
+    _STORE = store
+    return errors
+
+
+def detach() -> None:
+    """
+    Stops recording the changes in the store, closing it.
+    """
+    global _STORE
+    if _STORE is not None:
+        _STORE.close()
+    _STORE = None
+
+
+def version() -> int:
+    """
+    :return: a number that changes every time the saves change
+    """
+    return _VERSION
+
+
+def is_stored() -> bool:
+    """
+    :return: True if the saves are recorded by a durable store
+    """
+    return _STORE is not None
 
 
 def create(name: str, day: int, hour: int, minute: int) -> SaveState:
@@ -27,7 +76,10 @@ def create(name: str, day: int, hour: int, minute: int) -> SaveState:
     save = SaveState(name, day, hour, minute)
     if name in _SAVES:
         raise ValueError(f'"{name}" already in use')
-    _SAVES[name] = save
+    _put(save)
+    if _STORE is not None:
+        _STORE.created(save)
+        _compact_store()
     return save
 
 
@@ -46,19 +98,87 @@ def get(name: str) -> Optional[SaveState]:
     return _SAVES.get(name, None)
 
 
+def get_between(start: int, end: int) -> List[SaveState]:
+    """
+    :param start: minute of the cycle (see src.timeline), included
+    :param end: minute of the cycle, included
+    :return: the saves between the two times, ordered by time
+    """
+    first = bisect_left(_INDEX, (start, ''))
+    last = bisect_left(_INDEX, (end + 1, ''))
+    return [_SAVES[name] for _, name in _INDEX[first:last]]
+
+
+def get_nearest(minute: int) -> Optional[SaveState]:
+    """
+    :param minute: minute of the cycle (see src.timeline)
+    :return: the save nearest to the given time (the earlier one on ties), or None if there are no saves
+    """
+    index = bisect_left(_INDEX, (minute, ''))
+    candidates = _INDEX[max(index - 1, 0):index + 1]
+    if not candidates:
+        return None
+    _, name = min(candidates, key=lambda entry: abs(entry[0] - minute))
+    return _SAVES[name]
+
+
+def iter_ordered() -> Iterator[SaveState]:
+    """
+    :return: iterator over the saves, ordered by time (then name)
+    """
+    return (_SAVES[name] for _, name in list(_INDEX))
+
+
 def delete(name: str) -> None:
     """
     Deletes the save with the given name
     :param name: name of the save to delete
     """
-    _SAVES.pop(name, None)
+    if _remove(name) and _STORE is not None:
+        _STORE.deleted(name)
+        _compact_store()
 
 
 def clear() -> None:
     """
     Deletes all the current savestates
     """
+    global _VERSION
     _SAVES.clear()
+    _INDEX.clear()
+    _VERSION += 1
+    if _STORE is not None:
+        _STORE.cleared()
+        _compact_store()
+
+
+def _put(save: SaveState) -> None:
+    """ Stores the save, replacing the one with the same name, keeping the time index sorted. """
+    global _VERSION
+    _remove(save.name)
+    _SAVES[save.name] = save
+    insort(_INDEX, (save.get_cycle_minute(), save.name))
+    _VERSION += 1
+
+
+def _remove(name: str) -> bool:
+    """
+    Removes the save with the given name from both the saves and the time index.
+    :return: True if the save existed
+    """
+    global _VERSION
+    save = _SAVES.pop(name, None)
+    if save is None:
+        return False
+    entry = (save.get_cycle_minute(), name)
+    del _INDEX[bisect_left(_INDEX, entry)]
+    _VERSION += 1
+    return True
+
+
+def _compact_store() -> None:
+    if _STORE.needs_compaction():
+        _STORE.compact(_SAVES.values())
 
 
 def serialize() -> str:
@@ -66,43 +186,123 @@ def serialize() -> str:
     Converts the saves to a comma-separated string, that can be later deserialised
     :return: string representing all the saves in memory
     """
-    save_list = [repr(save) for save in _SAVES.values()]
+    # list() copies the values at once, it's safe even while another thread changes the saves
+    save_list = [repr(save) for save in list(_SAVES.values())]
     return ','.join(save_list)
 
 
-def deserialize(string: str) -> List[str]:
+class ParsedSave(NamedTuple):
+    """ An entry of a string of saves: the save, or None if the value is invalid """
+    offset: int
+    value: str
+    save: Optional[SaveState]
+
+
+def parse(source: Union[str, TextIO], chunk_size: int = 64 * 1024) -> Iterator[ParsedSave]:
+    """
+    Parses a string of comma-separated repr(SaveState), reading it one chunk at a time.
+    Line breaks around the values and empty values are ignored.
+
+    :param source: the string, or a text file to read from
+    :param chunk_size: number of characters read at a time
+    :return: iterator over the entries, in order, with their offset from the start of the source
+    """
+    from_match = SaveState.from_match
+    for offset, value in _split(source, chunk_size):
+        match = SaveState.match(value)
+        yield ParsedSave(offset, value, None if match is None else from_match(match))
+
+
+def _split(source: Union[str, TextIO], chunk_size: int) -> Iterator[Tuple[int, str]]:
+    """
+    :return: iterator over the non-empty comma-separated values of the source, with their offsets
+    """
+    if isinstance(source, str):
+        chunks = (source[i:i + chunk_size] for i in range(0, len(source), chunk_size))
+    else:
+        chunks = iter(lambda: source.read(chunk_size), '')
+    # a longer value is invalid anyway, there's no need to keep more than this
+    limit = SaveState.MAX_LEN + 1
+    carry = ''
+    start = 0
+    position = 0
+    for chunk in chunks:
+        parts = chunk.split(',')
+        head = parts[0]
+        if not carry:
+            # the leading line breaks must not count against the limit
+            head = head.lstrip('\r\n')
+            start += len(parts[0]) - len(head)
+        carry = (carry + head)[:limit]
+        in_chunk = len(parts[0])
+        for part in parts[1:]:
+            value = carry.rstrip('\r\n')
+            if value:
+                yield start, value
+            head = part.lstrip('\r\n')
+            start = position + in_chunk + 1 + len(part) - len(head)
+            carry = head[:limit]
+            in_chunk += len(part) + 1
+        position += len(chunk)
+    value = carry.rstrip('\r\n')
+    if value:
+        yield start, value
+
+
+def deserialize(source: Union[str, TextIO]) -> List[str]:
     """
     Deserialise the given string, storing the values in memory.
     It expects a string of comma-separated repr(SaveState), for example the one returned by the serialize() method.
-    :param string: string to deserialise
+    :param source: string to deserialise, or a text file to read it from
     :return list of badly formatted savestates (empty if there are none)
     """
-    values = string.split(',')
-    LOG.debug('Found %d potential savestates', len(values))
     errors = []
-    for value in values:
-        if value:
-            try:
-                save = SaveState.from_str(value)
-                _SAVES[save.name] = save
-                LOG.debug('Restored savestate %s', str(save))
-            except ValueError as e:
-                LOG.error('Invalid savestate string "%s"', value)
-                errors.append(value)
+    restored = []
+    for offset, value in _split(source, 64 * 1024):
+        match = SaveState.match(value)
+        if match is not None:
+            save = SaveState.from_match(match)
+            _put(save)
+            restored.append(save)
+        else:
+            LOG.error('Invalid savestate string "%s" at offset %d', value, offset)
+            errors.append(value)
+    LOG.debug('Restored %d savestates', len(restored))
+    if _STORE is not None:
+        _STORE.created_all(restored)
+        _compact_store()
     return errors
 
 
 class SaveState:
     NAME_LEN = 16
+    MAX_LEN = NAME_LEN + len('@1.00.00')
     _NAME_PAT = "[a-zA-Z0-9 ]{1," + str(NAME_LEN) + "}"
     _TIME_PAT = "[1-3]\\.(?:[01][0-9]|2[0-3])\\.[0-5][0-9]"
-    _PATTERN = "^" + _NAME_PAT + "@" + _TIME_PAT + "$"
+    _NAME_RE = re.compile(_NAME_PAT)
+    _SAVE_RE = re.compile(_NAME_PAT + "@" + _TIME_PAT)
+
+    # a save is just a name and a minute of the cycle, the other values are derived
+    __slots__ = ('name', '_time')
+    # every save at the same time shares the same int object
+    _TIMES = tuple(range(timeline.CYCLE_DURATION))
 
     def __init__(self, name: str, day: int, hour: int, minute: int):
         self.name: str = name
-        self.day: int = day
-        self.hour: int = hour
-        self.minute: int = minute
+        time = timeline.to_minute(day, hour, minute)
+        self._time: int = self._TIMES[time] if 0 <= time < timeline.CYCLE_DURATION else time
+
+    @property
+    def day(self) -> int:
+        return self._time // timeline.DAY_DURATION + 1
+
+    @property
+    def hour(self) -> int:
+        return (timeline.START_HOUR + self._time // timeline.HOUR_DURATION) % 24
+
+    @property
+    def minute(self) -> int:
+        return self._time % timeline.HOUR_DURATION
 
     def __str__(self):
         return f'"{self.name}", day {self.day} at {self.hour:02}:{self.minute:02}'
@@ -121,12 +321,18 @@ class SaveState:
         """
         return f'Day {self.day}, hour {self.hour}, min {self.minute}'
 
+    def get_cycle_minute(self) -> int:
+        """
+        :return: the time of the save as minute of the cycle (see src.timeline)
+        """
+        return self._time
+
     @classmethod
     def is_name_valid(cls, name: str) -> bool:
         """
         :return True if the given name is valid, False otherwise
         """
-        return re.match("^" + cls._NAME_PAT + "$", name) is not None
+        return cls._NAME_RE.fullmatch(name) is not None
 
     @staticmethod
     def is_time_valid(day: int, hour: int, minute: int) -> bool:
@@ -142,8 +348,25 @@ class SaveState:
         :param string: string to convert
         :return: SaveState with the given name and time
         """
-        if re.match(cls._PATTERN, string) is None:
+        match = cls.match(string)
+        if match is None:
             raise ValueError("Invalid value: " + string)
-        name, time = string.split('@')
-        day, hour, minute = time.split('.')
-        return SaveState(name, int(day), int(hour), int(minute))
+        return cls.from_match(match)
+
+    @classmethod
+    def match(cls, string: str) -> Optional[re.Match]:
+        """
+        :param string: a repr(SaveState)
+        :return: the match of the string with the precompiled pattern, None if it is not a valid repr(SaveState)
+        """
+        return cls._SAVE_RE.fullmatch(string)
+
+    @staticmethod
+    def from_match(match: re.Match) -> SaveState:
+        """
+        :param match: successful result of SaveState.match()
+        :return: SaveState with the matched name and time
+        """
+        # the time has a fixed width: @d.hh.mm
+        string = match.string
+        return SaveState(string[:-8], int(string[-7]), int(string[-5:-3]), int(string[-2:]))
@@ -0,0 +1,142 @@
+"""
+Durable storage of the savestates
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import Dict, Iterable, List, Set, Tuple
+
+from src.saves import SaveState
+
+LOG = logging.getLogger(__name__)
+
+
+class SaveJournal:
+    """
+    Append-only journal of the changes to the saves, one line each: '+' followed by repr(SaveState) when a save is
+    created, '-' followed by the name when it is deleted, '*' when they are all cleared.
+    Every line is flushed (and, if durable, synced) before returning, so a crash loses at most the line being written,
+    which is ignored on load. When the stale lines outnumber the live saves, the journal is compacted: the live saves
+    are written to a temporary file that atomically replaces the journal.
+    """
+    _CREATE = '+'
+    _DELETE = '-'
+    _CLEAR = '*'
+    _MIN_COMPACT = 1000
+
+    def __init__(self, path: str, durable: bool = True):
+        """
+        :param path: path to the journal file, created if missing
+        :param durable: if True, every change is synced to disk before returning
+        """
+        self.path: str = path
+        self.durable: bool = durable
+        self._lines: int = 0
+        # names of the live saves: a save recorded again replaces the old one, it doesn't add to them
+        self._live: Set[str] = set()
+        self._file = None
+
+    def load(self) -> Tuple[Dict[str, SaveState], List[str]]:
+        """
+        Replays the journal, compacting it if needed, and opens it for the next changes.
+        :return: the saves by name, and the list of the lines that could not be restored
+        """
+        loaded: Dict[str, SaveState] = {}
+        errors = []
+        torn = False
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as journal:
+                content = journal.read()
+            torn = bool(content) and not content.endswith('\n')
+            lines = content.splitlines()
+            self._lines = len(lines)
+            for line in lines:
+                op, value = line[:1], line[1:]
+                if op == self._CREATE:
+                    try:
+                        save = SaveState.from_str(value)
+                        loaded[save.name] = save
+                        continue
+                    except ValueError:
+                        pass
+                elif op == self._DELETE:
+                    loaded.pop(value, None)
+                    continue
+                elif op == self._CLEAR and not value:
+                    loaded.clear()
+                    continue
+                LOG.error('Invalid journal line "%s"', line)
+                errors.append(line)
+        self._live = set(loaded)
+        LOG.info('Loaded %d saves from %d journal lines', len(self._live), self._lines)
+        if torn or self.needs_compaction():
+            self.compact(loaded.values())
+        else:
+            self._open()
+        return loaded, errors
+
+    def created(self, save: SaveState) -> None:
+        """ Records the creation of the save. """
+        self._live.add(save.name)
+        self._append(self._CREATE + repr(save))
+
+    def created_all(self, save_list: Iterable[SaveState]) -> None:
+        """ Records the creation of the saves, synced to disk once for all of them. """
+        save_list = list(save_list)
+        if save_list:
+            self._live.update(save.name for save in save_list)
+            self._append(*(self._CREATE + repr(save) for save in save_list))
+
+    def deleted(self, name: str) -> None:
+        """ Records the deletion of the save with the given name. """
+        self._live.discard(name)
+        self._append(self._DELETE + name)
+
+    def cleared(self) -> None:
+        """ Records the deletion of all the saves. """
+        self._live.clear()
+        self._append(self._CLEAR)
+
+    def compact(self, live: Iterable[SaveState]) -> None:
+        """
+        Atomically replaces the journal with one holding only the given saves.
+        :param live: the current saves
+        """
+        self.close()
+        temp_path = self.path + '.tmp'
+        live = list(live)
+        lines = [self._CREATE + repr(save) + '\n' for save in live]
+        with open(temp_path, 'w', encoding='utf-8') as temp:
+            temp.writelines(lines)
+            temp.flush()
+            if self.durable:
+                os.fsync(temp.fileno())
+        os.replace(temp_path, self.path)
+        self._lines = len(lines)
+        self._live = {save.name for save in live}
+        LOG.info('Compacted the journal to %d saves', len(self._live))
+        self._open()
+
+    def close(self) -> None:
+        """ Closes the journal file, it is opened again by the next change. """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def needs_compaction(self) -> bool:
+        """ :return: True if the stale lines outnumber the live saves """
+        return self._lines > max(2 * len(self._live), self._MIN_COMPACT)
+
+    def _open(self) -> None:
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')  # pylint: disable=consider-using-with
+
+    def _append(self, *lines: str) -> None:
+        self._open()
+        self._file.writelines(line + '\n' for line in lines)
+        self._file.flush()
+        if self.durable:
+            os.fsync(self._file.fileno())
+        self._lines += len(lines)
@@ -0,0 +1,317 @@
+"""
+Real-time scheduling of the clock's minutes
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from typing import Callable, Dict, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.timer import Clock
+
+# shortest wait between two polls, in milliseconds: about a display frame at 60 Hz, so that a clock faster than that
+# moves once per frame, by all the minutes owed, whatever its speed
+FRAME_MS = 16
+
+
+class TickScheduler:
+    """
+    Keeps the clock anchored to time.monotonic() deadlines.
+    Instead of waiting a full interval after each tick, it works out how many game minutes are owed since the last
+    deadline, so that neither the callback cost nor a stalled mainloop make the clock drift.
+    """
+
+    def __init__(self, clock: Clock, now: Callable[[], float] = time.monotonic):
+        """
+        :param clock: clock to schedule, only its 'running' state and its interval are used
+        :param now: monotonic time source, in seconds
+        """
+        self.clock: Clock = clock
+        self._now: Callable[[], float] = now
+        self._deadline: float = 0.0
+        self.start()
+
+    def start(self) -> None:
+        """ Anchors the next deadline one interval from now. """
+        self._deadline = self._now() + self._interval()
+
+    @property
+    def deadline(self) -> float:
+        """ Time of the next deadline, in the time source's unit. """
+        return self._deadline
+
+    def poll(self) -> int:
+        """
+        Moves the deadline past the current time.
+        While the clock is paused the deadlines keep moving, but no minute is owed.
+
+        :return: number of game minutes owed since the last poll
+        """
+        now = self._now()
+        if now < self._deadline:
+            return 0
+        interval = self._interval()
+        owed = int((now - self._deadline) // interval) + 1
+        self._deadline += owed * interval
+        return owed if self.clock.running else 0
+
+    def delay(self) -> int:
+        """
+        :return: milliseconds until the next deadline, to be used with Tk's after()
+        """
+        return max(0, math.ceil(round((self._deadline - self._now()) * 1000, 3)))
+
+    def _interval(self) -> float:
+        """ Current length of a game minute, in seconds. """
+        return self.clock.get_interval() / 1000
+
+
+class HeapScheduler:
+    """
+    Drives several clocks with a single timer: a heap keeps each clock's scheduler ordered by its next deadline, so that
+    only the clocks that are due are polled.
+    """
+
+    def __init__(self, now: Callable[[], float] = time.monotonic):
+        """
+        :param now: monotonic time source, in seconds
+        """
+        self._now: Callable[[], float] = now
+        self._schedulers: List[TickScheduler] = []
+        self._heap: List[Tuple[float, int]] = []
+
+    def add(self, clock: Clock) -> int:
+        """
+        :param clock: clock to schedule
+        :return: index of the clock, in order of addition
+        """
+        index = len(self._schedulers)
+        scheduler = TickScheduler(clock, self._now)
+        self._schedulers.append(scheduler)
+        heapq.heappush(self._heap, (scheduler.deadline, index))
+        return index
+
+    def start(self) -> None:
+        """ Anchors every clock's next deadline one interval from now. """
+        for scheduler in self._schedulers:
+            scheduler.start()
+        self._heap = [(scheduler.deadline, index) for index, scheduler in enumerate(self._schedulers)]
+        heapq.heapify(self._heap)
+
+    def restart(self, index: int) -> None:
+        """
+        Anchors the next deadline of a clock one interval from now, to be used when its interval changes.
+
+        :param index: index of the clock
+        """
+        self._schedulers[index].start()
+        self._heap = [(scheduler.deadline, i) for i, scheduler in enumerate(self._schedulers)]
+        heapq.heapify(self._heap)
+
+    def poll(self) -> List[Tuple[int, int]]:
+        """
+        Polls the clocks whose deadline has passed.
+        :return: list of (index, owed minutes) of the clocks owed at least a minute
+        """
+        now = self._now()
+        owed = []
+        while self._heap and self._heap[0][0] <= now:
+            _, index = self._heap[0]
+            scheduler = self._schedulers[index]
+            minutes = scheduler.poll()
+            heapq.heapreplace(self._heap, (scheduler.deadline, index))
+            if minutes:
+                owed.append((index, minutes))
+        return owed
+
+    def delay(self) -> int:
+        """
+        :return: milliseconds until the earliest deadline, to be used with Tk's after()
+        """
+        if not self._heap:
+            return 0
+        return max(0, math.ceil(round((self._heap[0][0] - self._now()) * 1000, 3)))
+
+
+class WheelStats:
+    """ Counters of a TimingWheel """
+
+    def __init__(self):
+        self.polls: int = 0
+        self.advanced: int = 0
+        self.minutes: int = 0
+        self.lateness_total: float = 0.0
+        self.lateness_max: float = 0.0
+
+    def lateness_mean(self) -> float:
+        """
+        :return: mean time between a deadline and the moment it was polled, in seconds
+        """
+        return self.lateness_total / self.polls if self.polls else 0.0
+
+
+class _WheelEntry:
+    """ A clock's place in the wheel """
+    __slots__ = ('key', 'scheduler', 'level', 'slot')
+
+    def __init__(self, key: int, scheduler: TickScheduler):
+        self.key: int = key
+        self.scheduler: TickScheduler = scheduler
+        self.level: int = 0
+        self.slot: int = 0
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel, to drive very large numbers of clocks.
+    Time is divided in ticks of the given resolution: level 0 has a slot for each of the next ticks, every higher level
+    has a slot for each span covered by the whole level below. A clock sits in the slot of its next deadline and moves
+    down a level (cascades) only when its span begins, so that adding, removing, pausing and resuming a clock are O(1)
+    and each tick only touches the clocks that are due.
+    """
+
+    def __init__(self, resolution: float = 0.01, slots: int = 64, levels: int = 4,
+                 now: Callable[[], float] = time.monotonic):
+        """
+        :param resolution: length of a tick, in seconds
+        :param slots: number of slots of each level
+        :param levels: number of levels, deadlines beyond slots ** levels ticks wait in the last slot of the top level
+        :param now: monotonic time source, in seconds
+        """
+        self.resolution: float = resolution
+        self.slots: int = slots
+        self.levels: int = levels
+        self.stats: WheelStats = WheelStats()
+        self._now: Callable[[], float] = now
+        self._tick: int = int(now() / resolution)
+        self._wheel: List[List[Dict[int, _WheelEntry]]] = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._entries: Dict[int, _WheelEntry] = {}
+        self._paused: Dict[int, _WheelEntry] = {}
+        self._next_key: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._paused)
+
+    def add(self, clock: Clock) -> int:
+        """
+        :param clock: clock to schedule
+        :return: key identifying the clock in the wheel
+        """
+        key = self._next_key
+        self._next_key += 1
+        entry = _WheelEntry(key, TickScheduler(clock, self._now))
+        self._entries[key] = entry
+        self._insert(entry)
+        return key
+
+    def remove(self, key: int) -> None:
+        """
+        :param key: key of the clock to remove
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            del self._wheel[entry.level][entry.slot][key]
+        self._paused.pop(key, None)
+
+    def pause(self, key: int) -> None:
+        """
+        Stops the clock and takes it off the wheel.
+        :param key: key of the clock to pause
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            del self._wheel[entry.level][entry.slot][key]
+            self._paused[key] = entry
+            entry.scheduler.clock.un_pause('stop')
+
+    def resume(self, key: int) -> None:
+        """
+        Runs the clock and puts it back on the wheel, with its next deadline one interval from now.
+        :param key: key of the clock to resume
+        """
+        entry = self._paused.pop(key, None)
+        if entry is not None:
+            entry.scheduler.clock.un_pause('run')
+            entry.scheduler.start()
+            self._entries[key] = entry
+            self._insert(entry)
+
+    def run_due(self) -> int:
+        """
+        Processes every tick up to now, moving forward all the clocks that are due.
+        :return: number of clocks moved forward
+        """
+        now = self._now()
+        target = int(now / self.resolution)
+        advanced = 0
+        while self._tick < target:
+            for entry in self._step():
+                advanced += self._advance(entry, now)
+        return advanced
+
+    def delay(self) -> float:
+        """
+        :return: seconds until the next tick
+        """
+        return max(0.0, (self._tick + 1) * self.resolution - self._now())
+
+    def _step(self) -> List[_WheelEntry]:
+        """
+        Moves to the next tick, cascading the higher levels whose span begins.
+        :return: the entries of the tick's slot, removed from the wheel
+        """
+        self._tick += 1
+        span = 1
+        for level in range(1, self.levels):
+            span *= self.slots
+            if self._tick % span:
+                break
+            cascading = self._wheel[level][(self._tick // span) % self.slots]
+            self._wheel[level][(self._tick // span) % self.slots] = {}
+            for entry in cascading.values():
+                self._insert(entry)
+        slot = self._tick % self.slots
+        due = self._wheel[0][slot]
+        self._wheel[0][slot] = {}
+        return list(due.values())
+
+    def _advance(self, entry: _WheelEntry, now: float) -> int:
+        """
+        Polls the entry's scheduler, moving its clock forward if it owes minutes, and puts the entry back.
+        :return: 1 if the clock moved, 0 otherwise
+        """
+        scheduler = entry.scheduler
+        if scheduler.deadline > now:
+            # the tick rounding can make an entry due a moment early
+            self._insert(entry)
+            return 0
+        lateness = now - scheduler.deadline
+        self.stats.polls += 1
+        self.stats.lateness_total += lateness
+        self.stats.lateness_max = max(self.stats.lateness_max, lateness)
+        owed = scheduler.poll()
+        self._insert(entry)
+        if not owed:
+            return 0
+        clock = scheduler.clock
+        clock.advance(owed, clock.catch_up())
+        self.stats.advanced += 1
+        self.stats.minutes += owed
+        return 1
+
+    def _insert(self, entry: _WheelEntry) -> None:
+        """ Puts the entry in the slot of its next deadline. """
+        tick = max(math.ceil(entry.scheduler.deadline / self.resolution), self._tick + 1)
+        delta = tick - self._tick
+        level, span = 0, 1
+        while level < self.levels - 1 and delta >= span * self.slots:
+            level += 1
+            span *= self.slots
+        if delta >= span * self.slots:
+            tick = self._tick + span * self.slots - 1
+        entry.level = level
+        entry.slot = (tick // span) % self.slots
+        self._wheel[level][entry.slot][entry.key] = entry
@@ -0,0 +1,264 @@
+"""
+State of the clocks in a block of shared memory, for display processes on the same machine.
+The owner of the clocks writes, the displays read the block directly, without any serialization or message.
+
+Layout, little-endian:
+ - header: magic b'TTFS', version (u16), number of clocks (u16);
+ - for each clock, a slot: sequence number (u64), minute of the cycle (u32), flags (u8, see src.snapshot), speed
+   multiplier (u16), padding to 16 bytes.
+
+Each slot is a seqlock: the writer makes the sequence number odd, writes the fields, and makes it even again. A reader
+keeps the fields only if it saw the same even sequence number before and after reading them, otherwise it tries again,
+for a while: a writer that died halfway leaves the sequence number odd for good.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import List, NamedTuple, Optional, Sequence, Set
+
+from src import bus, timeline
+from src.bus import BusEvent, EventBus
+from src.snapshot import END, RUNNING, SLOW
+
+LOG = logging.getLogger(__name__)
+
+MAGIC = b'TTFS'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sHH')
+_SEQ = struct.Struct('<Q')
+_FIELDS = struct.Struct('<IBH')
+_SLOT_SIZE = 16
+
+KINDS = (bus.MINUTE, bus.JUMP, bus.PAUSE, bus.SPEED)
+
+# names of the blocks created by this process (or the one it was forked from), which must stay registered
+_OWNED: Set[str] = set()
+
+
+class ClockState(NamedTuple):
+    """ State of a clock, as read from the block """
+    seq: int
+    minute: int
+    running: bool
+    slow: int
+    end: bool
+    speed: int
+
+
+class SharedClockState:
+    """ Owner's side: creates the block and writes the clocks' state into it """
+
+    def __init__(self, name: str, clocks: Sequence):
+        """
+        :param name: name of the block, to be given to the readers
+        :param clocks: clocks to share, each one identified by its index
+        :raise FileExistsError: if a block with the same name already exists
+        """
+        self.clocks: List = list(clocks)
+        self._ids = {id(clock): index for index, clock in enumerate(self.clocks)}
+        self._memory = shared_memory.SharedMemory(name, create=True,
+                                                  size=_HEADER.size + _SLOT_SIZE * len(self.clocks))
+        _OWNED.add(self._memory.name)
+        self._seqs: List[int] = [0] * len(self.clocks)
+        _HEADER.pack_into(self._memory.buf, 0, MAGIC, VERSION, len(self.clocks))
+        self._subscription: Optional[bus.Subscription] = None
+        self._event_bus: Optional[EventBus] = None
+        for index, clock in enumerate(self.clocks):
+            self.write(index, clock)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def attach(self, event_bus: EventBus = bus.BUS) -> None:
+        """ Writes a clock's state whenever it changes. """
+        self._event_bus = event_bus
+        self._subscription = event_bus.subscribe(self._on_events, KINDS)
+
+    def write(self, index: int, clock) -> None:
+        """
+        :param index: index of the clock
+        :param clock: clock whose state is written (any object with the same attributes as a Clock)
+        """
+        offset = _HEADER.size + index * _SLOT_SIZE
+        flags = (RUNNING if clock.running else 0) | (SLOW if clock.slow else 0) | (END if clock.end else 0)
+        buf = self._memory.buf
+        seq = self._seqs[index]
+        _SEQ.pack_into(buf, offset, seq + 1)
+        _FIELDS.pack_into(buf, offset + _SEQ.size, clock.get_cycle_minute(), flags, clock.speed)
+        _SEQ.pack_into(buf, offset, seq + 2)
+        self._seqs[index] = seq + 2
+
+    def close(self) -> None:
+        """ Stops writing and removes the block: the readers keep what they mapped, but see no more changes. """
+        if self._subscription is not None:
+            self._event_bus.unsubscribe(self._subscription)
+            self._subscription = None
+        self._memory.close()
+        self._memory.unlink()
+        _OWNED.discard(self._memory.name)
+
+    def _on_events(self, events: List[BusEvent]) -> None:
+        index = self._ids.get(id(events[0].clock))
+        if index is not None:
+            self.write(index, self.clocks[index])
+
+
+class SharedClockReader:
+    """ Display's side: reads the clocks' state from the block """
+    READ_TIMEOUT = 0.1
+
+    def __init__(self, name: str):
+        """
+        :param name: name of the block
+        :raise FileNotFoundError: if there is no block with that name
+        :raise ValueError: if the block is not a clock state block of this version
+        """
+        self._memory = _attach(name)
+        magic, version, self.count = _HEADER.unpack_from(self._memory.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self._memory.close()
+            raise ValueError(f'{name} is not a clock state block of version {VERSION}')
+        self._last: List[Optional[ClockState]] = [None] * self.count
+
+    def read(self, index: int) -> ClockState:
+        """
+        :param index: index of the clock
+        :return: a consistent state of the clock, never one being written: the last one read if a write doesn't
+         complete within READ_TIMEOUT seconds
+        :raise TimeoutError: if a write doesn't complete within READ_TIMEOUT seconds and the clock was never read
+        """
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        offset = _HEADER.size + index * _SLOT_SIZE
+        buf = self._memory.buf
+        deadline = None
+        while True:
+            (before,) = _SEQ.unpack_from(buf, offset)
+            if not before & 1:
+                minute, flags, speed = _FIELDS.unpack_from(buf, offset + _SEQ.size)
+                (after,) = _SEQ.unpack_from(buf, offset)
+                if before == after:
+                    state = ClockState(before, minute, bool(flags & RUNNING), 1 if flags & SLOW else 0,
+                                       bool(flags & END), speed)
+                    self._last[index] = state
+                    return state
+            # a write is in progress, or the writer died halfway
+            if deadline is None:
+                deadline = time.monotonic() + self.READ_TIMEOUT
+            elif time.monotonic() >= deadline:
+                if self._last[index] is None:
+                    raise TimeoutError(f'clock {index} has been halfway through a write for {self.READ_TIMEOUT}s')
+                return self._last[index]
+            time.sleep(0)
+
+    def wait(self, index: int, seq: int, timeout: float, poll: float = 0.005) -> Optional[ClockState]:
+        """
+        :param index: index of the clock
+        :param seq: sequence number of the last state seen
+        :param timeout: longest wait, in seconds
+        :param poll: seconds between two reads
+        :return: the clock's state as soon as it differs from the last seen one, or None on timeout
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            state = self.read(index)
+            if state.seq != seq:
+                return state
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(poll)
+
+    def close(self) -> None:
+        self._memory.close()
+
+
+class SharedClock:
+    """
+    Read-only clock backed by the shared block, with the attributes the panels use, so that a display process can draw
+    them as for a local Clock.
+    """
+
+    def __init__(self, reader: SharedClockReader, index: int = 0):
+        self.reader: SharedClockReader = reader
+        self.index: int = index
+        self.state: ClockState = reader.read(index)
+
+    def refresh(self) -> bool:
+        """
+        :return: True if the state changed since the last refresh
+        """
+        state = self.reader.read(self.index)
+        changed = state.seq != self.state.seq
+        self.state = state
+        return changed
+
+    def get_cycle_minute(self) -> int:
+        return self.state.minute
+
+    @property
+    def day(self) -> int:
+        return timeline.from_minute(self.state.minute)[0]
+
+    @property
+    def hour(self) -> int:
+        return timeline.from_minute(self.state.minute)[1]
+
+    @property
+    def minute(self) -> int:
+        return timeline.from_minute(self.state.minute)[2]
+
+    @property
+    def running(self) -> bool:
+        return self.state.running
+
+    @property
+    def slow(self) -> int:
+        return self.state.slow
+
+    @property
+    def speed(self) -> int:
+        return self.state.speed
+
+    @property
+    def end(self) -> bool:
+        return self.state.end
+
+
+def share(clocks: Sequence, name: str) -> Optional[SharedClockState]:
+    """
+    Starts sharing the clocks' state, if a name is given.
+
+    :param clocks: clocks to share
+    :param name: name of the block, empty not to share
+    :return: the shared state, to be closed on exit, or None
+    """
+    if not name:
+        return None
+    try:
+        state = SharedClockState(name, clocks)
+    except (FileExistsError, OSError) as e:
+        LOG.error('Unable to share the clocks as %s: %s', name, e)
+        return None
+    state.attach()
+    LOG.info('Sharing the clocks as %s', name)
+    return state
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """ Opens an existing block without taking its ownership: the block must outlive the reader process. """
+    try:
+        return shared_memory.SharedMemory(name, track=False)  # pylint: disable=unexpected-keyword-arg
+    except TypeError:
+        # before Python 3.13 every POSIX process opening a block registers it, and removes it on exit
+        memory = shared_memory.SharedMemory(name)
+        if os.name == 'posix' and memory.name not in _OWNED:
+            from multiprocessing import resource_tracker  # pylint: disable=import-outside-toplevel
+            resource_tracker.unregister(memory._name, 'shared_memory')  # pylint: disable=protected-access
+        return memory
@@ -0,0 +1,177 @@
+"""
+Versioned binary snapshot of a clock and of the saves, readable through mmap without parsing it all.
+
+Layout, little-endian:
+ - header: magic b'TTFH', version (u16), day, hour, minute, flags (u8 each), number of saves (u32);
+ - save table: for each save, sorted by name, the name's offset in the blob (u32), the name's length (u8) and the
+   save's minute of the cycle (u16);
+ - name blob: the saves' names, ASCII encoded.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator, Optional
+
+from src import timeline
+from src.saves import SaveState, parse
+
+MAGIC = b'TTFH'
+VERSION = 1
+
+RUNNING = 1
+SLOW = 2
+END = 4
+
+_HEADER = struct.Struct('<4sHBBBBI')
+_ENTRY = struct.Struct('<IBH')
+
+
+def to_bytes(clock, save_list: Iterable[SaveState]) -> bytes:
+    """
+    :param clock: clock whose time and state are saved (any object with the same attributes as a Clock)
+    :param save_list: saves to store
+    :return: the snapshot
+    """
+    ordered = sorted(save_list, key=lambda save: save.name)
+    flags = (RUNNING if clock.running else 0) | (SLOW if clock.slow else 0) | (END if clock.end else 0)
+    parts = [_HEADER.pack(MAGIC, VERSION, clock.day, clock.hour, clock.minute, flags, len(ordered))]
+    names = []
+    offset = 0
+    for save in ordered:
+        name = save.name.encode('ascii')
+        parts.append(_ENTRY.pack(offset, len(name), save.get_cycle_minute()))
+        names.append(name)
+        offset += len(name)
+    return b''.join(parts + names)
+
+
+def write(path: str, clock, save_list: Iterable[SaveState]) -> None:
+    """
+    Atomically writes the snapshot to the given file.
+
+    :param path: path to the file
+    :param clock: clock whose time and state are saved
+    :param save_list: saves to store
+    """
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as temp:
+        temp.write(to_bytes(clock, save_list))
+        temp.flush()
+        os.fsync(temp.fileno())
+    os.replace(temp_path, path)
+
+
+def from_serialized(string: str, clock) -> bytes:
+    """
+    Converts a string of saves, as returned by saves.serialize(), into a snapshot.
+    Invalid entries are ignored.
+
+    :param string: comma-separated repr(SaveState)
+    :param clock: clock whose time and state are saved
+    :return: the snapshot
+    """
+    return to_bytes(clock, (entry.save for entry in parse(string) if entry.save is not None))
+
+
+class Snapshot:
+    """
+    Snapshot mapped in memory: the header is read on opening, the saves only when requested.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: path to the snapshot file
+        :raise ValueError: if the file is not a snapshot, a snapshot of an unsupported version, or a truncated one
+        """
+        with open(path, 'rb') as file:
+            # an empty file can't be mapped: ValueError as well
+            self._map: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError(f'{path} is not a snapshot')
+        magic, version, self.day, self.hour, self.minute, flags, self.count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f'{path} is not a snapshot of version {VERSION}')
+        self.running: bool = bool(flags & RUNNING)
+        self.slow: int = 1 if flags & SLOW else 0
+        self.end: bool = bool(flags & END)
+        self._blob: int = _HEADER.size + self.count * _ENTRY.size
+        if len(self._map) < self._blob or len(self._map) < self._blob + self._blob_size():
+            self.close()
+            raise ValueError(f'{path} is a truncated snapshot')
+
+    def __enter__(self) -> Snapshot:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[SaveState]:
+        """ Iterates over the saves, ordered by name. """
+        return (self._save(index) for index in range(self.count))
+
+    def get(self, name: str) -> Optional[SaveState]:
+        """
+        Binary search of the save, reading only the entries and the names it compares.
+        :param name: name of the save
+        :return: the save with the given name, or None
+        """
+        key = name.encode('ascii', errors='replace')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            current = self._name(middle)
+            if current < key:
+                low = middle + 1
+            elif current > key:
+                high = middle
+            else:
+                return self._save(middle)
+        return None
+
+    def restore(self, clock) -> None:
+        """
+        Sets the clock's time and state to the snapshot's, through the clock's methods so that its events are published.
+        The caller restarts the clock's scheduler, as for any change of speed.
+        :param clock: clock to restore
+        """
+        clock.end = self.end
+        clock.set_time(self.day, self.hour, self.minute)
+        if clock.slow != self.slow:
+            clock.cycle_millis()
+        if self.running:
+            clock.un_pause('run')
+
+    def to_serialized(self) -> str:
+        """
+        :return: the saves as a comma-separated string, like saves.serialize()
+        """
+        return ','.join(repr(save) for save in self)
+
+    def close(self) -> None:
+        """ Unmaps the file. """
+        self._map.close()
+
+    def _blob_size(self) -> int:
+        """ The names are stored in the order of the table: the last one ends the blob. """
+        if self.count == 0:
+            return 0
+        offset, length, _ = _ENTRY.unpack_from(self._map, self._blob - _ENTRY.size)
+        return offset + length
+
+    def _name(self, index: int) -> bytes:
+        offset, length, _ = _ENTRY.unpack_from(self._map, _HEADER.size + index * _ENTRY.size)
+        return self._map[self._blob + offset:self._blob + offset + length]
+
+    def _save(self, index: int) -> SaveState:
+        offset, length, minute = _ENTRY.unpack_from(self._map, _HEADER.size + index * _ENTRY.size)
+        name = self._map[self._blob + offset:self._blob + offset + length].decode('ascii')
+        return SaveState(name, *timeline.from_minute(minute))
+
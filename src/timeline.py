@@ -0,0 +1,142 @@
+"""
+Arithmetic on the minutes of the three-day cycle and on the events met along the way.
+A minute of the cycle counts the minutes since the start of the first day (day 1 at 05:00 is minute 0), so that every
+time of the cycle is a single integer between 0 and CYCLE_DURATION.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Collection, Dict, List, NamedTuple, Optional, Tuple
+
+START_HOUR = 5
+HOUR_DURATION = 60
+DAY_DURATION = 24 * HOUR_DURATION
+DAY_MAX = 3
+CYCLE_DURATION = DAY_MAX * DAY_DURATION
+
+# event kinds, in the order they happen within the same minute
+HOUR = 'hour'
+BELL = 'bell'
+TICK = 'tick'
+RUMBLE = 'rumble'
+DAY = 'day'
+END = 'end'
+
+
+class Event(NamedTuple):
+    """ Something happening at the given minute of the cycle """
+    minute: int
+    kind: str
+
+
+def to_minute(day: int, hour: int, minute: int) -> int:
+    """
+    :return: minute of the cycle of the given time
+    """
+    return (day - 1) * DAY_DURATION + (hour - START_HOUR) % 24 * HOUR_DURATION + minute
+
+
+def from_minute(minute: int) -> Tuple[int, int, int]:
+    """
+    :param minute: minute of the cycle
+    :return: day, hour and minute of the given minute of the cycle
+    """
+    hours, minutes = divmod(minute, HOUR_DURATION)
+    return hours // 24 + 1, (START_HOUR + hours) % 24, minutes
+
+
+def hour_events(minute: int, bell_hours: Collection[int], rumble_hours: Collection[int]) -> List[Event]:
+    """
+    Lists the events happening when the clock reaches the given minute, which must start an hour.
+    The hour starts with either the bells or the tick, the rumble is heard only during the last day, and the hour
+    starting a new day either makes the day change or, after the last day, ends the cycle.
+
+    :param minute: minute of the cycle, a positive multiple of HOUR_DURATION
+    :param bell_hours: hours when the bells play
+    :param rumble_hours: hours when, during the last day, the rumble plays
+    :return: ordered list of events
+    """
+    hour = (START_HOUR + minute // HOUR_DURATION) % 24
+    events = [Event(minute, HOUR), Event(minute, BELL if hour in bell_hours else TICK)]
+    # the day is the one of the minute before, as the new day begins after the sounds
+    if hour in rumble_hours and (minute - 1) // DAY_DURATION + 1 == DAY_MAX:
+        events.append(Event(minute, RUMBLE))
+    if minute % DAY_DURATION == 0:
+        events.append(Event(minute, END if minute >= CYCLE_DURATION else DAY))
+    return events
+
+
+def events_between(start: int, end: int, bell_hours: Collection[int], rumble_hours: Collection[int]) -> List[Event]:
+    """
+    Lists the events met moving from one minute of the cycle to another, visiting only the hours in between.
+
+    :param start: starting minute of the cycle, excluded
+    :param end: final minute of the cycle, included, capped to the end of the cycle
+    :param bell_hours: hours when the bells play
+    :param rumble_hours: hours when, during the last day, the rumble plays
+    :return: ordered list of events
+    """
+    first = start // HOUR_DURATION + 1
+    last = min(end, CYCLE_DURATION) // HOUR_DURATION
+    events = []
+    for hour in range(first, last + 1):
+        events.extend(hour_events(hour * HOUR_DURATION, bell_hours, rumble_hours))
+    return events
+
+
+class Timeline:
+    """
+    Index of every event of the cycle, computed once from the bell and rumble hours.
+    Queries are binary searches on the sorted minutes of the events, overall or by kind.
+    """
+
+    def __init__(self, bell_hours: Collection[int], rumble_hours: Collection[int]):
+        """
+        :param bell_hours: hours when the bells play
+        :param rumble_hours: hours when, during the last day, the rumble plays
+        """
+        self.events: Tuple[Event, ...] = tuple(events_between(0, CYCLE_DURATION, bell_hours, rumble_hours))
+        self._minutes: List[int] = [event.minute for event in self.events]
+        self._kinds: Dict[str, List[int]] = {}
+        for event in self.events:
+            self._kinds.setdefault(event.kind, []).append(event.minute)
+
+    def events_between(self, start: int, end: int) -> List[Event]:
+        """
+        :param start: starting minute of the cycle, excluded
+        :param end: final minute of the cycle, included
+        :return: ordered list of the events met moving from start to end
+        """
+        return list(self.events[bisect_right(self._minutes, start):bisect_right(self._minutes, end)])
+
+    def next_event(self, after: int, kind: Optional[str] = None) -> Optional[Event]:
+        """
+        :param after: minute of the cycle, excluded
+        :param kind: if given, only the events of this kind are considered
+        :return: the first event (of the given kind) after the given minute, or None if there is none left
+        """
+        minutes = self._minutes if kind is None else self._kinds.get(kind, [])
+        index = bisect_right(minutes, after)
+        if index == len(minutes):
+            return None
+        if kind is None:
+            return self.events[index]
+        return Event(minutes[index], kind)
+
+    def minutes_until(self, after: int, kind: str) -> Optional[int]:
+        """
+        :param after: minute of the cycle, excluded
+        :param kind: kind of the event
+        :return: minutes left before the next event of the given kind, or None if there is none left
+        """
+        event = self.next_event(after, kind)
+        return None if event is None else event.minute - after
+
+    @staticmethod
+    def minutes_until_end(minute: int) -> int:
+        """
+        :param minute: minute of the cycle
+        :return: minutes left before the end of the cycle, when the moon falls
+        """
+        return max(CYCLE_DURATION - minute, 0)
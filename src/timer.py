@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import Dict, List, Literal
+from typing import Dict, FrozenSet, List, Literal, Optional, Tuple
 
+from src import bus
 from src import ini
-from src import music
+from src import timeline
+from src.config import LABELS, Config, Key
 
 
 def __get_label(label: str) -> str:
@@ -12,14 +14,25 @@ def __get_label(label: str) -> str:
     return name + ':' + colour
 
 
-DAYS: List[str] = [__get_label('day-0'), __get_label('day-1'), __get_label('day-2'), __get_label('day-3')]
+def __get_labels() -> Tuple[List[str], Dict[int, str]]:
+    days = [__get_label('day-0'), __get_label('day-1'), __get_label('day-2'), __get_label('day-3')]
 
-PERIODS: Dict[int, str] = {}
-PERIODS.update(dict.fromkeys([4, 5, 6], __get_label('dawn')))
-PERIODS.update(dict.fromkeys([7, 8, 9, 10, 11, 12], __get_label('morning')))
-PERIODS.update(dict.fromkeys([13, 14, 15, 16, 17], __get_label('afternoon')))
-PERIODS.update(dict.fromkeys([18, 19, 20], __get_label('twilight')))
-PERIODS.update(dict.fromkeys([21, 22, 23, 0, 1, 2, 3], __get_label('night')))
+    periods: Dict[int, str] = {}
+    periods.update(dict.fromkeys([4, 5, 6], __get_label('dawn')))
+    periods.update(dict.fromkeys([7, 8, 9, 10, 11, 12], __get_label('morning')))
+    periods.update(dict.fromkeys([13, 14, 15, 16, 17], __get_label('afternoon')))
+    periods.update(dict.fromkeys([18, 19, 20], __get_label('twilight')))
+    periods.update(dict.fromkeys([21, 22, 23, 0, 1, 2, 3], __get_label('night')))
+    return days, periods
+
+
+DAYS, PERIODS = __get_labels()
+
+
+CatchUp = Literal['replay', 'coalesce', 'drop']
+
+# day, hour and minute of every minute of the cycle, shared by all the clocks
+_TIMES = tuple(timeline.from_minute(m) for m in range(timeline.CYCLE_DURATION))
 
 
 def get_day(timer: Clock) -> str:
@@ -38,80 +51,176 @@ def get_time(timer: Clock) -> str:
 
 class Clock:
     START_DAY = 1
-    START_HOUR = 5
+    START_HOUR = timeline.START_HOUR
     START_MINUTE = 0
-    __INTERVALS = [int(ini.timer('interval-short')), int(ini.timer('interval-long'))]
-    __BELL_HOURS = tuple(int(h) for h in ini.timer('bell-hours').split(','))
-    __RUMBLE_HOURS = tuple(int(h) for h in ini.timer('rumble-hours').split(','))
+    # replaced by __on_config() when the .ini file changes
+    CATCH_UP: CatchUp = ini.current().catch_up
+    FAST_CATCH_UP: CatchUp = ini.current().fast_catch_up
+    SPEEDS = (1, 10, 100, 1000)
+    TIMELINE = timeline.Timeline(ini.current().bell_hours, ini.current().rumble_hours)
+
+    __DAY_MAX = timeline.DAY_MAX
 
-    __HOUR_DURATION = 60
-    __DAY_MAX = 3
+    __slots__ = ('_minute', '_time', 'running', 'end', 'slow', 'speed', 'version')
 
     def __init__(self, day: int = START_DAY, hour: int = START_HOUR, minute: int = START_MINUTE):
-        self.day = day
-        self.hour = hour
-        self.minute = minute
+        # the time is kept as minute of the cycle (see src.timeline), with day, hour and minute derived from it
+        self._minute = 0
+        self._time = timeline.from_minute(0)
+        self.__set_minute(timeline.to_minute(day, hour, minute))
         self.running = False
         self.end = False
         self.slow = 0
+        self.speed = 1
+        # incremented at every change of time, to detect them
+        self.version = 0
+
+    @property
+    def day(self) -> int:
+        return self._time[0]
+
+    @day.setter
+    def day(self, value: int) -> None:
+        self.__set_minute(timeline.to_minute(value, self.hour, self.minute))
+
+    @property
+    def hour(self) -> int:
+        return self._time[1]
+
+    @hour.setter
+    def hour(self, value: int) -> None:
+        self.__set_minute(timeline.to_minute(self.day, value, self.minute))
+
+    @property
+    def minute(self) -> int:
+        return self._time[2]
+
+    @minute.setter
+    def minute(self, value: int) -> None:
+        self.__set_minute(timeline.to_minute(self.day, self.hour, value))
+
+    def __set_minute(self, minute: int) -> None:
+        self._minute = minute
+        self._time = _TIMES[minute] if 0 <= minute < timeline.CYCLE_DURATION else timeline.from_minute(minute)
+
+    def __lt__(self, other: Clock) -> bool:
+        return self._minute < other._minute
+
+    def __le__(self, other: Clock) -> bool:
+        return self._minute <= other._minute
+
+    def __gt__(self, other: Clock) -> bool:
+        return self._minute > other._minute
+
+    def __ge__(self, other: Clock) -> bool:
+        return self._minute >= other._minute
+
+    def __sub__(self, other: Clock) -> int:
+        """
+        :return: minutes from the other clock's time to this clock's time
+        """
+        return self._minute - other._minute
 
     def get_time_str(self) -> str:
         """
         :return: returns a string with the current time, formatted as {day}.{hour:02}.{minute:02}.
         """
-        return f'{self.day}.{self.hour:02}.{self.minute:02}'
+        day, hour, minute = self._time
+        return f'{day}.{hour:02}.{minute:02}'
+
+    def get_cycle_minute(self) -> int:
+        """
+        :return: the current time as minute of the cycle (see src.timeline)
+        """
+        return self._minute
+
+    def next_event(self, kind: Optional[str] = None) -> Optional[timeline.Event]:
+        """
+        :param kind: if given, only the events of this kind (see src.timeline) are considered
+        :return: the next event (of the given kind) of the cycle, or None if there is none left
+        """
+        if self.end:
+            return None
+        return self.TIMELINE.next_event(self.get_cycle_minute(), kind)
+
+    def minutes_left(self) -> int:
+        """
+        :return: minutes left before the end of the cycle
+        """
+        return 0 if self.end else self.TIMELINE.minutes_until_end(self.get_cycle_minute())
 
     def update_time(self) -> None:
         """
         The method moves forward the timer, one minute at a time, and executes checks on the times.
         """
-        if self.end:
-            return
-        self.minute += 1
-        if self.minute >= self.__HOUR_DURATION:
-            self.hour = (self.hour + 1) % 24
-            self.minute = 0
-            self.__play_sounds()
-            if self.hour == self.START_HOUR:
-                self.day += 1
-                self.__check_day()
-
-    def __check_day(self) -> None:
-        """
-        Called at every day change.
-        If the day would go over the maximum numbers, it stops the timer, otherwise it plays the transition sound.
-        """
-        if self.day > self.__DAY_MAX:
-            self.set_time(self.__DAY_MAX, (self.START_HOUR - 1) % 24, 0)
+        self.advance(1)
+
+    def advance(self, minutes: int, policy: CatchUp = 'replay') -> List[timeline.Event]:
+        """
+        Moves the timer forward of the given minutes in a single jump, visiting only the hours in between, with the
+        same outcome as many calls to update_time().
+        If the end of the last day is crossed, the clock stops at the end.
+        The sounds of the last minute are always played, the ones of the skipped minutes are handled as specified.
+
+        :param minutes: minutes to move forward
+        :param policy: 'replay' plays every skipped sound in order, 'coalesce' plays each kind of sound once (the
+        latest), 'drop' plays none of them
+        :return: ordered list of the events met
+        """
+        if self.end or minutes <= 0:
+            return []
+        start = self._minute
+        target = min(start + minutes, timeline.CYCLE_DURATION)
+        events = self.TIMELINE.events_between(start, target)
+        running = self.running
+        if target == timeline.CYCLE_DURATION:
+            # not set_time(): its jump would stop the sounds of the end
+            self.__set_minute(timeline.to_minute(self.__DAY_MAX, (self.START_HOUR - 1) % 24, 0))
+            self.running = False
             self.end = True
         else:
-            music.new_day()
-
-    def __play_sounds(self) -> None:
-        self.__play_clock()
-        self.__play_rumble()
+            self.__set_minute(target)
+        self.version += 1
+        self.__publish(events, target, policy)
+        if self.running != running:
+            self.__publish_change(bus.PAUSE)
+        return events
 
-    def __play_clock(self) -> None:
+    def __publish(self, events: List[timeline.Event], last: int, policy: CatchUp) -> None:
         """
-        Plays either the bells or the single clock tick, the former at the hours set in the .ini file, the latter
-        every other hour.
+        Publishes the events of a step on the bus, followed by the minute reached.
+        The sounds of the last minute are always audible, the ones of the previous minutes as specified by the policy.
+
+        :param events: ordered events
+        :param last: minute of the cycle whose sounds are always audible
+        :param policy: what to do with the sounds of the previous minutes, see advance()
         """
-        if self.minute == 0 and self.hour in self.__BELL_HOURS:
-            music.bells()
-        elif self.minute == 0:
-            music.tick()
+        # from the latest, so that coalescing keeps the sound of the last minute, if any, and the latest skipped one
+        # of the other kinds
+        heard = set()
+        batch = []
+        for event in reversed(events):
+            audible = event.minute == last or policy == 'replay' or (policy == 'coalesce' and event.kind not in heard)
+            heard.add(event.kind)
+            batch.append(bus.BusEvent(self, event.kind, event.minute, audible))
+        batch.reverse()
+        batch.append(bus.BusEvent(self, bus.MINUTE, self._minute))
+        bus.BUS.publish(batch)
 
-    def __play_rumble(self) -> None:
-        """ Plays the rumble sound at the hours set in the .ini file. """
-        if self.minute == 0 and self.hour in self.__RUMBLE_HOURS and self.day == self.__DAY_MAX:
-            music.rumble()
+    def __publish_change(self, *kinds: str) -> None:
+        """ Publishes on the bus, in a single batch, changes of the clock other than running, see src.bus. """
+        bus.BUS.publish([bus.BusEvent(self, kind, self._minute) for kind in kinds])
 
     def set_time(self, day: int, hour: int, minute: int) -> None:
-        """ Sets the time, no checks if the values are legal. """
-        self.day = day
-        self.hour = hour
-        self.minute = minute
+        """ Sets the time and stops the clock, no checks if the values are legal. """
+        running = self.running
+        self.__set_minute(timeline.to_minute(day, hour, minute))
         self.running = False
+        self.version += 1
+        if running:
+            self.__publish_change(bus.JUMP, bus.PAUSE)
+        else:
+            self.__publish_change(bus.JUMP)
 
     def un_pause(self, mode: Literal['switch', 'stop', 'run'] = 'switch') -> None:
         """
@@ -121,50 +230,77 @@ class Clock:
         :param mode: one of 'switch', 'stop' and 'run'
         """
         if not self.end:
+            running = self.running
             if mode == "switch":
                 self.running = not self.running
             elif mode == "stop":
                 self.running = False
             else:
                 self.running = True
+            if self.running != running:
+                self.__publish_change(bus.PAUSE)
 
     def cycle_millis(self) -> None:
         """ Cycles between the two states, normal (0) and slow (1). """
         self.slow = 1 - self.slow
+        self.__publish_change(bus.SPEED)
+
+    def cycle_speed(self) -> None:
+        """ Cycles the fast-forward multiplier among SPEEDS. """
+        self.speed = self.SPEEDS[(self.SPEEDS.index(self.speed) + 1) % len(self.SPEEDS)]
+        self.__publish_change(bus.SPEED)
 
-    def get_interval(self) -> int:
-        return self.__INTERVALS[self.slow]
+    def get_interval(self) -> float:
+        """
+        :return: milliseconds of a game minute, at the current speed
+        """
+        return ini.current().intervals[self.slow] / self.speed
+
+    def catch_up(self) -> CatchUp:
+        """
+        :return: policy for the sounds of the minutes skipped in a single advance(), see CATCH_UP and FAST_CATCH_UP
+        """
+        return self.CATCH_UP if self.speed == 1 else self.FAST_CATCH_UP
 
     def reset(self) -> None:
-        """ Resets the timer to its starting value, at non-running state and non-slow speed """
-        self.set_time(self.START_DAY, self.START_HOUR, self.START_MINUTE)
+        """ Resets the timer to its starting value, at non-running state and normal speed """
         self.end = False
         self.slow = 0
-        music.stop()
+        self.speed = 1
+        self.set_time(self.START_DAY, self.START_HOUR, self.START_MINUTE)
 
     def forward(self) -> None:
         """
-        If it's not the end and it's not the last hour, it stops the timer, un-slows it
+        If it's not the end and it's not the last hour, it stops the timer, resets its speed
         and moves the clock one hour forward
         """
-        if not (self.hour == self.START_HOUR - 1 and self.day == self.__DAY_MAX) and not self.end:
-            new_hour = (self.hour + 1) % 24
-            new_day = self.day + 1 if new_hour == self.START_HOUR else self.day
-            self.set_time(new_day, new_hour, self.START_MINUTE)
-            self.slow = 0
-            music.stop()
+        if self._minute < timeline.CYCLE_DURATION - timeline.HOUR_DURATION and not self.end:
+            self.__set_hour_start(self._minute // timeline.HOUR_DURATION + 1)
 
     def backward(self) -> None:
-        """ If it's not the end, it stops the timer, un-slows it and moves the clock one hour backward. """
-        changed = False
-        if self.minute != self.START_MINUTE and not self.end:
-            self.set_time(self.day, self.hour, self.START_MINUTE)
-            changed = True
-        elif not (self.hour == self.START_HOUR and self.day == self.START_DAY) and not self.end:
-            new_hour = (self.hour - 1) % 24
-            new_day = self.day - 1 if new_hour == self.START_HOUR - 1 else self.day
-            self.set_time(new_day, new_hour, self.START_MINUTE)
-            changed = True
-        if changed:
-            self.slow = 0
-            music.stop()
+        """ If it's not the end, it stops the timer, resets its speed and moves the clock one hour backward. """
+        if self._minute > 0 and not self.end:
+            # back to the start of the current hour or, if already there, of the previous one
+            self.__set_hour_start((self._minute - 1) // timeline.HOUR_DURATION)
+
+    def __set_hour_start(self, hours: int) -> None:
+        """ Moves the clock to the start of the given hour of the cycle, stopping it and resetting its speed. """
+        self.slow = 0
+        self.speed = 1
+        self.set_time(*_TIMES[hours * timeline.HOUR_DURATION])
+
+
+def __on_config(keys: FrozenSet[Key], config: Config) -> None:
+    """ Applies the changes of the .ini file: the labels, the bell and rumble hours and the catch-up policies """
+    global DAYS, PERIODS
+    if keys & {('TIMER', 'bell-hours'), ('TIMER', 'rumble-hours')}:
+        Clock.TIMELINE = timeline.Timeline(config.bell_hours, config.rumble_hours)
+    Clock.CATCH_UP = config.catch_up
+    Clock.FAST_CATCH_UP = config.fast_catch_up
+    if any(section == 'GUI' for section, _ in keys):
+        DAYS, PERIODS = __get_labels()
+
+
+ini.subscribe(__on_config,
+              [('GUI', f'{label}-{part}') for label in LABELS for part in ('name', 'colour')]
+              + [('TIMER', key) for key in ('bell-hours', 'rumble-hours', 'catch-up', 'fast-catch-up')])
@@ -0,0 +1,54 @@
+import os
+import tkinter as tk
+import unittest
+
+from src.graphics import utils
+from src.graphics.buttons import Button, Switch
+
+_IMAGES = os.path.join(os.path.dirname(__file__), '..', '..', 'resources', 'images')
+
+
+class ButtonsTest(unittest.TestCase):
+
+    def setUp(self):
+        try:
+            self.root = tk.Tk()
+        except tk.TclError as e:
+            self.skipTest(f'no display: {e}')
+        self.on = False
+
+    def tearDown(self):
+        utils._IMAGES.clear()
+        self.root.destroy()
+
+    def _switch(self) -> Switch:
+        return Switch(self.root, os.path.join(_IMAGES, 'run_off.png'), os.path.join(_IMAGES, 'run_on.png'), 'RUN',
+                      [], lambda: self.on, relief=tk.RAISED)
+
+    def test_place_reuses_widgets(self):
+        button = Button(self.root, os.path.join(_IMAGES, 'save.png'), 'SAVE', [])
+        switch = self._switch()
+        for pos in range(10):
+            button.place(pos, 0)
+            switch.place(pos, 50)
+        self.assertEqual(2, len(self.root.winfo_children()))
+        self.assertEqual(1, len(switch.var.trace_info()))
+        self.assertEqual('9', str(button._btn.place_info()['x']))
+
+    def test_switch_tick(self):
+        switch = self._switch().place(0, 0)
+        self.on = True
+        switch.tick()
+        self.assertEqual(tk.SUNKEN, str(switch._btn['relief']))
+        self.on = False
+        switch.tick()
+        self.assertEqual(tk.RAISED, str(switch._btn['relief']))
+
+    def test_images_shared(self):
+        first, second = self._switch(), self._switch()
+        self.assertIs(first.icon, second.icon)
+        self.assertIs(first.icon_on, second.icon_on)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 
-from src.graphics.utils import calc_arc_extent
+from src import timeline
+from src.graphics.utils import arc_extent, calc_arc_extent
 
 
 class UtilsTest(unittest.TestCase):
@@ -26,6 +27,10 @@ class UtilsTest(unittest.TestCase):
                     if d != 1 or h != 5:
                         self.assertEqual(expected, calc_arc_extent(d, h, m))
 
+    def test_arc_extent(self):
+        for m in range(0, timeline.CYCLE_DURATION):
+            self.assertEqual(calc_arc_extent(*timeline.from_minute(m)), arc_extent(m))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,44 @@
+import os
+import tkinter as tk
+import unittest
+
+# the window reads its settings at import: the tests use the sample ones
+os.environ.setdefault('TTFH_INI', os.path.join(os.path.dirname(__file__), '..', '..', 'ttfh.ini.sample'))
+
+from src.timer import Clock  # pylint: disable=wrong-import-position
+
+
+class WindowTest(unittest.TestCase):
+
+    def setUp(self):
+        from src.graphics.window import Window  # pylint: disable=import-outside-toplevel
+        self.clocks = [Clock(), Clock(2, 6, 0)]
+        try:
+            self.window = Window(*self.clocks)
+        except tk.TclError as e:
+            self.skipTest(f'no display: {e}')
+
+    def tearDown(self):
+        self.window.window.destroy()
+
+    def title(self) -> str:
+        self.window.window.update()
+        return self.window.window.title()
+
+    def test_title_follows_speed(self):
+        self.window._cycle_speed(None)
+        self.assertTrue(self.title().endswith('(x10)'))
+        # forward, backward and reset put the speed back to normal
+        self.clocks[0].forward()
+        self.assertEqual('Till the Final Hour', self.title())
+
+    def test_title_follows_tab(self):
+        self.window._cycle_speed(None)
+        self.window.tabs.select(1)
+        self.assertEqual('Till the Final Hour', self.title())
+        self.window.tabs.select(0)
+        self.assertTrue(self.title().endswith('(x10)'))
+
+
+if __name__ == '__main__':
+    unittest.main()
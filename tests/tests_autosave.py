@@ -0,0 +1,42 @@
+import time
+import unittest
+
+from src.autosave import AutoSaver
+
+
+class AutoSaverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.version = 0
+        self.written = []
+        self.saver = AutoSaver(lambda: self.version, lambda: self.written.append(self.version), 0.01)
+
+    def test_save_if_changed(self):
+        self.assertFalse(self.saver.save_if_changed())
+        self.version += 3
+        self.assertTrue(self.saver.save_if_changed())
+        self.assertFalse(self.saver.save_if_changed())
+        self.assertEqual([3], self.written)
+        self.assertEqual(1, self.saver.writes)
+
+    def test_failure(self):
+        def fail():
+            raise OSError('disk full')
+
+        saver = AutoSaver(lambda: self.version, fail, 0.01)
+        self.version += 1
+        self.assertFalse(saver.save_if_changed())
+        self.assertEqual(0, saver.writes)
+
+    def test_coalesce(self):
+        self.saver.start()
+        for _ in range(100):
+            self.version += 1
+        time.sleep(0.1)
+        self.saver.stop()
+        self.assertEqual([100], self.written)
+        self.assertGreaterEqual(self.saver.latency_max, self.saver.latency_mean())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import json
+import socket
+import time
+import unittest
+
+from src import broadcast, bus, timeline
+from src.broadcast import BroadcastServer
+from src.bus import BusEvent, EventBus
+
+
+class FakeClock:
+    def __init__(self, minute: int):
+        self.minute = minute
+        self.running = True
+        self.speed = 1
+        self.slow = 0
+        self.end = False
+
+    def get_cycle_minute(self) -> int:
+        return self.minute
+
+
+class BroadcastServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = EventBus()
+        self.clocks = [FakeClock(0), FakeClock(125)]
+        self.server = BroadcastServer(self.clocks, queue_size=4)
+        self.server.start(self.bus)
+        self.sockets = []
+
+    def tearDown(self):
+        for sock in self.sockets:
+            sock.close()
+        self.server.stop()
+
+    def connect(self, path: str = '/events') -> socket.socket:
+        sock = socket.create_connection(('127.0.0.1', self.server.port), timeout=5)
+        sock.sendall(f'GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode())
+        self.sockets.append(sock)
+        return sock
+
+    @staticmethod
+    def receive(sock: socket.socket, count: int):
+        """ Reads the given number of messages, the first one being preceded by the HTTP headers """
+        data = b''
+        while data.count(b'\n\n') < count:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+        return [message.decode() for message in data.split(b'\n\n')[:count]]
+
+    def wait_for(self, condition) -> None:
+        for _ in range(500):
+            if condition():
+                return
+            time.sleep(0.01)
+        self.fail('timed out')
+
+    def test_state_then_deltas(self):
+        sock = self.connect()
+        head, _, state = self.receive(sock, 3)
+        self.assertIn('text/event-stream', head)
+        self.assertEqual('event: state', state.split('\n')[0])
+        self.assertEqual({'c': 1, 'm': 125, 'r': 1, 's': 1, 'w': 0, 'x': 0},
+                         json.loads(state.split('\n')[1][len('data: '):]))
+
+        self.bus.publish([BusEvent(self.clocks[1], timeline.HOUR, 180), BusEvent(self.clocks[1], timeline.TICK, 180),
+                          BusEvent(self.clocks[1], bus.MINUTE, 180)])
+        self.assertEqual(['data: {"c":1,"e":[["hour",180],["minute",180]]}'], self.receive(sock, 1))
+
+    def test_slow_client(self):
+        sock = self.connect()
+        self.receive(sock, 3)
+        self.wait_for(lambda: self.server.stats.clients == 1)
+        # the client is not reading: its queue overflows without blocking the others
+        client = self.server._clients[0]
+        self.server._loop.call_soon_threadsafe(lambda: [self.server._broadcast(b'data: x\n\n') for _ in range(20)])
+        self.wait_for(lambda: self.server.stats.messages == 20)
+        self.assertGreater(self.server.stats.dropped, 0)
+        self.assertLessEqual(client.queue.qsize(), 4)
+
+    def test_page(self):
+        sock = self.connect('/')
+        self.assertTrue(self.receive(sock, 1)[0].startswith('HTTP/1.1 200 OK'))
+
+    def test_stop_closes_loop(self):
+        sock = self.connect()
+        self.receive(sock, 1)
+        loop = self.server._loop
+        self.server.stop()
+        self.assertTrue(loop.is_closed())
+        self.server.stop()
+
+
+class StartTest(unittest.TestCase):
+
+    def test_invalid_address(self):
+        with socket.socket() as busy:
+            busy.bind(('127.0.0.1', 0))
+            busy.listen()
+            for address in ('127.0.0.1:port', '127.0.0.1:', f'127.0.0.1:{busy.getsockname()[1]}'):
+                with self.subTest(address):
+                    with self.assertLogs('src.broadcast', 'ERROR'):
+                        self.assertIsNone(broadcast.start([], address))
+
+    def test_no_address(self):
+        self.assertIsNone(broadcast.start([], ''))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+from src import bus, timeline
+from src.bus import BusEvent, EventBus
+
+
+class EventBusTest(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = EventBus()
+        self.clocks = [object(), object()]
+        self.batch = [
+            BusEvent(self.clocks[0], timeline.HOUR, 60),
+            BusEvent(self.clocks[0], timeline.BELL, 60),
+            BusEvent(self.clocks[0], bus.MINUTE, 61),
+        ]
+
+    def test_publish_all(self):
+        received = []
+        self.bus.subscribe(received.append)
+        self.bus.publish(self.batch)
+        self.assertEqual([self.batch], received)
+
+    def test_publish_kinds(self):
+        received = []
+        self.bus.subscribe(received.append, (timeline.BELL, timeline.TICK))
+        self.bus.publish(self.batch)
+        self.bus.publish([BusEvent(self.clocks[0], bus.PAUSE, 61)])
+        self.assertEqual([[self.batch[1]]], received)
+
+    def test_publish_clock(self):
+        received = []
+        self.bus.subscribe(received.append, clock=self.clocks[1])
+        self.bus.publish(self.batch)
+        event = BusEvent(self.clocks[1], bus.SPEED, 0)
+        self.bus.publish([event])
+        self.assertEqual([[event]], received)
+
+    def test_publish_order(self):
+        received = []
+        self.bus.subscribe(lambda events: received.append('minute'), (bus.MINUTE,))
+        self.bus.subscribe(lambda events: received.append('all'))
+        self.bus.subscribe(lambda events: received.append('bell'), (timeline.BELL,))
+        self.bus.publish(self.batch)
+        self.assertEqual(['minute', 'all', 'bell'], received)
+
+    def test_handler_error(self):
+        received = []
+
+        def fail(_):
+            raise RuntimeError('broken panel')
+
+        self.bus.subscribe(fail)
+        self.bus.subscribe(received.append)
+        with self.assertLogs('src.bus', 'ERROR'):
+            self.bus.publish(self.batch)
+        self.assertEqual([self.batch], received)
+
+    def test_unsubscribe(self):
+        received = []
+        subscription = self.bus.subscribe(received.append, (bus.MINUTE,))
+        self.bus.unsubscribe(subscription)
+        self.bus.publish(self.batch)
+        self.assertEqual([], received)
+
+    def test_stats(self):
+        self.bus.subscribe(lambda events: None, (timeline.HOUR,))
+        self.bus.subscribe(lambda events: None, (timeline.DAY,))
+        self.bus.publish(self.batch)
+        self.assertEqual((1, 3, 1), (self.bus.stats.batches, self.bus.stats.events, self.bus.stats.calls))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+
+from src import config
+
+INI = '''
+[SYSTEM]
+saves-file=saves.journal
+
+[GUI]
+day-1-name=PRIMO GIORNO
+day-1-colour=white
+''' + ''.join(f'{label}-name={label}\n{label}-colour=white\n' for label in config.LABELS if label != 'day-1') + '''
+[TIMER]
+interval-short=2000
+interval-long=3000
+bell-hours=6,18
+rumble-hours=11,14,0
+catch-up=replay
+'''
+
+
+class ParseTest(unittest.TestCase):
+
+    def test_parse(self):
+        parsed = config.parse(INI)
+        self.assertEqual((2000, 3000), parsed.intervals)
+        self.assertEqual((6, 18), parsed.bell_hours)
+        self.assertEqual((11, 14, 0), parsed.rumble_hours)
+        self.assertEqual(('replay', 'drop'), (parsed.catch_up, parsed.fast_catch_up))
+        self.assertEqual('PRIMO GIORNO', parsed.get('GUI', 'day-1-name'))
+
+    def test_get(self):
+        parsed = config.parse(INI)
+        self.assertEqual('saves.journal', parsed.get('SYSTEM', 'SAVES-FILE'))
+        self.assertEqual('x', parsed.get('SYSTEM', 'missing', 'x'))
+        self.assertRaises(KeyError, parsed.get, 'SYSTEM', 'missing')
+
+    def test_immutable(self):
+        parsed = config.parse(INI)
+        with self.assertRaises(TypeError):
+            parsed.values[('GUI', 'day-1-name')] = 'x'
+        with self.assertRaises(AttributeError):
+            parsed.intervals = (1, 1)
+
+    def test_parse_invalid(self):
+        for old, new in (('interval-short=2000', 'interval-short=fast'), ('interval-long=3000', 'interval-long=0'),
+                         ('bell-hours=6,18', 'bell-hours=6,24'), ('catch-up=replay', 'catch-up=all'),
+                         ('rumble-hours=11,14,0\n', ''), ('[GUI]', 'GUI]'), ('night-colour=white\n', '')):
+            with self.subTest(new):
+                self.assertRaises(ValueError, config.parse, INI.replace(old, new))
+
+    def test_changed_keys(self):
+        old = config.parse(INI)
+        new = config.parse(INI.replace('bell-hours=6,18', 'bell-hours=7').replace('day-2-name=day-2', 'day-2-name=X'))
+        self.assertEqual({('TIMER', 'bell-hours'), ('GUI', 'day-2-name')}, config.changed_keys(old, new))
+        self.assertEqual(set(), config.changed_keys(old, config.parse(INI)))
+
+
+class LiveConfigTest(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.ini')
+        os.close(handle)
+        self._write(INI)
+        self.live = config.LiveConfig(self.path)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def _write(self, text: str) -> None:
+        with open(self.path, 'w', encoding='utf-8') as ini_file:
+            ini_file.write(text)
+
+    def test_reload(self):
+        received = []
+        self.live.subscribe(lambda keys, new: received.append(('all', keys)))
+        self.live.subscribe(lambda keys, new: received.append(('timer', keys)), [('TIMER', 'interval-short')])
+        self.live.subscribe(lambda keys, new: received.append(('gui', keys)), [('GUI', 'day-1-name')])
+        self.assertEqual(set(), self.live.reload())
+
+        self._write(INI.replace('interval-short=2000', 'interval-short=500'))
+        changed = {('TIMER', 'interval-short')}
+        self.assertEqual(changed, self.live.reload())
+        self.assertEqual((500, 3000), self.live.current.intervals)
+        self.assertEqual([('all', changed), ('timer', changed)], received)
+
+    def test_reload_invalid(self):
+        old = self.live.current
+        self._write(INI.replace('interval-short=2000', 'interval-short=-1'))
+        self.assertEqual(set(), self.live.reload())
+        self.assertIs(old, self.live.current)
+
+    def test_reload_missing_label(self):
+        old = self.live.current
+        self._write(INI.replace('interval-short=2000', 'interval-short=500').replace('dawn-name=dawn\n', ''))
+        self.assertEqual(set(), self.live.reload())
+        self.assertIs(old, self.live.current)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+# the engine reads its settings at import: the tests use the sample ones
+os.environ.setdefault('TTFH_INI', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                               'ttfh.ini.sample'))
+
+from src import saves  # pylint: disable=wrong-import-position
+from src.headless import HELP, HeadlessEngine  # pylint: disable=wrong-import-position
+from src.timer import Clock  # pylint: disable=wrong-import-position
+
+
+class HeadlessEngineTest(unittest.TestCase):
+
+    def setUp(self):
+        saves.clear()
+        self.clock = Clock()
+        self.engine = HeadlessEngine(self.clock, '--headless')
+
+    def tearDown(self):
+        saves.clear()
+
+    def test_unknown(self):
+        self.assertEqual(f'Unknown command "jump". {HELP}', self.engine.execute('jump 3'))
+        self.assertEqual(HELP, self.engine.execute('help'))
+
+    def test_status(self):
+        self.assertEqual('1.05.00 paused normal', self.engine.execute('status'))
+        self.assertEqual('1.05.00 running normal', self.engine.execute('pause'))
+        self.assertEqual('1.05.00 running slow', self.engine.execute(' SLOW '))
+        self.assertEqual('1.05.00 running slow x10', self.engine.execute('fast'))
+        self.assertEqual('1.06.00 paused normal', self.engine.execute('forward'))
+        self.assertEqual('1.05.00 paused normal', self.engine.execute('backward'))
+
+    def test_save_load_delete(self):
+        self.clock.set_time(2, 10, 15)
+        self.clock.un_pause('run')
+        self.assertEqual('Saved "first", day 2 at 10:15', self.engine.execute('save first'))
+        self.assertFalse(self.clock.running)
+        self.assertTrue(self.engine.execute('save first').startswith('"first" already in use'))
+        self.assertTrue(self.engine.execute('save ???').endswith(saves.NAME_RULES))
+        self.engine.execute('forward')
+        self.engine.execute('save second')
+        self.assertEqual('"first", day 2 at 10:15\n"second", day 2 at 11:00', self.engine.execute('list'))
+
+        self.engine.execute('reset')
+        self.assertEqual('', self.engine.execute('list'))
+        self.engine.execute('save first')
+        self.clock.set_time(3, 1, 0)
+        self.assertEqual('1.05.00 paused normal', self.engine.execute('load first'))
+        # a loaded save is consumed
+        self.assertEqual('No save "first"', self.engine.execute('load first'))
+
+        self.engine.execute('save third')
+        self.assertEqual('Deleted "third", day 1 at 05:00', self.engine.execute('delete third'))
+        self.assertEqual('No save "third"', self.engine.execute('delete third'))
+
+    def test_quit_writes_continue(self):
+        previous = os.getcwd()
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            try:
+                self.clock.set_time(2, 6, 30)
+                saves.create('kept', 1, 7, 0)
+                replies = []
+                self.engine.submit('quit', replies.append)
+                self.engine.run()
+                with open('continue', encoding='utf-8') as continue_file:
+                    content = continue_file.read()
+            finally:
+                os.chdir(previous)
+        self.assertEqual(['Bye'], replies)
+        self.assertEqual('entrypoint.py --day 2 --hour 6 --minute 30 --headless --saves="kept@1.07.00"\n', content)
+
+
+if __name__ == '__main__':
+    unittest.main()
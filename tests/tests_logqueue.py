@@ -0,0 +1,151 @@
+import json
+import logging
+import sys
+import threading
+import time
+import unittest
+
+from src.logqueue import DroppingQueueHandler, JsonFormatter, LogPipeline
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.closed = False
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+def make_record(msg: str, *args, **extra) -> logging.LogRecord:
+    record = logging.LogRecord('ttfh.test', logging.INFO, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class DroppingQueueHandlerTest(unittest.TestCase):
+
+    def test_drop(self):
+        handler = DroppingQueueHandler(2)
+        for i in range(5):
+            handler.handle(make_record('record %d', i))
+        self.assertEqual(2, handler.queue.qsize())
+        self.assertEqual(3, handler.dropped)
+        self.assertEqual('record 0', handler.queue.get_nowait().getMessage())
+
+
+class JsonFormatterTest(unittest.TestCase):
+
+    def test_format(self):
+        entry = json.loads(JsonFormatter().format(make_record('tick %s', 'x', cost=0.25)))
+        self.assertEqual('tick x', entry['message'])
+        self.assertEqual('INFO', entry['level'])
+        self.assertEqual('ttfh.test', entry['logger'])
+        self.assertEqual(0.25, entry['cost'])
+        self.assertNotIn('args', entry)
+
+    def test_exception(self):
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            record = logging.LogRecord('ttfh.test', logging.ERROR, __file__, 1, 'failed', None, sys.exc_info())
+        self.assertIn('ValueError: boom', json.loads(JsonFormatter().format(record))['exc'])
+
+
+class LogPipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = logging.getLogger()
+        self.previous = (self.root.handlers[:], self.root.level)
+
+    def tearDown(self):
+        self.root.handlers[:] = self.previous[0]
+        self.root.setLevel(self.previous[1])
+
+    def test_pipeline(self):
+        target = ListHandler()
+        pipeline = LogPipeline(target, size=100)
+        pipeline.start()
+        logging.getLogger('ttfh.test').info('hello %s', 'world')
+        logging.getLogger('ttfh.test').debug('hidden')
+        pipeline.stop()
+        self.assertEqual(['hello world'], [record.getMessage() for record in target.records])
+        self.assertTrue(target.closed)
+
+    def test_pipeline_exception(self):
+        target = ListHandler()
+        target.setFormatter(JsonFormatter())
+        lines = []
+        target.emit = lambda record: lines.append(target.format(record))
+        pipeline = LogPipeline(target, size=100)
+        pipeline.start()
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            logging.getLogger('ttfh.test').exception('failed %d', 1)
+        pipeline.stop()
+        entry = json.loads(lines[0])
+        self.assertEqual('failed 1', entry['message'])
+        self.assertIn('ValueError: boom', entry['exc'])
+
+    def test_pipeline_text(self):
+        target = ListHandler()
+        target.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        lines = []
+        target.emit = lambda record: lines.append(target.format(record))
+        pipeline = LogPipeline(target, size=100)
+        pipeline.start()
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            logging.getLogger('ttfh.test').exception('failed')
+        pipeline.stop()
+        self.assertTrue(lines[0].startswith('ERROR failed\nTraceback'))
+        self.assertTrue(lines[0].endswith('ValueError: boom'))
+
+    def test_dropped(self):
+        target = ListHandler()
+        pipeline = LogPipeline(target, size=1)
+        # queued before the listener runs: the second record doesn't fit
+        pipeline.queue_handler.handle(make_record('kept'))
+        pipeline.queue_handler.handle(make_record('lost'))
+        pipeline.start()
+        pipeline.stop()
+        self.assertEqual(1, pipeline.dropped)
+        self.assertEqual(['kept', '1 log records dropped: the queue was full'],
+                         [record.getMessage() for record in target.records])
+
+    def test_stop_full(self):
+        gate = threading.Event()
+
+        class SlowHandler(ListHandler):
+            def emit(self, record):
+                gate.wait(5)
+                super().emit(record)
+
+        target = SlowHandler()
+        pipeline = LogPipeline(target, size=5)
+        pipeline.start()
+        pipeline.queue_handler.handle(make_record('first'))
+        # the listener is held by the first record, the others fill the queue
+        deadline = time.monotonic() + 5
+        while not pipeline.queue_handler.queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for i in range(6):
+            pipeline.queue_handler.handle(make_record('record %d', i))
+        self.assertTrue(pipeline.queue_handler.queue.full())
+        threading.Timer(0.1, gate.set).start()
+        pipeline.stop()
+        messages = [record.getMessage() for record in target.records]
+        self.assertEqual(['first', *(f'record {i}' for i in range(5)), '1 log records dropped: the queue was full'],
+                         messages)
+        self.assertTrue(target.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import urllib.request
+
+from src.metrics import BOUNDS, Histogram, Metrics
+
+
+class HistogramTest(unittest.TestCase):
+
+    def test_observe(self):
+        histogram = Histogram('test')
+        for seconds in (0.00005, 0.0003, 0.0003, 0.002, 3.0):
+            histogram.observe(seconds)
+        self.assertEqual(5, histogram.count)
+        self.assertEqual(3.0, histogram.max)
+        self.assertAlmostEqual(3.00265, histogram.total)
+        self.assertEqual(1, histogram.counts[0])
+        self.assertEqual(2, histogram.counts[BOUNDS.index(0.0005)])
+        self.assertEqual(1, histogram.counts[-1])
+
+    def test_percentile(self):
+        histogram = Histogram('test')
+        self.assertEqual(0.0, histogram.percentile(0.5))
+        for _ in range(98):
+            histogram.observe(0.0008)
+        histogram.observe(0.02)
+        histogram.observe(2.5)
+        self.assertEqual(0.001, histogram.percentile(0.5))
+        self.assertEqual(0.025, histogram.percentile(0.99))
+        self.assertEqual(2.5, histogram.percentile(1))
+
+    def test_str(self):
+        histogram = Histogram('tick.lateness')
+        histogram.observe(0.004)
+        self.assertEqual('tick.lateness count=1 mean_ms=4.000 p50_ms<=5 p99_ms<=5 max_ms=4.000', str(histogram))
+
+
+class MetricsTest(unittest.TestCase):
+
+    def test_histogram(self):
+        metrics = Metrics()
+        self.assertIs(metrics.histogram('a'), metrics.histogram('a'))
+        self.assertFalse(metrics.enabled)
+        metrics.enable()
+        self.assertTrue(metrics.enabled)
+
+    def test_report(self):
+        metrics = Metrics()
+        metrics.histogram('unused')
+        metrics.histogram('panel.TextPanel').observe(0.0002)
+        metrics.add_source('bus', lambda: {'batches': 3, 'events': 5})
+        metrics.add_source('sound.queue', lambda: {'mean_ms': 0.5})
+        metrics.add_source('broken', lambda: 1 / 0)
+        lines = metrics.report().splitlines()
+        self.assertEqual(4, len(lines))
+        self.assertTrue(lines[0].startswith('panel.TextPanel count=1 '))
+        self.assertTrue(lines[1].startswith('broken error='))
+        self.assertEqual(['bus batches=3 events=5', 'sound.queue mean_ms=0.500'], lines[2:])
+
+    def test_serve(self):
+        metrics = Metrics()
+        metrics.add_source('bus', lambda: {'batches': 7})
+        server = metrics.serve(0)
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{server.server_address[1]}/', timeout=5) as response:
+                self.assertEqual('text/plain; charset=utf-8', response.headers['Content-Type'])
+                self.assertEqual('bus batches=7\n', response.read().decode())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+# the sounds' settings are read at import: the tests use the sample ones
+os.environ.setdefault('TTFH_INI', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                               'ttfh.ini.sample'))
+
+from src.music import (AudioWorker, NullBackend, PygameBackend, SoundCache,  # pylint: disable=wrong-import-position
+                       create_backend)
+
+_DURATION = 0.1
+
+
+class FakeBackend(NullBackend):
+    """ Each sound plays for _DURATION seconds """
+
+    def __init__(self):
+        self.played = []
+        self.stopped = []
+        self._ends = {}
+        self.changed = threading.Event()
+
+    def play(self, path, channel):
+        if path == 'missing':
+            raise FileNotFoundError(path)
+        self.played.append((path, channel, time.monotonic()))
+        self._ends[channel] = time.monotonic() + _DURATION
+        self.changed.set()
+
+    def stop(self, channel):
+        self.stopped.append(channel)
+        self._ends.pop(channel, None)
+        self.changed.set()
+
+    def busy(self, channel):
+        return time.monotonic() < self._ends.get(channel, 0)
+
+
+class SoundCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.decoded = []
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def sound(self, name: str, size: int) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'wb') as sound_file:
+            sound_file.write(b'x' * size)
+        return path
+
+    def decode(self, path: str):
+        self.decoded.append(os.path.basename(path))
+        return f'decoded {os.path.basename(path)}', os.path.getsize(path)
+
+    def test_get(self):
+        cache = SoundCache(100, self.decode)
+        bells = self.sound('bells', 10)
+        self.assertEqual('decoded bells', cache.get(bells))
+        self.assertEqual('decoded bells', cache.get(bells))
+        self.assertEqual(['bells'], self.decoded)
+        self.assertEqual(10, cache.size)
+        with self.assertRaises(FileNotFoundError):
+            cache.get(os.path.join(self.directory.name, 'missing'))
+
+    def test_eviction(self):
+        cache = SoundCache(100, self.decode)
+        bells, tick, rumble = self.sound('bells', 40), self.sound('tick', 40), self.sound('rumble', 40)
+        cache.get(bells)
+        cache.get(tick)
+        # bells becomes the most recently used: tick is the one evicted
+        cache.get(bells)
+        cache.get(rumble)
+        self.assertEqual(80, cache.size)
+        cache.get(bells)
+        cache.get(tick)
+        self.assertEqual(['bells', 'tick', 'rumble', 'tick'], self.decoded)
+        self.assertEqual(80, cache.size)
+
+    def test_keeps_last(self):
+        cache = SoundCache(100, self.decode)
+        cache.get(self.sound('bells', 40))
+        cache.get(self.sound('transition', 150))
+        # the last sound is kept, even if it doesn't fit
+        self.assertEqual(150, cache.size)
+        cache.clear()
+        self.assertEqual(0, cache.size)
+
+    def test_reload_modified(self):
+        cache = SoundCache(100, self.decode)
+        bells = self.sound('bells', 10)
+        cache.get(bells)
+        self.sound('bells', 30)
+        stat = os.stat(bells)
+        os.utime(bells, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        cache.get(bells)
+        self.assertEqual(['bells', 'bells'], self.decoded)
+        self.assertEqual(30, cache.size)
+
+
+class CreateBackendTest(unittest.TestCase):
+
+    def test_null(self):
+        self.assertIs(NullBackend, type(create_backend('null')))
+
+    def test_auto_without_pygame(self):
+        with mock.patch.dict(sys.modules, {'pygame': None}), self.assertLogs('src.music', 'WARNING'):
+            self.assertIs(NullBackend, type(create_backend('auto')))
+
+    def test_pygame_without_pygame(self):
+        with mock.patch.dict(sys.modules, {'pygame': None}), self.assertRaises(ImportError):
+            create_backend('pygame')
+
+    def test_auto_without_device(self):
+        with mock.patch.object(PygameBackend, '__init__', side_effect=RuntimeError('No available audio device')), \
+                self.assertLogs('src.music', 'WARNING'):
+            self.assertIs(NullBackend, type(create_backend('auto')))
+
+
+class AudioWorkerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = FakeBackend()
+        self.worker = AudioWorker('fake', resolve=lambda key: key, create=lambda _: self.backend)
+
+    def wait_played(self, count):
+        deadline = time.monotonic() + 5
+        while len(self.backend.played) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return [(path, channel) for path, channel, _ in self.backend.played]
+
+    def test_sequence(self):
+        self.worker.play([('bells', 0), ('rumble', 1), ('tick', 0), ('missing', 0), ('transition', 0)])
+        self.assertEqual([('bells', 0), ('rumble', 1), ('tick', 0), ('transition', 0)], self.wait_played(4))
+        starts = [start for _, channel, start in self.backend.played if channel == 0]
+        # each sound waits for the previous one of its channel
+        self.assertGreaterEqual(starts[1] - starts[0], _DURATION * 0.9)
+        self.assertGreaterEqual(starts[2] - starts[1], _DURATION * 0.9)
+        # the other channel is not held back
+        self.assertLess(self.backend.played[1][2] - starts[0], _DURATION / 2)
+
+    def test_latency(self):
+        self.worker.play([('bells', 0), ('tick', 0), ('missing', 1)])
+        self.wait_played(2)
+        deadline = time.monotonic() + 5
+        while self.worker.latency().count < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        latency = self.worker.latency()
+        self.assertEqual(2, latency.count)
+        # the second sound waited for the first one to end
+        self.assertGreaterEqual(latency.max_ms, _DURATION * 900)
+        self.assertLessEqual(latency.mean_ms, latency.max_ms)
+
+    def test_replace(self):
+        self.worker.play([('bells', 0), ('tick', 0)])
+        self.wait_played(1)
+        self.worker.play([('transition', 0)])
+        self.wait_played(2)
+        time.sleep(_DURATION * 2)
+        self.assertEqual([('bells', 0), ('transition', 0)], self.wait_played(2))
+
+    def test_stop(self):
+        self.worker.play([('bells', 0), ('tick', 0)])
+        self.wait_played(1)
+        self.worker.stop([0, 1])
+        time.sleep(_DURATION * 2)
+        self.assertEqual([('bells', 0)], self.wait_played(1))
+        self.assertEqual([0, 1], self.backend.stopped)
+
+    def test_backend_error(self):
+        def create(_):
+            raise ImportError('No module named pygame')
+
+        worker = AudioWorker('pygame', resolve=lambda key: key, create=create)
+        done = threading.Event()
+        with self.assertLogs('src.music', 'ERROR'):
+            worker.submit(lambda backend: done.set())
+            self.assertTrue(done.wait(5))
+        self.assertIsInstance(worker.backend, NullBackend)
+        # the worker keeps serving the tasks
+        done.clear()
+        worker.play([('bells', 0)])
+        worker.submit(lambda backend: done.set())
+        self.assertTrue(done.wait(5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+# the clock reads its settings at import: the tests use the sample ones
+os.environ.setdefault('TTFH_INI', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                               'ttfh.ini.sample'))
+
+from src import persistence, saves  # pylint: disable=wrong-import-position
+from src.timer import Clock  # pylint: disable=wrong-import-position
+
+
+class AdvancingClock(Clock):
+    """ Clock whose time moves on to the next day between two reads of its fields, as on another thread """
+    __slots__ = ()
+
+    @property
+    def day(self) -> int:
+        day = self._time[0]
+        self.set_time(day + 1, 5, 0)
+        return day
+
+
+class MakeContinueTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.dir = tempfile.TemporaryDirectory()
+        os.chdir(self.dir.name)
+        saves.clear()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.dir.cleanup()
+
+    def read(self) -> str:
+        with open(persistence.CONTINUE_FILE, encoding='utf-8') as continue_file:
+            return continue_file.read()
+
+    def test_time(self):
+        persistence.make_continue(Clock(2, 6, 30), '--headless', [Clock(3, 23, 59)])
+        self.assertIn('--day 2 --hour 6 --minute 30 --clock 3.23.59 --headless', self.read())
+
+    def test_single_read(self):
+        clock = AdvancingClock(1, 4, 59)
+        persistence.make_continue(clock)
+        self.assertIn('--day 1 --hour 4 --minute 59', self.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
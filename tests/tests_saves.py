@@ -1,5 +1,7 @@
+import io
 import unittest
 
+from src import saves, timeline
 from src.saves import SaveState
 
 
@@ -86,5 +88,89 @@ class SavesTest(unittest.TestCase):
                     )
 
 
+class SavesIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        saves.clear()
+        saves.create('dawn', 2, 6, 0)
+        saves.create('noon', 2, 12, 0)
+        saves.create('first', 1, 5, 0)
+        saves.create('night', 2, 2, 0)
+        saves.create('last', 3, 4, 59)
+
+    def tearDown(self):
+        saves.clear()
+
+    def names(self, save_list):
+        return [save.name for save in save_list]
+
+    def test_get_cycle_minute(self):
+        self.assertEqual(0, SaveState('name', 1, 5, 0).get_cycle_minute())
+        self.assertEqual(4319, SaveState('name', 3, 4, 59).get_cycle_minute())
+
+    def test_iter_ordered(self):
+        self.assertEqual(['first', 'dawn', 'noon', 'night', 'last'], self.names(saves.iter_ordered()))
+
+    def test_get_between(self):
+        self.assertEqual(['dawn', 'noon'],
+                         self.names(saves.get_between(timeline.to_minute(2, 6, 0), timeline.to_minute(2, 12, 0))))
+        self.assertEqual(['noon'],
+                         self.names(saves.get_between(timeline.to_minute(2, 6, 1), timeline.to_minute(2, 13, 0))))
+        self.assertEqual([], saves.get_between(timeline.to_minute(3, 5, 0), timeline.to_minute(3, 6, 0)))
+
+    def test_get_nearest(self):
+        self.assertEqual('first', saves.get_nearest(0).name)
+        self.assertEqual('dawn', saves.get_nearest(timeline.to_minute(2, 8, 59)).name)
+        self.assertEqual('noon', saves.get_nearest(timeline.to_minute(2, 9, 1)).name)
+        self.assertEqual('last', saves.get_nearest(timeline.CYCLE_DURATION).name)
+        saves.clear()
+        self.assertIsNone(saves.get_nearest(0))
+
+    def test_delete(self):
+        saves.delete('noon')
+        saves.delete('missing')
+        self.assertEqual(['first', 'dawn', 'night', 'last'], self.names(saves.iter_ordered()))
+
+    def test_deserialize(self):
+        saves.deserialize('noon@1.06.00,other@3.10.00')
+        self.assertEqual(['first', 'noon', 'dawn', 'night', 'other', 'last'], self.names(saves.iter_ordered()))
+
+
+class ParseTest(unittest.TestCase):
+    SOURCE = 'one@1.05.00,bad,,two@2.10.30,' + 'x' * 100 + ',three@3.23.59\n'
+
+    def test_parse(self):
+        for chunk_size in (1, 2, 7, 25, 1000):
+            entries = list(saves.parse(self.SOURCE, chunk_size))
+            self.assertEqual([0, 12, 17, 29, 130], [entry.offset for entry in entries], chunk_size)
+            self.assertEqual(['one@1.05.00', 'bad', 'two@2.10.30', 'x' * (SaveState.MAX_LEN + 1), 'three@3.23.59'],
+                             [entry.value for entry in entries])
+            self.assertEqual(['one', None, 'two', None, 'three'],
+                             [entry.save.name if entry.save else None for entry in entries])
+
+    def test_parse_crlf(self):
+        name = 'a' * SaveState.NAME_LEN
+        source = f'{name}@1.05.00,\r\n{name}@2.05.00\r\n,\r\n'
+        for chunk_size in (1, 3, 25, 1000):
+            entries = list(saves.parse(source, chunk_size))
+            self.assertEqual([0, len(name) + 11], [entry.offset for entry in entries], chunk_size)
+            self.assertEqual([f'{name}@1.05.00', f'{name}@2.05.00'], [repr(entry.save) for entry in entries])
+
+    def test_parse_file(self):
+        entries = list(saves.parse(io.StringIO(self.SOURCE), 4))
+        self.assertEqual(5, len(entries))
+        self.assertEqual('two@2.10.30', repr(entries[2].save))
+
+    def test_parse_empty(self):
+        self.assertEqual([], list(saves.parse('')))
+        self.assertEqual([], list(saves.parse(',,\n')))
+
+    def test_deserialize_errors(self):
+        saves.clear()
+        self.assertEqual(['bad', 'x' * (SaveState.MAX_LEN + 1)], saves.deserialize(self.SOURCE))
+        self.assertEqual(['one', 'two', 'three'], saves.get_list())
+        saves.clear()
+
+
 if __name__ == '__main__':
     unittest.main()
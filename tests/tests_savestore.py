@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src import saves
+from src.savestore import SaveJournal
+
+
+class SaveJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'saves.journal')
+        saves.clear()
+
+    def tearDown(self):
+        saves.detach()
+        saves.clear()
+        self.dir.cleanup()
+
+    def reopen(self):
+        saves.detach()
+        saves.clear()
+        return saves.attach(SaveJournal(self.path, durable=False))
+
+    def test_write_through(self):
+        self.assertEqual([], self.reopen())
+        saves.create('one', 1, 6, 0)
+        saves.create('two', 2, 7, 30)
+        saves.create('three', 3, 8, 59)
+        saves.delete('two')
+        self.reopen()
+        self.assertEqual(['one', 'three'], saves.get_list())
+        self.assertEqual('three@3.08.59', repr(saves.get('three')))
+
+    def test_clear(self):
+        self.reopen()
+        saves.create('one', 1, 6, 0)
+        saves.clear()
+        saves.create('two', 2, 7, 30)
+        self.reopen()
+        self.assertEqual(['two'], saves.get_list())
+
+    def test_deserialize(self):
+        self.reopen()
+        with mock.patch('os.fsync') as fsync:
+            saves._STORE.durable = True
+            saves.deserialize('one@1.06.00,two@2.07.30,three@3.08.59')
+        fsync.assert_called_once()
+        self.reopen()
+        self.assertEqual(['one', 'two', 'three'], saves.get_list())
+
+    def test_torn_line(self):
+        with open(self.path, 'w', encoding='utf-8') as journal:
+            journal.write('+one@1.06.00\n+two@2.0')
+        self.assertEqual(['+two@2.0'], self.reopen())
+        saves.create('three', 3, 8, 59)
+        self.assertEqual([], self.reopen())
+        self.assertEqual(['one', 'three'], saves.get_list())
+
+    def test_compaction(self):
+        self.reopen()
+        for i in range(600):
+            saves.create(f'save {i}', 1, 6, 0)
+            saves.delete(f'save {i}')
+        saves.create('last', 1, 6, 0)
+        with open(self.path, 'r', encoding='utf-8') as journal:
+            self.assertLess(len(journal.readlines()), 1000)
+        self.reopen()
+        self.assertEqual(['last'], saves.get_list())
+
+    def test_compaction_same_names(self):
+        self.reopen()
+        # the same saves restored again are not new saves
+        for _ in range(600):
+            saves.deserialize('one@1.06.00,two@2.07.30')
+        with open(self.path, 'r', encoding='utf-8') as journal:
+            self.assertLess(len(journal.readlines()), 1000)
+        self.reopen()
+        self.assertEqual(['one', 'two'], saves.get_list())
+
+
+if __name__ == '__main__':
+    unittest.main()
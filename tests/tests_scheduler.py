@@ -0,0 +1,184 @@
+import unittest
+
+from src.scheduler import FRAME_MS, HeapScheduler, TickScheduler, TimingWheel
+
+
+class FakeClock:
+    CATCH_UP = 'replay'
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.running = True
+        self.minutes = 0
+
+    def get_interval(self) -> float:
+        return self.interval
+
+    def catch_up(self) -> str:
+        return self.CATCH_UP
+
+    def advance(self, minutes: int, policy: str) -> None:
+        self.minutes += minutes
+
+    def un_pause(self, mode: str) -> None:
+        self.running = mode == 'run'
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TickSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock(2000)
+        self.time = FakeTime()
+        self.scheduler = TickScheduler(self.clock, self.time)
+
+    def test_poll_before_deadline(self):
+        self.time.now += 1.999
+        self.assertEqual(0, self.scheduler.poll())
+        self.assertEqual(1, self.scheduler.delay())
+
+    def test_poll_on_time(self):
+        for _ in range(10):
+            self.time.now += 2
+            self.assertEqual(1, self.scheduler.poll())
+            self.assertEqual(2000, self.scheduler.delay())
+
+    def test_poll_no_drift(self):
+        # every callback runs late, but the deadlines stay anchored
+        self.time.now += 2.3
+        self.assertEqual(1, self.scheduler.poll())
+        self.assertEqual(1700, self.scheduler.delay())
+        self.time.now += 1.9
+        self.assertEqual(1, self.scheduler.poll())
+        self.assertEqual(1800, self.scheduler.delay())
+
+    def test_poll_catch_up(self):
+        self.time.now += 3600
+        self.assertEqual(1800, self.scheduler.poll())
+        self.assertEqual(0, self.scheduler.poll())
+        self.assertEqual(2000, self.scheduler.delay())
+
+    def test_poll_fast(self):
+        # a minute shorter than a frame: polled once per frame, the clock moves by the minutes owed
+        self.clock.interval = 2
+        self.scheduler.start()
+        owed = []
+        for _ in range(100):
+            self.time.now += FRAME_MS / 1000
+            owed.append(self.scheduler.poll())
+        self.assertTrue(all(7 <= minutes <= 9 for minutes in owed))
+        self.assertIn(sum(owed), (799, 800))
+
+    def test_poll_paused(self):
+        self.clock.running = False
+        self.time.now += 60
+        self.assertEqual(0, self.scheduler.poll())
+        self.assertEqual(2000, self.scheduler.delay())
+        self.clock.running = True
+        self.time.now += 2
+        self.assertEqual(1, self.scheduler.poll())
+
+    def test_poll_interval_change(self):
+        self.clock.interval = 3000
+        self.time.now += 2
+        self.assertEqual(1, self.scheduler.poll())
+        self.assertEqual(3000, self.scheduler.delay())
+
+
+class HeapSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.time = FakeTime()
+        self.scheduler = HeapScheduler(self.time)
+        self.clocks = [FakeClock(2000), FakeClock(3000), FakeClock(500)]
+        for clock in self.clocks:
+            self.scheduler.add(clock)
+
+    def test_delay(self):
+        self.assertEqual(500, self.scheduler.delay())
+        self.time.now += 0.5
+        self.scheduler.poll()
+        self.assertEqual(500, self.scheduler.delay())
+
+    def test_poll(self):
+        self.time.now += 0.5
+        self.assertEqual([(2, 1)], self.scheduler.poll())
+        self.time.now += 1.5
+        self.assertEqual([(2, 3), (0, 1)], sorted(self.scheduler.poll(), reverse=True))
+        self.time.now += 1
+        self.assertEqual([(1, 1), (2, 2)], sorted(self.scheduler.poll()))
+
+    def test_poll_paused(self):
+        self.clocks[2].running = False
+        self.time.now += 6
+        self.assertEqual([(0, 3), (1, 2)], sorted(self.scheduler.poll()))
+        self.assertEqual(500, self.scheduler.delay())
+
+    def test_restart(self):
+        self.time.now += 1.5
+        self.scheduler.poll()
+        self.clocks[0].interval = 200
+        self.scheduler.restart(0)
+        self.assertEqual(200, self.scheduler.delay())
+        self.time.now += 0.2
+        self.assertEqual([(0, 1)], self.scheduler.poll())
+
+
+class TimingWheelTest(unittest.TestCase):
+
+    def setUp(self):
+        self.time = FakeTime()
+        self.wheel = TimingWheel(resolution=0.01, slots=8, levels=3, now=self.time)
+
+    def run_for(self, seconds: float, step: float = 0.01) -> None:
+        for _ in range(round(seconds / step)):
+            self.time.now += step
+            self.wheel.run_due()
+
+    def test_run_due(self):
+        clocks = [FakeClock(interval) for interval in (20, 50, 130, 2000, 9000)]
+        for clock in clocks:
+            self.wheel.add(clock)
+        self.run_for(18.05)
+        self.assertEqual([902, 361, 138, 9, 2], [clock.minutes for clock in clocks])
+        self.assertEqual(len(clocks), len(self.wheel))
+        self.assertLess(self.wheel.stats.lateness_max, 0.0101)
+
+    def test_run_due_late(self):
+        clock = FakeClock(100)
+        self.wheel.add(clock)
+        self.time.now += 60
+        self.assertEqual(1, self.wheel.run_due())
+        self.assertEqual(600, clock.minutes)
+
+    def test_pause_resume(self):
+        clock = FakeClock(100)
+        key = self.wheel.add(clock)
+        self.run_for(1)
+        self.wheel.pause(key)
+        self.assertFalse(clock.running)
+        self.run_for(1)
+        self.assertEqual(10, clock.minutes)
+        self.wheel.resume(key)
+        self.assertTrue(clock.running)
+        self.run_for(1.05)
+        self.assertEqual(20, clock.minutes)
+
+    def test_remove(self):
+        clock = FakeClock(100)
+        key = self.wheel.add(clock)
+        self.wheel.remove(key)
+        self.run_for(1)
+        self.assertEqual(0, clock.minutes)
+        self.assertEqual(0, len(self.wheel))
+
+
+if __name__ == '__main__':
+    unittest.main()
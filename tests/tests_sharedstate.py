@@ -0,0 +1,119 @@
+import multiprocessing
+import os
+import threading
+import time
+import unittest
+
+from src import bus
+from src.bus import BusEvent, EventBus
+from src.sharedstate import SharedClock, SharedClockReader, SharedClockState
+
+
+class FakeClock:
+    def __init__(self, minute: int = 0):
+        self.minute = minute
+        self.running = False
+        self.slow = 0
+        self.speed = 1
+        self.end = False
+
+    def get_cycle_minute(self) -> int:
+        return self.minute
+
+
+def _check_consistency(name: str, seconds: float, results) -> None:
+    """ Reads the block as fast as possible: the writer always writes the same value as minute and speed """
+    reader = SharedClockReader(name)
+    reads = torn = 0
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        state = reader.read(0)
+        reads += 1
+        torn += state.minute != state.speed
+    reader.close()
+    results.put((reads, torn))
+
+
+class SharedClockStateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.name = f'ttfh-test-{os.getpid()}'
+        self.clocks = [FakeClock(10), FakeClock(125)]
+        self.state = SharedClockState(self.name, self.clocks)
+        self.reader = SharedClockReader(self.name)
+
+    def tearDown(self):
+        self.reader.close()
+        self.state.close()
+
+    def test_read(self):
+        self.assertEqual(2, self.reader.count)
+        self.assertEqual((2, 125, False, 0, False, 1), tuple(self.reader.read(1)))
+        clock = self.clocks[1]
+        clock.minute, clock.running, clock.slow, clock.speed, clock.end = 4260, True, 1, 100, True
+        self.state.write(1, clock)
+        self.assertEqual((4, 4260, True, 1, True, 100), tuple(self.reader.read(1)))
+        self.assertEqual(10, self.reader.read(0).minute)
+
+    def test_attach(self):
+        event_bus = EventBus()
+        self.state.attach(event_bus)
+        self.clocks[0].minute = 11
+        event_bus.publish([BusEvent(self.clocks[0], bus.MINUTE, 11)])
+        self.assertEqual(11, self.reader.read(0).minute)
+        self.assertEqual(125, self.reader.read(1).minute)
+
+    def test_wait(self):
+        seq = self.reader.read(0).seq
+        self.assertIsNone(self.reader.wait(0, seq, 0.02))
+        threading.Timer(0.05, lambda: self.state.write(0, FakeClock(99))).start()
+        self.assertEqual(99, self.reader.wait(0, seq, 5).minute)
+
+    def test_write_in_progress(self):
+        # a writer stopped halfway: the reader waits for the write to complete
+        self.state._memory.buf[8] += 1  # odd sequence number of the first slot
+        threading.Timer(0.05, lambda: self.state.write(0, FakeClock(501))).start()
+        self.assertEqual(501, self.reader.read(0).minute)
+
+    def test_writer_died(self):
+        # a writer died halfway: the reader gives up and returns the last state it read
+        self.assertEqual(10, self.reader.read(0).minute)
+        self.state._memory.buf[8] += 1
+        self.assertEqual(10, self.reader.read(0).minute)
+        self.assertIsNone(self.reader.wait(0, self.reader.read(0).seq, 0.02))
+        other = SharedClockReader(self.name)
+        try:
+            self.assertRaises(TimeoutError, other.read, 0)
+        finally:
+            other.close()
+
+    def test_shared_clock(self):
+        clock = SharedClock(self.reader, 1)
+        self.assertEqual((1, 7, 5), (clock.day, clock.hour, clock.minute))
+        self.assertFalse(clock.refresh())
+        self.clocks[1].minute = 126
+        self.state.write(1, self.clocks[1])
+        self.assertTrue(clock.refresh())
+        self.assertEqual(126, clock.get_cycle_minute())
+
+    def test_no_torn_reads(self):
+        clock = FakeClock()
+        clock.speed = 0
+        self.state.write(0, clock)
+        results = multiprocessing.Queue()
+        process = multiprocessing.Process(target=_check_consistency, args=(self.name, 0.5, results))
+        process.start()
+        end = time.monotonic() + 0.6
+        value = 0
+        while time.monotonic() < end:
+            value = (value + 1) % 4000
+            clock.minute = clock.speed = value
+            self.state.write(0, clock)
+        reads, torn = results.get(timeout=10)
+        process.join()
+        self.assertGreater(reads, 0)
+        self.assertEqual(0, torn)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import tempfile
+import unittest
+
+# the clock reads its settings at import: the tests use the sample ones
+os.environ.setdefault('TTFH_INI', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                               'ttfh.ini.sample'))
+
+from src import bus, snapshot  # pylint: disable=wrong-import-position
+from src.saves import SaveState  # pylint: disable=wrong-import-position
+from src.snapshot import Snapshot  # pylint: disable=wrong-import-position
+from src.timer import Clock  # pylint: disable=wrong-import-position
+
+
+class FakeClock:
+    def __init__(self, day, hour, minute, running=False, slow=0, end=False):
+        self.day = day
+        self.hour = hour
+        self.minute = minute
+        self.running = running
+        self.slow = slow
+        self.end = end
+
+    def set_time(self, day, hour, minute):
+        self.day = day
+        self.hour = hour
+        self.minute = minute
+        self.running = False
+
+    def cycle_millis(self):
+        self.slow = 1 - self.slow
+
+    def un_pause(self, mode):
+        self.running = mode == 'run' and not self.end
+
+
+class SnapshotTest(unittest.TestCase):
+    SAVES = [SaveState('zeta', 3, 4, 59), SaveState('alpha', 1, 5, 0), SaveState('my save', 2, 13, 30)]
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'snapshot.bin')
+        snapshot.write(self.path, FakeClock(2, 6, 45, running=True, slow=1), self.SAVES)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_header(self):
+        with Snapshot(self.path) as snap:
+            self.assertEqual((2, 6, 45), (snap.day, snap.hour, snap.minute))
+            self.assertEqual((True, 1, False), (snap.running, snap.slow, snap.end))
+            self.assertEqual(3, len(snap))
+
+    def test_get(self):
+        with Snapshot(self.path) as snap:
+            for save in self.SAVES:
+                self.assertEqual(repr(save), repr(snap.get(save.name)))
+            self.assertIsNone(snap.get('missing'))
+            self.assertIsNone(snap.get('a'))
+            self.assertIsNone(snap.get('zz'))
+
+    def test_iter(self):
+        with Snapshot(self.path) as snap:
+            self.assertEqual(['alpha', 'my save', 'zeta'], [save.name for save in snap])
+
+    def test_restore(self):
+        clock = FakeClock(1, 5, 0)
+        with Snapshot(self.path) as snap:
+            snap.restore(clock)
+        self.assertEqual((2, 6, 45, True, 1, False),
+                         (clock.day, clock.hour, clock.minute, clock.running, clock.slow, clock.end))
+
+    def test_restore_publishes(self):
+        clock = Clock(1, 5, 0)
+        received = []
+        subscription = bus.BUS.subscribe(lambda events: received.extend(event.kind for event in events),
+                                         (bus.JUMP, bus.PAUSE, bus.SPEED), clock)
+        try:
+            with Snapshot(self.path) as snap:
+                snap.restore(clock)
+        finally:
+            bus.BUS.unsubscribe(subscription)
+        self.assertEqual((2, 6, 45, True, 1, False),
+                         (clock.day, clock.hour, clock.minute, clock.running, clock.slow, clock.end))
+        self.assertEqual([bus.JUMP, bus.SPEED, bus.PAUSE], received)
+
+    def test_serialized(self):
+        data = snapshot.from_serialized('zeta@3.04.59,bad,alpha@1.05.00,my save@2.13.30', FakeClock(1, 5, 0))
+        with open(self.path, 'wb') as file:
+            file.write(data)
+        with Snapshot(self.path) as snap:
+            self.assertEqual('alpha@1.05.00,my save@2.13.30,zeta@3.04.59', snap.to_serialized())
+
+    def test_empty(self):
+        snapshot.write(self.path, FakeClock(3, 4, 0, end=True), [])
+        with Snapshot(self.path) as snap:
+            self.assertEqual(0, len(snap))
+            self.assertTrue(snap.end)
+            self.assertIsNone(snap.get('alpha'))
+
+    def test_invalid(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'not a snapshot at all')
+        with self.assertRaises(ValueError):
+            Snapshot(self.path)
+
+    def test_truncated(self):
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        # in the name blob, in the save table, and an empty file
+        for size in (len(data) - 1, snapshot._HEADER.size + 5, 0):
+            with self.subTest(size):
+                with open(self.path, 'wb') as file:
+                    file.write(data[:size])
+                with self.assertRaises(ValueError):
+                    Snapshot(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+
+from src import timeline
+from src.timeline import Event
+
+BELLS = (6, 18)
+RUMBLES = (11, 14, 17, 20, 22, 0, 2, 3, 4, 5)
+
+
+def simulate(day, hour, minute, minutes):
+    """ Moves one minute at a time, as the clock used to do, collecting the events """
+    events = []
+    for _ in range(minutes):
+        minute += 1
+        if minute >= 60:
+            hour = (hour + 1) % 24
+            minute = 0
+            now = timeline.to_minute(day, hour, minute) + (timeline.DAY_DURATION if hour == 5 else 0)
+            events.append(Event(now, timeline.HOUR))
+            events.append(Event(now, timeline.BELL if hour in BELLS else timeline.TICK))
+            if hour in RUMBLES and day == 3:
+                events.append(Event(now, timeline.RUMBLE))
+            if hour == 5:
+                day += 1
+                if day > 3:
+                    events.append(Event(now, timeline.END))
+                    return events
+                events.append(Event(now, timeline.DAY))
+    return events
+
+
+class TimelineTest(unittest.TestCase):
+
+    def test_to_minute(self):
+        self.assertEqual(0, timeline.to_minute(1, 5, 0))
+        self.assertEqual(59, timeline.to_minute(1, 5, 59))
+        self.assertEqual(1260, timeline.to_minute(1, 2, 0))
+        self.assertEqual(1440, timeline.to_minute(2, 5, 0))
+        self.assertEqual(4319, timeline.to_minute(3, 4, 59))
+
+    def test_from_minute(self):
+        for d in range(1, 4):
+            for h in range(0, 24):
+                for m in range(0, 60):
+                    self.assertEqual((d, h, m), timeline.from_minute(timeline.to_minute(d, h, m)))
+
+    def test_events_between_nothing(self):
+        self.assertEqual([], timeline.events_between(0, 59, BELLS, RUMBLES))
+        self.assertEqual([], timeline.events_between(61, 61, BELLS, RUMBLES))
+
+    def test_events_between_hour(self):
+        self.assertEqual([Event(60, timeline.HOUR), Event(60, timeline.BELL)],
+                         timeline.events_between(59, 60, BELLS, RUMBLES))
+        self.assertEqual([Event(120, timeline.HOUR), Event(120, timeline.TICK)],
+                         timeline.events_between(60, 120, BELLS, RUMBLES))
+
+    def test_events_between_end(self):
+        self.assertEqual([Event(4320, timeline.HOUR), Event(4320, timeline.TICK), Event(4320, timeline.RUMBLE),
+                          Event(4320, timeline.END)],
+                         timeline.events_between(4319, 9999, BELLS, RUMBLES))
+
+    def test_events_between_as_simulation(self):
+        for start in range(0, timeline.CYCLE_DURATION, 97):
+            day, hour, minute = timeline.from_minute(start)
+            for minutes in (1, 59, 60, 61, 1440, 4320):
+                self.assertEqual(simulate(day, hour, minute, minutes),
+                                 timeline.events_between(start, start + minutes, BELLS, RUMBLES))
+
+
+class TimelineIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.timeline = timeline.Timeline(BELLS, RUMBLES)
+
+    def test_events(self):
+        self.assertEqual(timeline.events_between(0, timeline.CYCLE_DURATION, BELLS, RUMBLES),
+                         list(self.timeline.events))
+
+    def test_events_between(self):
+        for start in range(0, timeline.CYCLE_DURATION, 131):
+            for end in (start, start + 1, start + 60, start + 1000, timeline.CYCLE_DURATION + 5):
+                self.assertEqual(timeline.events_between(start, end, BELLS, RUMBLES),
+                                 self.timeline.events_between(start, end))
+
+    def test_next_event(self):
+        self.assertEqual(Event(60, timeline.HOUR), self.timeline.next_event(0))
+        self.assertEqual(Event(120, timeline.HOUR), self.timeline.next_event(60))
+        self.assertEqual(Event(780, timeline.BELL), self.timeline.next_event(60, timeline.BELL))
+        self.assertEqual(Event(3240, timeline.RUMBLE), self.timeline.next_event(0, timeline.RUMBLE))
+        self.assertEqual(Event(1440, timeline.DAY), self.timeline.next_event(0, timeline.DAY))
+        self.assertIsNone(self.timeline.next_event(2880, timeline.DAY))
+        self.assertIsNone(self.timeline.next_event(timeline.CYCLE_DURATION))
+
+    def test_minutes_until(self):
+        self.assertEqual(60, self.timeline.minutes_until(0, timeline.HOUR))
+        self.assertEqual(1, self.timeline.minutes_until(779, timeline.BELL))
+        self.assertEqual(1, self.timeline.minutes_until(4319, timeline.END))
+        self.assertIsNone(self.timeline.minutes_until(3000, timeline.DAY))
+
+    def test_minutes_until_end(self):
+        self.assertEqual(4320, self.timeline.minutes_until_end(0))
+        self.assertEqual(1, self.timeline.minutes_until_end(4319))
+        self.assertEqual(0, self.timeline.minutes_until_end(4320))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+import os
+import unittest
+
+# the clock reads its settings at import: the tests use the sample ones
+os.environ.setdefault('TTFH_INI', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                               'ttfh.ini.sample'))
+
+from src import bus, timeline  # pylint: disable=wrong-import-position
+from src.timer import Clock  # pylint: disable=wrong-import-position
+
+
+class ClockTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+        self.batches = []
+        self.subscription = bus.BUS.subscribe(self.batches.append, clock=self.clock)
+
+    def tearDown(self):
+        bus.BUS.unsubscribe(self.subscription)
+
+    def kinds(self):
+        return [[event.kind for event in batch] for batch in self.batches]
+
+    def test_init(self):
+        clock = Clock(2, 3, 45)
+        self.assertEqual((2, 3, 45), (clock.day, clock.hour, clock.minute))
+        self.assertEqual(timeline.to_minute(2, 3, 45), clock.get_cycle_minute())
+        self.assertEqual('2.03.45', clock.get_time_str())
+        self.assertEqual((False, False, 0, 1), (clock.running, clock.end, clock.slow, clock.speed))
+
+    def test_setters(self):
+        self.clock.hour = 23
+        self.clock.minute = 59
+        self.clock.day = 2
+        self.assertEqual((2, 23, 59), (self.clock.day, self.clock.hour, self.clock.minute))
+        self.assertEqual(timeline.DAY_DURATION + 18 * 60 + 59, self.clock.get_cycle_minute())
+        # the hours after midnight belong to the same day
+        self.clock.hour = 1
+        self.assertEqual(timeline.DAY_DURATION + 20 * 60 + 59, self.clock.get_cycle_minute())
+
+    def test_comparisons(self):
+        early, late = Clock(1, 23, 0), Clock(1, 2, 0)
+        self.assertTrue(early < late)
+        self.assertTrue(early <= late)
+        self.assertTrue(late > early)
+        self.assertTrue(late >= early)
+        self.assertEqual(180, late - early)
+        self.assertEqual(-180, early - late)
+        # equality stays by identity
+        self.assertNotEqual(Clock(), Clock())
+
+    def test_update_time(self):
+        clock = Clock(1, 5, 59)
+        clock.update_time()
+        self.assertEqual((1, 6, 0), (clock.day, clock.hour, clock.minute))
+        clock = Clock(1, 4, 59)
+        clock.update_time()
+        self.assertEqual((2, 5, 0), (clock.day, clock.hour, clock.minute))
+
+    def test_advance(self):
+        version = self.clock.version
+        events = self.clock.advance(125)
+        self.assertEqual((1, 7, 5), (self.clock.day, self.clock.hour, self.clock.minute))
+        self.assertEqual([60, 60, 120, 120], [event.minute for event in events])
+        self.assertEqual([[timeline.HOUR, timeline.BELL, timeline.HOUR, timeline.TICK, bus.MINUTE]], self.kinds())
+        self.assertEqual(version + 1, self.clock.version)
+
+    def audible(self, policy):
+        self.batches.clear()
+        self.clock.set_time(1, 5, 0)
+        self.batches.clear()
+        self.clock.advance(180, policy)
+        return [(event.kind, event.minute) for event in self.batches[0]
+                if event.audible and event.kind in bus.SOUND_KINDS]
+
+    def test_advance_replay(self):
+        self.assertEqual([(timeline.BELL, 60), (timeline.TICK, 120), (timeline.TICK, 180)], self.audible('replay'))
+
+    def test_advance_coalesce(self):
+        # one sound of each kind: the last minute's one, or the latest skipped one
+        self.assertEqual([(timeline.BELL, 60), (timeline.TICK, 180)], self.audible('coalesce'))
+
+    def test_advance_drop(self):
+        self.assertEqual([(timeline.TICK, 180)], self.audible('drop'))
+
+    def test_advance_to_end(self):
+        self.clock.set_time(3, 4, 30)
+        self.clock.advance(100)
+        self.assertTrue(self.clock.end)
+        self.assertFalse(self.clock.running)
+        self.assertEqual((3, 4, 0), (self.clock.day, self.clock.hour, self.clock.minute))
+        self.assertEqual([], self.clock.advance(1))
+        self.assertEqual(0, self.clock.minutes_left())
+
+    def test_advance_to_end_running(self):
+        self.clock.set_time(3, 4, 30)
+        self.clock.un_pause('run')
+        self.batches.clear()
+        self.clock.advance(100)
+        kinds = self.kinds()
+        # the end is not a jump, which would stop its sounds
+        self.assertEqual([timeline.HOUR, timeline.TICK, timeline.END, bus.MINUTE], kinds[0])
+        self.assertEqual([[bus.PAUSE]], kinds[1:])
+        self.assertFalse(self.clock.running)
+
+    def test_set_time(self):
+        self.clock.un_pause('run')
+        self.batches.clear()
+        self.clock.set_time(2, 10, 15)
+        self.assertEqual([[bus.JUMP, bus.PAUSE]], self.kinds())
+        self.assertEqual(timeline.to_minute(2, 10, 15), self.batches[0][0].minute)
+        self.assertFalse(self.clock.running)
+        self.clock.set_time(1, 6, 0)
+        self.assertEqual([bus.JUMP], self.kinds()[-1])
+
+    def test_forward(self):
+        clock = Clock(1, 5, 30)
+        clock.un_pause('run')
+        clock.cycle_speed()
+        clock.forward()
+        self.assertEqual((1, 6, 0), (clock.day, clock.hour, clock.minute))
+        self.assertEqual((False, 1), (clock.running, clock.speed))
+        # not during the last hour
+        clock.set_time(3, 4, 10)
+        clock.forward()
+        self.assertEqual((3, 4, 10), (clock.day, clock.hour, clock.minute))
+
+    def test_backward(self):
+        clock = Clock(1, 6, 30)
+        clock.backward()
+        self.assertEqual((1, 6, 0), (clock.day, clock.hour, clock.minute))
+        clock.backward()
+        self.assertEqual((1, 5, 0), (clock.day, clock.hour, clock.minute))
+        clock.backward()
+        self.assertEqual((1, 5, 0), (clock.day, clock.hour, clock.minute))
+
+    def test_reset(self):
+        self.clock.set_time(3, 4, 30)
+        self.clock.advance(100)
+        self.clock.cycle_millis()
+        self.clock.reset()
+        self.assertEqual((1, 5, 0), (self.clock.day, self.clock.hour, self.clock.minute))
+        self.assertEqual((False, False, 0, 1), (self.clock.running, self.clock.end, self.clock.slow, self.clock.speed))
+        self.assertEqual([bus.JUMP], self.kinds()[-1])
+
+    def test_un_pause(self):
+        self.clock.un_pause()
+        self.assertTrue(self.clock.running)
+        self.clock.un_pause('run')
+        self.clock.un_pause('stop')
+        self.assertFalse(self.clock.running)
+        self.assertEqual([[bus.PAUSE], [bus.PAUSE]], self.kinds())
+
+    def test_speed(self):
+        interval = self.clock.get_interval()
+        self.assertEqual(Clock.CATCH_UP, self.clock.catch_up())
+        for speed in Clock.SPEEDS[1:]:
+            self.clock.cycle_speed()
+            self.assertEqual(speed, self.clock.speed)
+            self.assertEqual(interval / speed, self.clock.get_interval())
+            self.assertEqual(Clock.FAST_CATCH_UP, self.clock.catch_up())
+        self.clock.cycle_speed()
+        self.assertEqual(1, self.clock.speed)
+        self.clock.cycle_millis()
+        self.assertGreater(self.clock.get_interval(), interval)
+
+
+if __name__ == '__main__':
+    unittest.main()